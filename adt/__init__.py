@@ -1,7 +1,9 @@
 from typing import TYPE_CHECKING
 
 from .case import Case
-from .decorator import adt
+from .columnar import ADTArray
+from .decorator import adt, batched, set_format_limits
+from .store import ADTStore, ADTStoreWriter
 
 if TYPE_CHECKING:
     from .case import CaseConstructor
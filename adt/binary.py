@@ -0,0 +1,589 @@
+import _thread
+import mmap
+import struct
+import sys
+from typing import (IO, TYPE_CHECKING, Any, AsyncIterator, Callable, Dict,
+                    FrozenSet, Iterable, Iterator, List, Optional, Tuple, Type,
+                    Union)
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Each encoded value begins with a marker byte, identifying its type. Values
+# of ADTs are marked with _ADT plus the index of their class in the codec.
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_BYTES = 6
+_TUPLE = 7
+_LIST = 8
+_DICT = 9
+_ADT = 0x80
+
+# The most ADT classes one codec can encode, given the marker byte.
+_MAX_CLASSES = 0x80
+
+_float = struct.Struct('<d')
+
+# With `fieldOffsets`, values with several fields are followed by the offset of
+# the end of each field but the last (from the end of those offsets).
+_fieldOffset = struct.Struct('<I')
+
+# The longest valid varint, for lengths up to 2^64.
+_MAX_VARINT_SIZE = 10
+
+# Returned by `_decodeFrom` in place of a value which isn't complete yet.
+_INCOMPLETE = object()
+
+# Encoded data, which can also be decoded directly from a memory-mapped file.
+_Data = Union[bytes, mmap.mmap]
+
+# The state of a value being decoded from a stream, between calls to
+# `_decodeFrom` (see there).
+_PartialValue = Tuple[List[Any], List[Any], List[int], List[int]]
+
+# Types which are encoded directly, rather than as ADT values.
+_BUILTIN_TYPES = frozenset(
+    (type(None), bool, int, float, str, bytes, tuple, list, dict))
+
+
+class Codec:
+    """Encodes and decodes values of an ADT class in a compact binary format.
+
+    Associated data can include None, bools, ints, floats, strs, bytes,
+    tuples, lists, dicts, and values of the ADT class itself, or of any other
+    ADT class named in its `Case[…]` annotations (recursively). Values are
+    processed without recursion, so they can be nested arbitrarily deeply.
+
+    With `fieldOffsets`, the encoding of each ADT value with several fields
+    also records where each of its fields starts, so that they can be found
+    without decoding those before them.
+    """
+
+    def __init__(self, cls: Type[Any], fieldOffsets: bool = False):
+        self._cls = cls
+        self._fieldOffsets = fieldOffsets
+
+        # All ADT classes whose values can be encoded, in the order they were
+        # discovered from field types, starting with `cls`.
+        self._classes: List[Type[Any]] = [cls]
+        for adtClass in self._classes:
+            for fieldTypes in adtClass._types:
+                if not isinstance(fieldTypes, tuple):
+                    fieldTypes = (fieldTypes, )
+
+                for fieldClass in _fieldClasses(adtClass, fieldTypes):
+                    if fieldClass not in self._classes:
+                        self._classes.append(fieldClass)
+
+        if len(self._classes) > _MAX_CLASSES:
+            raise TypeError(
+                f'{cls} refers to too many ADT classes to be encoded')
+
+        # For encoding: the header of each case class (across all classes),
+        # and how its data is stored. Subclasses of an ADT share its keys, but
+        # not its case classes.
+        self._headers: Dict[Any, Tuple[bytes, int]] = {}
+
+        # For decoding: the constructor of each case (by class index and
+        # tag), and its field count (or -1 for a single, untupled field).
+        self._cases: List[List[Tuple[Callable[..., Any], int]]] = []
+
+        # With `fieldOffsets`, the size of the field offsets following the
+        # header of each case (likewise by class index and tag).
+        self._offsetSizes: Optional[List[List[int]]] = ([] if fieldOffsets else
+                                                        None)
+
+        for index, adtClass in enumerate(self._classes):
+            cases = []
+            offsetSizes = []
+            for tag, (key, fieldTypes) in enumerate(
+                    zip(adtClass._Key.__members__.values(), adtClass._types)):
+                if fieldTypes is None:
+                    fieldCount = 0
+                elif isinstance(fieldTypes, tuple):
+                    fieldCount = len(fieldTypes)
+                else:
+                    fieldCount = -1
+
+                constructor = getattr(adtClass, key.name)
+                header = bytes([_ADT | index]) + _varint(tag)
+                self._headers[constructor] = (header, fieldCount)
+                cases.append((constructor, fieldCount))
+                offsetSizes.append(_fieldOffset.size *
+                                   (fieldCount - 1) if fieldCount > 1 else 0)
+
+            self._cases.append(cases)
+            if self._offsetSizes is not None:
+                self._offsetSizes.append(offsetSizes)
+
+        # Values are instances of the classes of their cases (which are also
+        # their constructors).
+        self._adtTypes: FrozenSet[Any] = frozenset(constructor
+                                                   for cases in self._cases
+                                                   for constructor, _ in cases)
+
+    def encode(self, value: Any) -> bytes:
+        out = bytearray()
+        self._encodeInto(self._checked(value, TypeError), out)
+        return bytes(out)
+
+    def decode(self, data: bytes) -> Any:
+        value, end = self._decodeFrom(data, 0)
+        if end != len(data):
+            raise ValueError(
+                f'Unexpected data after the end of the encoded value (at byte {end})'
+            )
+
+        return self._checked(value, ValueError)
+
+    def dump_iter(self, values: Iterable[Any], file: IO[bytes]) -> None:
+        """Writes each value to `file`, as it's produced by `values`."""
+        for value in values:
+            out = bytearray()
+            self._encodeInto(self._checked(value, TypeError), out)
+            file.write(_varint(len(out)) + out)
+
+    def load_iter(self, file: IO[bytes]) -> Iterator[Any]:
+        """Reads values from `file` (as written by `dump_iter`) one at a time,
+        until it's exhausted."""
+        while True:
+            length = _readVarint(file)
+            if length is None:
+                return
+
+            data = file.read(length)
+            if len(data) != length:
+                raise ValueError('Unexpected end of file in encoded value')
+
+            yield self.decode(data)
+
+    async def decode_stream(self,
+                            reader: 'asyncio.StreamReader',
+                            chunk_size: int = 16384,
+                            max_size: int = 64 * 1024 * 1024
+                            ) -> AsyncIterator[Any]:
+        """Decodes values from `reader` (as written by `dump_iter`) as their
+        data arrives, until it's exhausted.
+
+        Data is read and decoded `chunk_size` bytes at a time, returning to the
+        event loop in between, so large values don't block other tasks while
+        they're decoded. Values encoded in more than `max_size` bytes raise a
+        ValueError before any of them is read, so at most around `max_size`
+        bytes are buffered at once.
+        """
+        # Imported here, as it's slow to import, and rarely needed.
+        import asyncio
+
+        buffer = bytearray()
+
+        # Bytes decoded since the event loop last had a chance to run.
+        decoded = 0
+
+        while True:
+            # The length of the next value.
+            while True:
+                try:
+                    length, offset = _decodeVarint(buffer, 0)
+                    break
+                except IndexError:
+                    if len(buffer) >= _MAX_VARINT_SIZE:
+                        raise ValueError(
+                            'Invalid length of encoded value') from None
+
+                chunk = await reader.read(chunk_size)
+                if not chunk:
+                    if buffer:
+                        raise ValueError(
+                            'Unexpected end of stream in encoded value')
+
+                    return
+
+                buffer += chunk
+
+            if length > max_size:
+                raise ValueError(
+                    f'Encoded value of {length} bytes is larger than max_size ({max_size})'
+                )
+
+            del buffer[:offset]
+
+            # Decodes as much of the value as has arrived, reading more (and
+            # then resuming from the last complete item) until it's done.
+            partial: _PartialValue = ([], [], [], [])
+            remaining = length
+            while True:
+                available = min(len(buffer), remaining)
+                value, used = self._decodeFrom(bytes(buffer[:available]), 0,
+                                               partial)
+                del buffer[:used]
+                remaining -= used
+                decoded += used
+
+                if value is not _INCOMPLETE:
+                    break
+
+                if available == remaining + used:
+                    raise ValueError('Unexpected end of encoded value')
+
+                if decoded >= chunk_size:
+                    decoded = 0
+                    await asyncio.sleep(0)
+
+                # Reads at least another chunk, and keeps reading while a
+                # single item (like a long string) is still incomplete, so it
+                # isn't decoded again for every chunk.
+                target = min(remaining, max(len(buffer) * 2, 1))
+                while True:
+                    chunk = await reader.read(chunk_size)
+                    if not chunk:
+                        raise ValueError(
+                            'Unexpected end of stream in encoded value')
+
+                    buffer += chunk
+                    if len(buffer) >= target:
+                        break
+
+            if remaining:
+                raise ValueError(
+                    f'Unexpected data after the end of the encoded value (at byte {length - remaining})'
+                )
+
+            yield self._checked(value, ValueError)
+
+            if decoded >= chunk_size:
+                decoded = 0
+                await asyncio.sleep(0)
+
+    def _checked(self, value: Any, error: Type[Exception]) -> Any:
+        if not isinstance(value, self._cls):
+            raise error(f'{value!r} is not an instance of {self._cls}')
+
+        return value
+
+    def _encodeInto(self, root: Any, out: bytearray) -> None:
+        headers = self._headers
+        adtTypes = self._adtTypes
+        fieldOffsets = self._fieldOffsets
+        work = [root]
+        while work:
+            value = work.pop()
+            valueType = type(value)
+
+            if valueType in adtTypes or valueType not in _BUILTIN_TYPES:
+                if fieldOffsets and valueType is _FieldEnd:
+                    end = len(out) - value.base
+                    if end > 0xFFFFFFFF:
+                        raise ValueError(
+                            'Fields of more than 4 GiB cannot be encoded with field offsets'
+                        )
+
+                    _fieldOffset.pack_into(out, value.position, end)
+                    continue
+
+                try:
+                    header, fieldCount = headers[valueType]
+                except KeyError:
+                    raise TypeError(
+                        f'{value!r} cannot be encoded as part of a {self._cls.__name__} value'
+                    ) from None
+
+                out += header
+                if fieldOffsets and fieldCount > 1:
+                    # Reserves space for the offsets, which are filled in as
+                    # the end of each field is reached.
+                    position = len(out)
+                    out += bytes(_fieldOffset.size * (fieldCount - 1))
+                    base = len(out)
+
+                    fields = value._value
+                    for i in range(fieldCount - 1, 0, -1):
+                        work.append(fields[i])
+                        work.append(
+                            _FieldEnd(position + _fieldOffset.size * (i - 1),
+                                      base))
+
+                    work.append(fields[0])
+                elif fieldCount > 0:
+                    work.extend(reversed(value._value))
+                elif fieldCount < 0:
+                    work.append(value._value)
+            elif valueType is int:
+                n = value << 1 if value >= 0 else (-value << 1) - 1
+                out.append(_INT)
+                if n < 0x80:
+                    out.append(n)
+                else:
+                    out += _varint(n)
+            elif valueType is float:
+                out.append(_FLOAT)
+                out += _float.pack(value)
+            elif valueType is str:
+                encoded = value.encode('utf-8')
+                out.append(_STR)
+                out += _varint(len(encoded))
+                out += encoded
+            elif valueType is bool:
+                out.append(_TRUE if value else _FALSE)
+            elif value is None:
+                out.append(_NONE)
+            elif valueType is bytes:
+                out.append(_BYTES)
+                out += _varint(len(value))
+                out += value
+            elif valueType is dict:
+                out.append(_DICT)
+                out += _varint(len(value))
+                for item in reversed(list(value.items())):
+                    work.append(item[1])
+                    work.append(item[0])
+            else:
+                out.append(_TUPLE if valueType is tuple else _LIST)
+                out += _varint(len(value))
+                work.extend(reversed(value))
+
+    # Decodes the value at `offset` in `data`, returning it along with the
+    # offset of its end.
+    #
+    # If `partial` is given, `data` may end before the value does. In that
+    # case, this returns _INCOMPLETE and the offset of the end of the last
+    # complete item, and can be called again with the same `partial`, and data
+    # continuing from there.
+    def _decodeFrom(self,
+                    data: _Data,
+                    offset: int,
+                    partial: Optional[_PartialValue] = None
+                    ) -> Tuple[Any, int]:
+        cases = self._cases
+        offsetSizes = self._offsetSizes
+
+        # Decoded values, some of which are waiting to be combined into the
+        # containers and ADT values they belong to. Those are described by
+        # the corresponding entries of `builders` (an ADT constructor, or a
+        # container's marker), `counts` (how many values they're built from)
+        # and `ends` (the length of `values` once all of those are decoded).
+        #
+        # Keeping these in flat lists avoids allocating anything per nested
+        # value, beyond the decoded values themselves.
+        values: List[Any]
+        builders: List[Any]
+        counts: List[int]
+        ends: List[int]
+        if partial is None:
+            values, builders, counts, ends = [], [], [], []
+        else:
+            values, builders, counts, ends = partial
+
+        start = offset
+        try:
+            while True:
+                start = offset
+                marker = data[offset]
+                offset += 1
+
+                value: Any
+                if marker & _ADT:
+                    tag, offset = _decodeVarint(data, offset)
+                    index = marker & ~_ADT
+                    if index >= len(cases) or tag >= len(cases[index]):
+                        raise ValueError(
+                            f'Unrecognized case {tag} of class {index} at byte {offset}'
+                        )
+
+                    constructor, count = cases[index][tag]
+                    if offsetSizes is not None:
+                        offset += offsetSizes[index][tag]
+
+                    if count == 0:
+                        value = constructor()
+                    else:
+                        count = abs(count)
+                        builders.append(constructor)
+                        counts.append(count)
+                        ends.append(len(values) + count)
+                        continue
+                elif marker == _INT:
+                    n, offset = _decodeVarint(data, offset)
+                    value = -((n + 1) >> 1) if n & 1 else n >> 1
+                elif marker == _FLOAT:
+                    value = _float.unpack_from(data, offset)[0]
+                    offset += 8
+                elif marker == _STR or marker == _BYTES:
+                    length, offset = _decodeVarint(data, offset)
+                    if offset + length > len(data):
+                        raise IndexError
+
+                    value = data[offset:offset + length]
+                    if marker == _STR:
+                        value = value.decode('utf-8')
+
+                    offset += length
+                elif marker == _NONE:
+                    value = None
+                elif marker == _FALSE or marker == _TRUE:
+                    value = marker == _TRUE
+                elif marker == _TUPLE or marker == _LIST or marker == _DICT:
+                    count, offset = _decodeVarint(data, offset)
+                    if marker == _DICT:
+                        count *= 2
+
+                    if count == 0:
+                        value = () if marker == _TUPLE else [] if marker == _LIST else {}
+                    else:
+                        builders.append(marker)
+                        counts.append(count)
+                        ends.append(len(values) + count)
+                        continue
+                else:
+                    raise ValueError(
+                        f'Unrecognized marker {marker} at byte {offset - 1}')
+
+                values.append(value)
+
+                # Build anything which is now complete (which may complete
+                # whatever contains it, in turn).
+                while ends and len(values) == ends[-1]:
+                    ends.pop()
+                    builder = builders.pop()
+                    count = counts.pop()
+
+                    if type(builder) is int:
+                        items = values[-count:]
+                        del values[-count:]
+                        if builder == _TUPLE:
+                            value = tuple(items)
+                        elif builder == _LIST:
+                            value = items
+                        else:
+                            value = dict(zip(items[::2], items[1::2]))
+                    elif count == 1:
+                        value = builder(values.pop())
+                    elif count == 2:
+                        second = values.pop()
+                        value = builder(values.pop(), second)
+                    else:
+                        items = values[-count:]
+                        del values[-count:]
+                        value = builder(*items)
+
+                    values.append(value)
+
+                if not ends:
+                    return (values[0], offset)
+        except (IndexError, struct.error):
+            if partial is not None:
+                return (_INCOMPLETE, start)
+
+            raise ValueError('Unexpected end of encoded value') from None
+        except UnicodeDecodeError as e:
+            raise ValueError(f'Invalid string in encoded value: {e}') from None
+
+
+# Marks the end of a field in the work of `_encodeInto`, where its offset is
+# filled in at `position`, relative to `base`.
+class _FieldEnd:
+    __slots__ = ('position', 'base')
+
+    def __init__(self, position: int, base: int):
+        self.position = position
+        self.base = base
+
+
+# Held while creating a codec (see codecFor).
+_creatingCodec = _thread.allocate_lock()
+
+
+def codecFor(cls: Type[Any], fieldOffsets: bool = False) -> Codec:
+    """Returns the codec for the ADT class `cls`, creating it on first use.
+
+    Creation is deferred until then, so that the ADT classes named by forward
+    references in `cls` have a chance to be defined.
+    """
+    # Codecs refer to the classes they encode, so are stored on them (rather
+    # than in a table here), to be garbage collected along with them.
+    name = '_fieldOffsetCodec' if fieldOffsets else '_binaryCodec'
+    codec: Optional[Codec] = cls.__dict__.get(name)
+    if codec is None:
+        # Only creation is locked, so that threads racing to create the same
+        # codec share one, while looking it up never contends.
+        with _creatingCodec:
+            codec = cls.__dict__.get(name)
+            if codec is None:
+                codec = Codec(cls, fieldOffsets)
+                setattr(cls, name, codec)
+
+    return codec
+
+
+# The ADT classes named by the field types `types` (as given to Case[…] on
+# `cls`), including as arguments to generic types like List[…]. Forward
+# references are resolved in the module defining `cls`.
+def _fieldClasses(cls: Type[Any], types: Iterable[Any]) -> Iterator[Type[Any]]:
+    work = list(types)
+    while work:
+        t = work.pop()
+        work.extend(getattr(t, '__args__', None) or ())
+        t = getattr(t, '__origin__', None) or t
+
+        name = getattr(t, '__forward_arg__', t)
+        if isinstance(name, str):
+            name = name.split('[', 1)[0].strip()
+            if name in (cls.__name__, cls.__qualname__):
+                t = cls
+            else:
+                t = getattr(sys.modules.get(cls.__module__), name, None)
+
+        if isinstance(t, type) and hasattr(t, '_Key') and hasattr(t, '_types'):
+            yield t
+
+
+def _varint(n: int) -> bytes:
+    if n < 0x80:
+        return bytes((n, ))
+
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+
+    out.append(n)
+    return bytes(out)
+
+
+def _decodeVarint(data: _Data, offset: int) -> Tuple[int, int]:
+    byte = data[offset]
+    if byte < 0x80:
+        return (byte, offset + 1)
+
+    n = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (n, offset)
+
+        shift += 7
+
+
+# Reads a varint directly from `file`, or returns None if it has ended.
+def _readVarint(file: IO[bytes]) -> Optional[int]:
+    n = 0
+    shift = 0
+    while True:
+        byte = file.read(1)
+        if not byte:
+            if shift:
+                raise ValueError('Unexpected end of file in encoded value')
+
+            return None
+
+        n |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return n
+
+        shift += 7
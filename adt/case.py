@@ -1,12 +1,17 @@
-from typing import TYPE_CHECKING, Any, Callable, Generic, Tuple, Type, TypeVar, Union
+import keyword
+from typing import (TYPE_CHECKING, Any, Callable, Generic, Optional, Tuple,
+                    Type, TypeVar, Union)
 
 _T = TypeVar('_T')
 _U = TypeVar('_U')
 
 
 class TupleConstructor:
-    def __init__(self, types: Tuple[Type[Any], ...]):
+    def __init__(self,
+                 types: Tuple[Type[Any], ...],
+                 names: Optional[Tuple[str, ...]] = None):
         self._types = types
+        self._names = names
         super().__init__()
 
     def constructCase(self, *args: Any) -> Tuple[Any, ...]:
@@ -21,14 +26,24 @@ class TupleConstructor:
     def getTypes(self) -> Any:
         return self._types
 
+    def getNames(self) -> Optional[Tuple[str, ...]]:
+        return self._names
+
     def __repr__(self) -> str:
-        typeString = ', '.join((str(t) for t in self._types))
+        if self._names is None:
+            typeString = ', '.join((str(t) for t in self._types))
+        else:
+            typeString = ', '.join(
+                (f'({name!r}, {t})'
+                 for name, t in zip(self._names, self._types)))
+
         return f'Case[{typeString}]'
 
 
 class IdentityConstructor:
-    def __init__(self, argType: Type[Any]):
+    def __init__(self, argType: Type[Any], names: Optional[Tuple[str]] = None):
         self._argType = argType
+        self._names = names
         super().__init__()
 
     def constructCase(self, arg: _T) -> _T:
@@ -40,8 +55,14 @@ class IdentityConstructor:
     def getTypes(self) -> Any:
         return self._argType
 
+    def getNames(self) -> Optional[Tuple[str]]:
+        return self._names
+
     def __repr__(self) -> str:
-        return f'Case[{self._argType}]'
+        if self._names is None:
+            return f'Case[{self._argType}]'
+
+        return f'Case[({self._names[0]!r}, {self._argType}), ]'
 
 
 class CaseConstructor:
@@ -57,12 +78,29 @@ class CaseConstructor:
     def getTypes(self) -> None:
         return None
 
-    def __getitem__(self, params: Union[None, Type[Any], Tuple[Type[Any], ...]]
+    def getNames(self) -> None:
+        return None
+
+    def __getitem__(self, params: Union[None, Type[Any], Tuple[Any, ...]]
                     ) -> AnyConstructor:
         if params is None:
             return self
         elif isinstance(params, tuple):
-            return TupleConstructor(params)
+            namedCount = sum(map(_isNamedField, params))
+            if namedCount == 0:
+                return TupleConstructor(params)
+            elif namedCount != len(params):
+                raise TypeError(
+                    f'Either all fields of Case{list(params)} should be named, or none of them'
+                )
+
+            names = tuple(name for name, _ in params)
+            types = tuple(t for _, t in params)
+            _validateNames(names)
+            if len(params) == 1:
+                return IdentityConstructor(types[0], (names[0], ))
+
+            return TupleConstructor(types, names)
         else:
             return IdentityConstructor(params)
 
@@ -70,6 +108,28 @@ class CaseConstructor:
         return 'Case'
 
 
+# Named fields are given as (name, type) pairs, like Case[("lhs", int),
+# ("rhs", int)]. (A single named field needs a trailing comma, as in
+# Case[("value", int), ], or Python reads it as two unnamed fields.)
+def _isNamedField(param: Any) -> bool:
+    return isinstance(param, tuple) and len(param) == 2 and isinstance(
+        param[0], str)
+
+
+# Fields are stored as attributes of the same names, so these can't be
+# keywords, nor start with an underscore (like the attributes adt uses).
+def _validateNames(names: Tuple[str, ...]) -> None:
+    for name in names:
+        if not name.isidentifier() or keyword.iskeyword(
+                name) or name.startswith('_'):
+            raise TypeError(
+                f'{name!r} is not a valid field name (field names must be identifiers, and must not start with an underscore)'
+            )
+
+    if len(set(names)) != len(names):
+        raise TypeError(f'Field names {names} should be unique')
+
+
 if TYPE_CHECKING:
     # Simple shim to capture the type arguments for use in the mypy plugin
     class CaseT(Generic[_T]):
@@ -0,0 +1,196 @@
+from array import array
+from typing import (Any, Callable, Dict, Generic, Iterable, Iterator, List,
+                    MutableSequence, Optional, Sequence, Tuple, Type, TypeVar,
+                    Union, overload)
+
+_T = TypeVar('_T')
+
+# Field types which are stored in native columns, rather than as objects.
+_NATIVE_TYPECODES = {int: 'q', float: 'd'}
+_NATIVE_TYPES = {typecode: t for t, typecode in _NATIVE_TYPECODES.items()}
+
+_Column = MutableSequence[Any]
+
+
+class ADTArray(Generic[_T]):
+    """A compact, list-like sequence of values of the ADT `cls`.
+
+    Instead of storing each value as an object, the case of every value is
+    stored in a single array of small integers, and every field of every case
+    in its own column. Fields annotated as `int` or `float` are stored in
+    native `array.array` columns, like C arrays; others are stored in lists.
+
+    ADT values are only created when elements are accessed.
+    """
+
+    def __init__(self, cls: Type[_T], values: Iterable[_T] = ()):
+        self._cls = cls
+
+        # Each case is stored by its index, which is one less than the value
+        # of its key.
+        keys = list(cls._Key.__members__.values())  # type: ignore
+        self._caseNames = [key.name for key in keys]
+        self._constructors: List[Callable[..., _T]] = [
+            getattr(cls, key.name) for key in keys
+        ]
+
+        # Whether each case stores its data as a single value (rather than a
+        # tuple), and its columns.
+        self._single: List[bool] = []
+        self._columns: List[List[_Column]] = []
+        for fieldTypes in cls._types:  # type: ignore
+            if fieldTypes is None:
+                fieldTypes = ()
+
+            single = not isinstance(fieldTypes, tuple)
+            self._single.append(single)
+            self._columns.append([
+                _makeColumn(t)
+                for t in ((fieldTypes, ) if single else fieldTypes)
+            ])
+
+        self._counts = [0] * len(keys)
+        self._tags = array('B' if len(keys) <= 256 else 'L')
+        self._rows = array('L')
+        self.extend(values)
+
+    def append(self, value: _T) -> None:
+        if not isinstance(value, self._cls):
+            raise TypeError(
+                f'{value!r} cannot be added to an ADTArray of {self._cls}')
+
+        tag = value._key.value - 1  # type: ignore
+        data = value._value  # type: ignore
+        if self._single[tag]:
+            self._appendRow(tag, (data, ))
+        else:
+            self._appendRow(tag, data or ())
+
+    def extend(self, values: Iterable[_T]) -> None:
+        if isinstance(values, ADTArray) and values._cls is self._cls:
+            # Copies fields directly, without creating ADT values. The length
+            # is fixed first, in case `values` is this array.
+            for i in range(len(values)):
+                tag = values._tags[i]
+                self._appendRow(tag, values._rowFields(tag, values._rows[i]))
+        else:
+            for value in values:
+                self.append(value)
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of values of each case, keyed by case name."""
+        return dict(zip(self._caseNames, self._counts))
+
+    def select(self, case: str) -> 'ADTArray[_T]':
+        """Returns a new ADTArray of just the values of the given case.
+
+        Cases can be named in uppercase or lowercase, as with `match`.
+        """
+        tag = self._tagOf(case)
+        selected: ADTArray[_T] = ADTArray(self._cls)
+        count = self._counts[tag]
+        selected._columns[tag] = [_copyColumn(c) for c in self._columns[tag]]
+        selected._counts[tag] = count
+        selected._tags = array(self._tags.typecode, [tag]) * count
+        selected._rows = array('L', range(count))
+        return selected
+
+    def columns(self, case: str) -> Tuple[Sequence[Any], ...]:
+        """Returns the columns storing each field of the values of the given
+        case, in order of appearance.
+
+        Columns are shared with the ADTArray, and must not be modified.
+        """
+        return tuple(self._columns[self._tagOf(case)])
+
+    def tolist(self) -> List[_T]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    @overload
+    def __getitem__(self, index: int) -> _T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'ADTArray[_T]':
+        ...
+
+    def __getitem__(self,
+                    index: Union[int, slice]) -> Union[_T, 'ADTArray[_T]']:
+        if isinstance(index, slice):
+            sliced: ADTArray[_T] = ADTArray(self._cls)
+            for i in range(*index.indices(len(self))):
+                tag = self._tags[i]
+                sliced._appendRow(tag, self._rowFields(tag, self._rows[i]))
+
+            return sliced
+
+        tag = self._tags[index]
+        return self._constructors[tag](
+            *self._rowFields(tag, self._rows[index]))
+
+    def __iter__(self) -> Iterator[_T]:
+        constructors = self._constructors
+        for tag, row in zip(self._tags, self._rows):
+            yield constructors[tag](*self._rowFields(tag, row))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ADTArray):
+            return False
+
+        return self._cls is other._cls and self.tolist() == other.tolist()
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f'ADTArray({self._cls.__qualname__}, {self.tolist()!r})'
+
+    def _tagOf(self, case: str) -> int:
+        try:
+            return self._caseNames.index(case.upper())
+        except ValueError:
+            raise ValueError(
+                f'Unrecognized case {case} for {self._cls} (expected one of {self._caseNames})'
+            ) from None
+
+    def _rowFields(self, tag: int, row: int) -> List[Any]:
+        return [column[row] for column in self._columns[tag]]
+
+    def _appendRow(self, tag: int, fields: Sequence[Any]) -> None:
+        columns = self._columns[tag]
+        for i, (column, field) in enumerate(zip(columns, fields)):
+            if isinstance(column, array):
+                if type(field) is _NATIVE_TYPES[column.typecode]:
+                    try:
+                        column.append(field)
+                        continue
+                    except OverflowError:
+                        pass
+
+                # This value can't be stored natively without changing it
+                # (e.g., an int too large for 64 bits, or a bool), so the
+                # column falls back to storing objects.
+                column = columns[i] = list(column)
+
+            column.append(field)
+
+        self._rows.append(self._counts[tag])
+        self._tags.append(tag)
+        self._counts[tag] += 1
+
+
+def _makeColumn(fieldType: Any) -> _Column:
+    typecode: Optional[str] = _NATIVE_TYPECODES.get(fieldType)
+    if typecode is None:
+        return []
+
+    return array(typecode)
+
+
+def _copyColumn(column: _Column) -> _Column:
+    if isinstance(column, array):
+        return array(column.typecode, column)
+
+    return list(column)
@@ -1,12 +1,28 @@
 # mypy: no-warn-unused-ignores
-from enum import Enum
-from typing import Any, Callable, Type, TypeVar, no_type_check
+from __future__ import annotations
 
-from adt.case import CaseConstructor
+import functools
+import itertools
+import operator
+import sys
+from types import CodeType, FrameType, MappingProxyType
+from typing import (IO, TYPE_CHECKING, Any, AsyncIterator, Callable, Dict,
+                    FrozenSet, Iterable, Iterator, List, Mapping, Optional,
+                    Sequence, Set, Tuple, Type, TypeVar, no_type_check)
+
+from adt import binary, jsoncodec
+from adt.case import CaseConstructor, IdentityConstructor, TupleConstructor
+
+if TYPE_CHECKING:
+    import asyncio
 
 
 @no_type_check
-def adt(cls):
+def adt(cls=None, *, slots=False, frozen=False):
+    if cls is None:
+        # Used with arguments, like @adt(slots=True)
+        return functools.partial(adt, slots=slots, frozen=frozen)
+
     try:
         annotations = cls.__annotations__
     except AttributeError:
@@ -24,139 +40,1470 @@ def adt(cls):
                 f'Annotation {k} should be a Case[…] constructor, got {constructor!r} instead'
             )
 
-    cls._Key = Enum(  # type: ignore
-        '_Key', list(caseConstructors.keys()))
+    # See _SLOTS.
+    hasNamedFields = any(constructor.getNames() is not None
+                         for constructor in caseConstructors.values())
+    if slots:
+        cls = _makeSlotted(cls, frozen, valueSlot=not hasNamedFields)
 
-    cls._types = list(x.getTypes() for x in list(caseConstructors.values()))
+    cls._Key = _CaseKeys(caseConstructors)
 
+    cls._types = tuple(x.getTypes() for x in caseConstructors.values())
+
+    origInit = cls.__init__
     _installInit(cls)
     _installRepr(cls)
     _installStr(cls)
-    _installEq(cls)
-    _installHash(cls)
+    _installEq(cls, frozen)
+    _installHash(cls, frozen)
+
+    if frozen:
+        _installFrozen(cls)
 
     for caseKey in cls._Key.__members__.values():
-        _installOneConstructor(cls, caseKey)
         _installOneAccessor(cls, caseKey)
 
     _installMatch(cls, cls._Key)
+    _installMatchers(cls, cls._Key)
+    _installFold(cls, cls._Key)
+    _installCodec(cls)
+    _installReduce(cls, cls._Key)
+    _installInitSubclass(cls)
+
+    # Installed last, because nullary cases are constructed right away.
+    for caseKey in cls._Key.__members__.values():
+        _installOneCase(cls, caseKey, origInit, frozen, slots
+                        and hasNamedFields)
+
+    _installCaseClasses(cls)
+
     return cls
 
 
+# Identifies a case of an ADT class, for its values to refer to. Like the
+# members of an Enum (which these replaced), keys have a `name` and a `value`
+# (numbering them from 1), and are compared and hashed by identity, but they
+# are much cheaper to create. Keys also record the arity of their case, and
+# the lowercase name of its accessor and `match` callback.
+#
+# Like everything else created by @adt, keys can't be changed once created,
+# so they (and the generated methods which use them) can be shared between
+# threads without locking, even without the GIL.
+class _CaseKey:
+    __slots__ = ('name', 'value', 'arity', 'lowerName')
+
+    name: str
+    value: int
+    arity: int
+    lowerName: str
+
+    def __init__(self, name: str, value: int, arity: int):
+        _setattr = object.__setattr__
+        _setattr(self, 'name', name)
+        _setattr(self, 'value', value)
+        _setattr(self, 'arity', arity)
+        _setattr(self, 'lowerName', name.lower())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f'Case keys are immutable, so {name} cannot be set')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(
+            f'Case keys are immutable, so {name} cannot be deleted')
+
+    def __repr__(self) -> str:
+        return f'<_Key.{self.name}: {self.value}>'
+
+
+# The keys of an ADT class's cases, which can be looked up by name as items or
+# attributes, or iterated over in order, like an Enum class (and likewise,
+# `__members__` is read-only).
+class _CaseKeys:
+    __slots__ = ('__members__', )
+
+    __members__: Mapping[str, _CaseKey]
+
+    def __init__(self,
+                 constructors: Dict[str, CaseConstructor.AnyConstructor]):
+        object.__setattr__(
+            self, '__members__',
+            MappingProxyType({
+                name: _CaseKey(name, value, _arity(constructor))
+                for value, (
+                    name,
+                    constructor) in enumerate(constructors.items(), start=1)
+            }))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f'Case keys are immutable, so {name} cannot be set')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(
+            f'Case keys are immutable, so {name} cannot be deleted')
+
+    def __getitem__(self, name: str) -> _CaseKey:
+        return self.__members__[name]
+
+    def __getattr__(self, name: str) -> _CaseKey:
+        try:
+            return self.__members__[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[_CaseKey]:
+        return iter(self.__members__.values())
+
+    def __len__(self) -> int:
+        return len(self.__members__)
+
+    def __repr__(self) -> str:
+        return f'<cases {", ".join(self.__members__)}>'
+
+
+# Instance attributes set by the generated methods, which become the
+# `__slots__` of classes decorated with @adt(slots=True). Frozen classes
+# additionally cache their hash in `_hash`. (The case of a value is given by
+# its class, so its `_key` is a class attribute; see _installOneCase.)
+#
+# Cases with named fields store them in slots of their own instead of
+# `_value`, so if there are any, `_value` is a slot of each of the other case
+# classes, rather than of the ADT class that they all derive from.
+_SLOTS = ('_value', )
+_FROZEN_SLOTS = ('_hash', )
+
+
+# Slots can't be added to an existing class, so this recreates `cls` with the
+# same namespace plus fixed storage for the generated attributes (like
+# dataclasses does for `slots=True`).
+def _makeSlotted(cls: Any, frozen: bool, valueSlot: bool) -> Any:
+    if '__slots__' in cls.__dict__:
+        raise TypeError(f'{cls} already specifies __slots__')
+
+    slots = _SLOTS if valueSlot else ()
+    if frozen:
+        slots += _FROZEN_SLOTS
+
+    if not any(base.__weakrefoffset__ for base in cls.__bases__):
+        # Values can still be weakly referenced, as without slots.
+        slots += ('__weakref__', )
+
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = slots
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+
+    # Methods using `super()` or `__class__` refer to the class through a
+    # closure cell, which would otherwise still hold the original class.
+    for member in namespace.values():
+        if isinstance(member, (classmethod, staticmethod)):
+            member = member.__func__
+        elif isinstance(member, property):
+            for function in (member.fget, member.fset, member.fdel):
+                _replaceClassCell(function, cls, slotted)
+            continue
+
+        _replaceClassCell(member, cls, slotted)
+
+    return slotted
+
+
+# Points the `__class__` cell of `function` (if it has one, holding `old`) at
+# `new` instead.
+def _replaceClassCell(function: Any, old: Any, new: Any) -> None:
+    code = getattr(function, '__code__', None)
+    if code is None or '__class__' not in code.co_freevars:
+        return
+
+    cell = function.__closure__[code.co_freevars.index('__class__')]
+    if cell.cell_contents is old:
+        cell.cell_contents = new
+
+
+# Values are only ever constructed by the classes of their cases, which
+# bypass __init__ (calling any custom __init__ themselves), so the ADT class
+# itself can't be instantiated.
 def _installInit(cls: Any) -> None:
-    def _init(self: Any,
-              key: Enum,
-              value: Any,
-              orig_init: Callable[[Any], None] = cls.__init__) -> None:
-        self._key = key
-        self._value = value
-        orig_init(self)
+    def _init(self: Any, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(
+            f'{type(self).__name__} cannot be instantiated directly, only through one of its cases'
+        )
 
     cls.__init__ = _init
 
 
+# The generated __repr__, __str__, __eq__ and __hash__ recurse into nested ADT
+# values through Python's own protocols (e.g., `self._value == other._value`),
+# which is the fastest way to handle the shallow values that are most common.
+# Values nested too deeply for that raise RecursionError partway through, so
+# each method then starts over with an equivalent loop over an explicit stack.
+#
+# Formatting is the exception: a string produced partway down would be copied
+# again by every enclosing frame, so those fallbacks instead defer to the
+# outermost generated __repr__ or __str__ still on the stack.
+
+
 def _installRepr(cls: Any) -> None:
     def _repr(self: Any) -> str:
-        return f'{type(self)}.{self._key.name}({self._value})'
+        if _formatLimits is not None:
+            return _formatIteratively(self, _REPR, *_formatLimits)
+
+        try:
+            return f'{self._adtClass}.{self._key.name}({self._value})'
+        except RecursionError:
+            if _insideFastFormat():
+                raise
+
+            return _formatIteratively(self, _REPR)
 
     if '__repr__' not in cls.__dict__:
+        setattr(_repr, '_generatedFormat', _REPR)
         cls.__repr__ = _repr
 
 
 def _installStr(cls: Any) -> None:
     def _str(self: Any) -> str:
-        return f'<{type(self)}.{self._key.name}: {self._value}>'
+        if _formatLimits is not None:
+            return _formatIteratively(self, _STR, *_formatLimits)
+
+        try:
+            return f'<{self._adtClass}.{self._key.name}: {self._value}>'
+        except RecursionError:
+            if _insideFastFormat():
+                raise
+
+            return _formatIteratively(self, _STR)
 
     if '__str__' not in cls.__dict__:
+        setattr(_str, '_generatedFormat', _STR)
         cls.__str__ = _str
 
 
-def _installEq(cls: Any) -> None:
+def _installEq(cls: Any, frozen: bool) -> None:
     # It's important to capture `cls` here, instead of using type(self), to
     # preserve covariance; i.e., if `self` and `other` are instances of
     # different descendants of `cls`, it's irrelevant for this particular
     # equality check and we shouldn't rule it out (that should be the job of
     # further-derived classes' implementation of __eq__).
+    #
+    # Values of the same case class (the usual comparison) are known to have
+    # the same case already.
     def _eq(self: Any, other: Any, cls: Type[Any] = cls) -> bool:
-        if not isinstance(other, cls):
+        if self is other:
+            return True
+        elif type(other) is not type(self):
+            if not isinstance(other, cls) or self._key != other._key:
+                return False
+
+        try:
+            return bool(self._value == other._value)
+        except RecursionError:
+            return _equalIteratively(self, other)
+
+    # Values whose hashes have already been computed can often be told apart
+    # without comparing their (possibly very large) contents.
+    def _frozenEq(self: Any, other: Any, cls: Type[Any] = cls) -> bool:
+        if self is other:
+            return True
+        elif type(other) is not type(self):
+            if not isinstance(other, cls) or self._key != other._key:
+                return False
+
+        selfHash = self._hash
+        otherHash = other._hash
+        if selfHash is not None and otherHash is not None and selfHash != otherHash:
             return False
 
-        return bool(self._key == other._key and self._value == other._value)
+        try:
+            return bool(self._value == other._value)
+        except RecursionError:
+            return _equalIteratively(self, other)
 
     if '__eq__' not in cls.__dict__:
-        cls.__eq__ = _eq
+        eq = _frozenEq if frozen else _eq
+        setattr(eq, '_generatedEq', (cls, frozen))
+        cls.__eq__ = eq
 
 
-def _installHash(cls: Any) -> None:
-    # It's important to capture `cls` here, instead of using type(self), to
-    # preserve covariance; i.e., if `self` and `other` are instances of
-    # different descendants of `cls`, it's irrelevant for this particular
-    # equality check and we shouldn't rule it out (that should be the job of
-    # further-derived classes' implementation of __eq__).
+def _installHash(cls: Any, frozen: bool) -> None:
     def _hash(self: Any) -> int:
-        return hash((self._key, self._value))
+        value = self._value
+        if value is None:
+            return hash(self._key)
+
+        try:
+            return hash((self._key, value))
+        except RecursionError:
+            return _hashIteratively(self)
+
+    # Frozen values can't change, so their hash is computed at most once. For
+    # a recursive value, this also means hashing a new node only needs the
+    # already-computed hashes of its children.
+    def _frozenHash(
+            self: Any,
+            _setattr: Callable[[Any, str, Any], None] = object.__setattr__
+    ) -> int:
+        cachedHash: Optional[int] = self._hash
+        if cachedHash is None:
+            cachedHash = _hash(self)
+            _setattr(self, '_hash', cachedHash)
+
+        return cachedHash
 
     if '__hash__' not in cls.__dict__:
-        cls.__hash__ = _hash
+        hashMethod = _frozenHash if frozen else _hash
+        setattr(hashMethod, '_generatedHash', frozen)
+        cls.__hash__ = hashMethod
+
+
+# Generated methods are marked (as `_generatedEq`, `_generatedHash` and
+# `_generatedFormat`) with whatever is needed to apply them to a value without
+# calling them. The iterative fallbacks below only expand a nested ADT value
+# in place if its type uses the generated method, so custom implementations
+# are always respected.
+#
+# The marks are kept on the methods, rather than in tables here, so that ADT
+# classes can be garbage collected like any other class, and nothing shared
+# changes as classes are decorated. Likewise, the code of the generated
+# __repr__ and __str__ is the same for every class (only their closures
+# differ), so is known before any are generated.
+_fastFormatCodes: FrozenSet[CodeType] = frozenset(
+    const for install in (_installRepr, _installStr)
+    for const in install.__code__.co_consts if isinstance(const, CodeType))
+
+
+# Whether the calling generated __repr__ or __str__ is nested within another
+# one that has not yet fallen back to _formatIteratively (and so will start
+# over with it, if the RecursionError is allowed to propagate).
+def _insideFastFormat() -> bool:
+    frame: Optional[FrameType] = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code is _formatIteratively.__code__:
+            return False
+        elif code in _fastFormatCodes:
+            return True
+
+        frame = frame.f_back
+
+    return False
+
+
+# Equivalent to the generated __eq__, for ADT values `a` and `b` of the same
+# (covariant) class.
+def _equalIteratively(a: Any, b: Any) -> bool:
+    pending = [(a._key, b._key), (a._value, b._value)]
+    while pending:
+        a, b = pending.pop()
+        if a is b:
+            continue
+
+        aType = type(a)
+        bType = type(b)
+        if aType is tuple and bType is tuple:
+            if len(a) != len(b):
+                return False
+
+            # Pushed in reverse, to compare from left to right like `==`.
+            pending.extend(zip(reversed(a), reversed(b)))
+            continue
 
+        eq = aType.__eq__
+        info = getattr(eq, '_generatedEq', None)
 
-def _installOneConstructor(cls: Any, case: Enum) -> None:
-    def constructor(cls: Type[Any], *args: Any, _case: Enum = case) -> Any:
-        return cls(key=_case,
-                   value=cls.__annotations__[_case.name].constructCase(*args))
+        # A different __eq__ on `b` may take precedence, so only the simple
+        # case of both sharing the generated implementation is expanded.
+        if info is None or (bType is not aType and bType.__eq__ is not eq):
+            if not a == b:
+                return False
+
+            continue
+
+        cls, frozen = info
+        if not isinstance(b, cls):
+            return False
+
+        if frozen:
+            aHash = a._hash
+            bHash = b._hash
+            if aHash is not None and bHash is not None and aHash != bHash:
+                return False
+
+        pending.append((a._value, b._value))
+        pending.append((a._key, b._key))
+
+    return True
+
+
+class _Hashed:
+    """Stands in for a value whose hash has already been computed."""
+
+    __slots__ = ('_hash', )
+
+    def __init__(self, hashValue: int):
+        self._hash = hashValue
+        super().__init__()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+
+# Kinds of `_hashIteratively` work items.
+_VISIT = 0
+_COMBINE_NODE = 1
+_COMBINE_TUPLE = 2
+
+
+# Equivalent to the generated __hash__ of the ADT value `root`. Nested ADT
+# values are hashed bottom up, and replaced by stand-ins carrying their
+# hashes, so that hashing a containing tuple gives the exact same result.
+# Frozen values have their hashes cached along the way.
+def _hashIteratively(root: Any) -> int:
+    work: List[Tuple[int, Any]] = [(_VISIT, root)]
+    results: List[Any] = []
+
+    while work:
+        kind, item = work.pop()
+        if kind == _COMBINE_NODE:
+            combined = hash((item._key, results.pop()))
+            if getattr(type(item).__hash__, '_generatedHash'):
+                object.__setattr__(item, '_hash', combined)
+
+            results.append(_Hashed(combined))
+            continue
+        elif kind == _COMBINE_TUPLE:
+            start = len(results) - item
+            parts = tuple(results[start:])
+            del results[start:]
+            results.append(parts)
+            continue
+
+        itemType = type(item)
+        if itemType is tuple:
+            work.append((_COMBINE_TUPLE, len(item)))
+            work.extend((_VISIT, x) for x in reversed(item))
+            continue
+
+        frozen = getattr(itemType.__hash__, '_generatedHash', None)
+        if frozen is None:
+            # Hashed as-is, as part of whatever contains it.
+            results.append(item)
+            continue
+        elif frozen:
+            cachedHash = item._hash
+            if cachedHash is not None:
+                results.append(_Hashed(cachedHash))
+                continue
+
+        value = item._value
+        if value is None:
+            combined = hash(item._key)
+            if frozen:
+                object.__setattr__(item, '_hash', combined)
+
+            results.append(_Hashed(combined))
+            continue
+
+        work.append((_COMBINE_NODE, item))
+        work.append((_VISIT, value))
+
+    rootHash: int = hash(results.pop())
+    return rootHash
+
+
+# How `_formatIteratively` renders a value: like repr(), or like str() (which
+# is also how the value of an ADT is rendered, as if by an f-string).
+_REPR = 0
+_STR = 1
+
+
+# Equivalent to the generated __repr__ or __str__ (per `mode`) of the ADT
+# value `root`, except that ADT values nested more than `depth` deep within
+# it are rendered as `...`, and so is everything past the first `length`
+# characters.
+def _formatIteratively(root: Any,
+                       mode: int,
+                       depth: Optional[int] = None,
+                       length: Optional[int] = None) -> str:
+    pieces: List[str] = []
+    size = 0
+
+    # Stack of literal strings to output, and (value, mode, level) tuples to
+    # render, where `level` counts the ADT values enclosing that one.
+    work: List[Any] = [(root, mode, 0)]
+
+    while work:
+        item = work.pop()
+        if type(item) is str:
+            piece = item
+        else:
+            value, mode, level = item
+            valueType: Any = type(value)
+            if valueType is tuple:
+                work.append(',)' if len(value) == 1 else ')')
+                for i in reversed(range(len(value))):
+                    work.append((value[i], _REPR, level))
+                    if i:
+                        work.append(', ')
+
+                work.append('(')
+                continue
+            elif mode == _REPR:
+                generated = getattr(valueType.__repr__, '_generatedFormat',
+                                    None)
+                if generated != _REPR:
+                    piece = repr(value)
+                elif depth is not None and level > depth:
+                    piece = '...'
+                else:
+                    work.append(')')
+                    work.append((value._value, _STR, level + 1))
+                    work.append(f'{value._adtClass}.{value._key.name}(')
+                    continue
+            else:
+                generated = getattr(valueType.__str__, '_generatedFormat',
+                                    None)
+                if (generated != _STR
+                        or valueType.__format__ is not object.__format__):
+                    piece = format(value, '')
+                elif depth is not None and level > depth:
+                    piece = '...'
+                else:
+                    work.append('>')
+                    work.append((value._value, _STR, level + 1))
+                    work.append(f'<{value._adtClass}.{value._key.name}: ')
+                    continue
+
+        pieces.append(piece)
+        size += len(piece)
+        if length is not None and size > length:
+            return ''.join(pieces)[:length] + '...'
+
+    return ''.join(pieces)
+
+
+# The limits (per `_formatIteratively`) upon the generated __repr__ and
+# __str__ of every ADT, or None for them to render values in full.
+_formatLimits: Optional[Tuple[Optional[int], Optional[int]]] = None
+
+
+def set_format_limits(depth: Optional[int] = None,
+                      length: Optional[int] = None) -> None:
+    """Limits how much of a value the generated __repr__ and __str__ of every ADT
+    will render, which is all of it by default.
+
+    ADT values nested more than `depth` deep are shown as `...`, and the output
+    stops (ending with `...`) after `length` characters. Either limit can be
+    None, for no limit.
+    """
+    global _formatLimits
+    if depth is None and length is None:
+        _formatLimits = None
+    else:
+        _formatLimits = (depth, length)
+
+
+# How much of a value is rendered in error messages, regardless of
+# `_formatLimits`.
+_ERROR_FORMAT_LIMITS = (3, 200)
+
+
+# The message of an exception about some ADT value(s), which is only
+# rendered (like str.format, but with every ADT value in `args` limited per
+# _ERROR_FORMAT_LIMITS) when the exception is printed, so raising one costs
+# the same however large the values are.
+class _ErrorMessage:
+    __slots__ = ('_template', '_args')
+
+    def __init__(self, template: str, *args: Any):
+        self._template = template
+        self._args = args
+
+    def __str__(self) -> str:
+        return self._template.format(
+            *(_formatIteratively(arg, _STR, *_ERROR_FORMAT_LIMITS)
+              for arg in self._args))
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    # Pickled (e.g., to send the exception to another process) as the
+    # rendered message.
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (str, (str(self), ))
+
+
+def _installFrozen(cls: Any) -> None:
+    def _setattr(self: Any, name: str, value: Any) -> None:
+        raise AttributeError(
+            f'{self._adtClass.__name__} is frozen, so {name} cannot be assigned'
+        )
+
+    def _delattr(self: Any, name: str) -> None:
+        raise AttributeError(
+            f'{self._adtClass.__name__} is frozen, so {name} cannot be deleted'
+        )
+
+    for name, method in (('__setattr__', _setattr), ('__delattr__', _delattr)):
+        if name in cls.__dict__:
+            raise TypeError(f'{cls} is frozen, so it cannot define {name}')
+
+        setattr(cls, name, method)
+
+
+# How a case's associated data is stored in `_value`: nothing, the single
+# value itself, or a tuple of values.
+_NULLARY = 0
+_IDENTITY = 1
+_TUPLE = 2
+
+
+def _arity(constructor: CaseConstructor.AnyConstructor) -> int:
+    if isinstance(constructor, TupleConstructor):
+        return _TUPLE
+    elif isinstance(constructor, IdentityConstructor):
+        return _IDENTITY
+    else:
+        return _NULLARY
+
+
+# Each case is a class of its own, deriving from the ADT class, so that its
+# values can be told apart by isinstance() and by class patterns in `match`
+# statements (with positional patterns binding the case's associated data,
+# as listed in `__match_args__`). The case class is also what constructs its
+# values, when called.
+#
+# Named fields are stored in slots of the case class, rather than packed into
+# a tuple, and `_value` reads them back as a tuple (or the only field) for
+# everything that handles the associated data of any case alike.
+def _installOneCase(cls: Any, case: _CaseKey, origInit: Callable[[Any], None],
+                    frozen: bool, valueSlot: bool) -> None:
+    caseConstructor = cls.__annotations__[case.name]
+    arity = case.arity
+    if arity == _TUPLE:
+        fieldCount = len(caseConstructor.getTypes())
+    elif arity == _IDENTITY:
+        fieldCount = 1
+    else:
+        fieldCount = 0
 
     if hasattr(cls, case.name):
         raise AttributeError(
             f'{cls} should not have a default value for {case.name}, as this will be a generated constructor'
         )
 
-    setattr(cls, case.name, classmethod(constructor))
+    fieldNames: Optional[Tuple[str, ...]] = caseConstructor.getNames()
+    for name in fieldNames or ():
+        if hasattr(cls, name):
+            raise TypeError(
+                f'Field {name} of {case.name} would hide the attribute {name} of {cls}'
+            )
+
+    # `object.__init__` does nothing, so only a custom __init__ is worth the
+    # extra call.
+    init = None if origInit is object.__init__ else origInit
+    metaclass = _caseMetaclass(type(cls), f'{cls.__qualname__}.{case.name}',
+                               arity, fieldCount, fieldNames, init, frozen)
+
+    namespace: Dict[str, Any] = {
+        '__slots__': _SLOTS if valueSlot else (),
+        '__module__': cls.__module__,
+        '__qualname__': f'{cls.__qualname__}.{case.name}',
+        '_key': case,
+        '_adtClass': cls,
+    }
+    if fieldNames is not None:
+        namespace['__slots__'] = fieldNames
+        namespace['__match_args__'] = fieldNames
+        namespace['_value'] = property(operator.attrgetter(*fieldNames))
+    elif arity == _TUPLE:
+        positions = tuple(f'_{i}' for i in range(fieldCount))
+        for i, name in enumerate(positions):
+            namespace[name] = _fieldProperty(i)
+
+        namespace['__match_args__'] = positions
+    elif arity == _IDENTITY:
+        namespace['__match_args__'] = ('_value', )
+    else:
+        namespace['__match_args__'] = ()
+        namespace['_singleton'] = None
+
+    caseClass = metaclass(case.name, (cls, ), namespace)
+
+    # Nullary cases are all equal to one another, so calling the case class
+    # hands out a single shared instance.
+    if arity == _NULLARY:
+        caseClass._singleton = caseClass()
+        _installSingletonGuards(caseClass)
 
+    setattr(cls, case.name, caseClass)
 
-def _installOneAccessor(cls: Any, case: Enum) -> None:
-    def accessor(self: Any, _case: Enum = case) -> Any:
-        if self._key != _case:
+
+# The shared instance of a nullary case can't be changed, even if the ADT
+# isn't frozen, as a change would be seen by every user of that case. This is
+# left to the ADT if it already controls attribute assignment (as frozen ADTs
+# do). The values of descendants' nullary cases aren't shared, so are exempt.
+def _installSingletonGuards(caseClass: Any) -> None:
+    def _setattr(self: Any, name: str, value: Any) -> None:
+        if self is type(self)._singleton:
             raise AttributeError(
-                f'{self} was constructed as case {self._key.name}, so {_case.name.lower()} is not accessible'
+                f'{self._adtClass.__name__}.{self._key.name}() is shared, so {name} cannot be assigned'
             )
 
+        object.__setattr__(self, name, value)
+
+    def _delattr(self: Any, name: str) -> None:
+        if self is type(self)._singleton:
+            raise AttributeError(
+                f'{self._adtClass.__name__}.{self._key.name}() is shared, so {name} cannot be deleted'
+            )
+
+        object.__delattr__(self, name)
+
+    if caseClass.__setattr__ is object.__setattr__:
+        caseClass.__setattr__ = _setattr
+
+    if caseClass.__delattr__ is object.__delattr__:
+        caseClass.__delattr__ = _delattr
+
+
+# Properties for the fields of tuple cases (by index), which are the same for
+# every case class, so are shared between them.
+#
+# Like the other caches below, entries are stored with setdefault(), so that
+# classes being decorated at the same time (in different threads) share one.
+_fieldProperties: Dict[int, property] = {}
+
+
+def _fieldProperty(index: int) -> property:
+    fieldProperty = _fieldProperties.get(index)
+    if fieldProperty is None:
+
+        def field(self: Any) -> Any:
+            return self._value[index]
+
+        fieldProperty = _fieldProperties.setdefault(index, property(field))
+
+    return fieldProperty
+
+
+# The base of the metaclasses of all case classes, so that ADT values (which
+# are all instances of case classes) can be told apart by the type of their
+# type, without keeping a table of every case class.
+class _CaseType(type):
+    pass
+
+
+# Case classes construct their values in a generated metaclass __call__,
+# which skips the usual __new__ and __init__ lookups. Its code only differs in
+# the shape of the case it builds, but each case has a metaclass (and so a
+# __call__) of its own, named after the case, for the TypeErrors raised by
+# calls with the wrong arguments to say which case was being constructed.
+def _caseMetaclass(base: type, qualname: str, arity: int, fieldCount: int,
+                   fieldNames: Optional[Tuple[str, ...]],
+                   init: Optional[Callable[[Any], None]],
+                   frozen: bool) -> type:
+    factory = _constructorFactory(arity, fieldCount, fieldNames,
+                                  init is not None, frozen)
+    call = factory(object.__new__, init, object.__setattr__)
+    call.__name__ = qualname.rpartition('.')[2]
+    call.__qualname__ = qualname
+    return type('_CaseMeta', (_CaseType, base), {
+        '__module__': __name__,
+        '__call__': call,
+    })
+
+
+# Descendants of an ADT class get case classes of their own, deriving from
+# both the descendant and the ADT's case class, so that their values are
+# instances of the descendant (and still match the ADT's cases).
+#
+# A custom __init_subclass__, of the ADT class or of a descendant, is only
+# called for classes defined by users, so it's skipped for case classes (which
+# are told apart by having an `_adtClass` of their own).
+def _installInitSubclass(cls: Any, installsCases: bool = True) -> None:
+    custom = cls.__dict__.get('__init_subclass__')
+
+    def __init_subclass__(subclass: Any, **kwargs: Any) -> None:
+        if custom is None or '_adtClass' in subclass.__dict__:
+            super(cls, subclass).__init_subclass__(**kwargs)  # type: ignore
+        else:
+            custom.__get__(None, subclass)(**kwargs)
+
+        # Case classes, and anything deriving from them, already have a case.
+        if installsCases and not hasattr(subclass, '_key'):
+            if '__init_subclass__' in subclass.__dict__:
+                _installInitSubclass(subclass, installsCases=False)
+
+            _installDescendantCases(subclass)
+
+    cls.__init_subclass__ = classmethod(__init_subclass__)
+
+
+def _installDescendantCases(cls: Any) -> None:
+    for name in cls._Key.__members__:
+        if name in cls.__dict__:
+            continue
+
+        caseClass = getattr(cls, name)
+        if _addsSlots(cls, caseClass) and _addsSlots(caseClass, cls):
+            raise TypeError(
+                f'{cls} cannot add __slots__, as the case {name} of {caseClass._adtClass} has slots of its own'
+            )
+
+        metaclass = type(caseClass)
+        if not issubclass(metaclass, type(cls)):
+            metaclass = type('_CaseMeta', (metaclass, type(cls)),
+                             {'__module__': __name__})
+
+        namespace: Dict[str, Any] = {
+            '__slots__': (),
+            '__module__': cls.__module__,
+            '__qualname__': f'{cls.__qualname__}.{name}',
+            '_adtClass': cls,
+        }
+
+        # Descendants get their own instances of nullary cases, every time.
+        if caseClass._key.arity == _NULLARY:
+            namespace['_singleton'] = None
+
+        setattr(cls, name, metaclass(name, (cls, caseClass), namespace))
+
+    _installCaseClasses(cls)
+
+
+# Whether a class that `cls` derives from, but `other` doesn't, adds slots to
+# the instances of `cls`. A class can't derive from two classes which both do.
+def _addsSlots(cls: Any, other: Any) -> bool:
+    for base in cls.__mro__:
+        if base in other.__mro__:
+            continue
+
+        slots = base.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots, )
+
+        if set(slots) - {'__dict__', '__weakref__'}:
+            return True
+
+    return False
+
+
+# Generated constructors only differ in the shape of the case they build, so
+# their code is compiled once per shape and closed over everything else.
+_constructorFactories: Dict[Tuple[int, int, Optional[Tuple[str, ...]], bool,
+                                  bool], Callable[..., Any]] = {}
+
+
+def _constructorFactory(arity: int, fieldCount: int,
+                        fieldNames: Optional[Tuple[str, ...]], callsInit: bool,
+                        frozen: bool) -> Callable[..., Any]:
+    shape = (arity, fieldCount, fieldNames, callsInit, frozen)
+    try:
+        return _constructorFactories[shape]
+    except KeyError:
+        pass
+
+    # Each attribute to set, and the expression setting it. Field names never
+    # start with an underscore, so can't clash with the other names used here.
+    if fieldNames is not None:
+        params = list(fieldNames)
+        attributes = [(name, name) for name in fieldNames]
+    else:
+        params = [f'_{i}' for i in range(fieldCount)]
+        if arity == _TUPLE:
+            value = f'({"".join(f"{p}, " for p in params)})'
+        elif arity == _IDENTITY:
+            value = params[0]
+        else:
+            value = 'None'
+
+        attributes = [('_value', value)]
+
+    body = ['_self = _new(_cls)']
+    if frozen:
+        body += [
+            f"_setattr(_self, '{name}', {expression})"
+            for name, expression in attributes
+        ]
+        body.append("_setattr(_self, '_hash', None)")
+    else:
+        body += [
+            f'_self.{name} = {expression}' for name, expression in attributes
+        ]
+    if callsInit:
+        body.append('_init(_self)')
+
+    # Nullary case classes hand out their shared instance, if they have one.
+    if arity == _NULLARY:
+        body = ['_self = _cls._singleton', 'if _self is None:'
+                ] + [f'    {line}' for line in body]
+
+    lines = [
+        'def factory(_new, _init, _setattr):',
+        f'    def __call__({", ".join(["_cls"] + params)}):',
+    ]
+    lines += [f'        {line}' for line in body]
+    lines += [
+        '        return _self',
+        '    return __call__',
+    ]
+
+    namespace: Dict[str, Any] = {}
+    exec('\n'.join(lines), {}, namespace)
+    factory: Callable[..., Any] = namespace['factory']
+    return _constructorFactories.setdefault(shape, factory)
+
+
+def _installOneAccessor(cls: Any, case: _CaseKey) -> None:
+    def accessor(self: Any, _case: _CaseKey = case) -> Any:
+        if self._key is not _case:
+            raise AttributeError(
+                _ErrorMessage(
+                    '{} was constructed as case {}, so {} is not accessible',
+                    self, self._key.name, _case.lowerName))
+
         return self._value
 
-    accessorName = case.name.lower()
+    accessorName = case.lowerName
     if accessorName not in cls.__dict__:
         setattr(cls, accessorName, accessor)
 
+    # Unlike the accessor, these never raise, so checking the case of a value
+    # (or retrieving its data only if it has one) costs no more on a miss.
+    def predicate(self: Any, _case: _CaseKey = case) -> bool:
+        return self._key is _case
+
+    def getter(self: Any, default: Any = None, _case: _CaseKey = case) -> Any:
+        return self._value if self._key is _case else default
+
+    for name, method in ((f'is_{accessorName}', predicate),
+                         (f'get_{accessorName}', getter)):
+        if name not in cls.__dict__:
+            setattr(cls, name, method)
+
 
 _MatchResult = TypeVar('_MatchResult')
 
 
-def _installMatch(cls: Any, cases: Type[Enum]) -> None:
+def _installMatch(cls: Any, cases: _CaseKeys) -> None:
+    # Everything that doesn't depend on the arguments is resolved here, once
+    # (or is recorded by the key of each case), so that a well-formed call
+    # costs one lookup plus the callback itself.
+    expectedKeys = frozenset(name.lower() for name in cases.__members__)
+
     def match(self: Any,
-              _cases: Type[Enum] = cases,
+              _expectedKeys: FrozenSet[str] = expectedKeys,
               **kwargs: Callable[..., _MatchResult]) -> _MatchResult:
-        caseNames = _cases.__members__.keys()
-        upperKeys = {k: k.upper() for k in kwargs.keys()}
+        if kwargs.keys() != _expectedKeys:
+            kwargs = _validateMatch(self, cases, kwargs)
+
+        key = self._key
+        callback = kwargs[key.lowerName]
+        arity = key.arity
+        if arity == _TUPLE:
+            return callback(*self._value)
+        elif arity == _IDENTITY:
+            return callback(self._value)
+        else:
+            return callback()
+
+    if 'match' not in cls.__dict__:
+        cls.match = match
+
+
+# Callbacks for each case (keyed by case), along with the arity of the case.
+_MatchTable = Dict[_CaseKey, Tuple[Callable[..., _MatchResult], int]]
+
+
+def _installMatchers(cls: Any, cases: _CaseKeys) -> None:
+    expectedKeys = frozenset(name.lower() for name in cases.__members__)
+
+    # Validates `kwargs` like `match` would, but just once.
+    def matchTable(cls: Any, kwargs: Dict[str, Callable[..., _MatchResult]]
+                   ) -> _MatchTable[_MatchResult]:
+        if kwargs.keys() != expectedKeys:
+            kwargs = _validateMatch(cls, cases, kwargs)
+
+        return {case: (kwargs[case.lowerName], case.arity) for case in cases}
+
+    # Nothing is mutated after the callbacks have been validated, so the
+    # returned function can be shared freely (including by threads).
+    def matcher(cls: Any, **kwargs: Callable[..., _MatchResult]
+                ) -> Callable[[Any], _MatchResult]:
+        return _matchFunction(matchTable(cls, kwargs))
+
+    # `_batch` is prefixed like `_values`, so as not to clash with the callback
+    # of a BATCH case.
+    def match_many(cls: Any,
+                   _values: Iterable[Any],
+                   _batch: bool = False,
+                   **kwargs: Callable[..., _MatchResult]
+                   ) -> Iterator[_MatchResult]:
+        table = matchTable(cls, kwargs)
+        if _batch:
+            return iter(_matchBatches(list(_values), table))
+
+        return map(_matchFunction(table), _values)
+
+    if 'matcher' not in cls.__dict__:
+        cls.matcher = classmethod(matcher)
+
+    if 'match_many' not in cls.__dict__:
+        cls.match_many = classmethod(match_many)
+
+
+def _matchFunction(table: _MatchTable[_MatchResult]
+                   ) -> Callable[[Any], _MatchResult]:
+    def match(value: Any,
+              _table: _MatchTable[_MatchResult] = table) -> _MatchResult:
+        callback, arity = _table[value._key]
+        if arity == _TUPLE:
+            return callback(*value._value)
+        elif arity == _IDENTITY:
+            return callback(value._value)
+        else:
+            return callback()
+
+    return match
+
+
+# A pattern-matching callback which handles many values at once (see
+# `batched`).
+class _BatchedCallback:
+    __slots__ = ('callback', )
+
+    def __init__(self, callback: Callable[[List[Any]], Sequence[Any]]):
+        self.callback = callback
+        super().__init__()
+
+    # Called like any other callback, by `match` and friends.
+    def __call__(self, *args: Any) -> Any:
+        if len(args) > 1:
+            value: Any = args
+        elif args:
+            value = args[0]
+        else:
+            value = None
 
-        for key in upperKeys.values():
-            if key not in caseNames:
+        return self.callback([value])[0]
+
+    def __repr__(self) -> str:
+        return f'batched({self.callback!r})'
+
+
+def batched(callback: Callable[[List[Any]], Sequence[_MatchResult]]
+            ) -> Callable[..., _MatchResult]:
+    """Marks a pattern-matching callback as able to handle many values at once.
+
+    When passed to `match_many(..., _batch=True)`, the callback is invoked once
+    for all of the values of its case, with a list of the data associated
+    with each (in the same form as the case's accessor would return it), and
+    must return a sequence of results of the same length.
+
+    Elsewhere, the callback is invoked with a list of one value at a time.
+    """
+    return _BatchedCallback(callback)
+
+
+# Matches every value in `values` against its callback in `table`, grouping
+# the values by case, and returns the results in the original order.
+def _matchBatches(values: List[Any],
+                  table: _MatchTable[_MatchResult]) -> List[_MatchResult]:
+    positions: Dict[_CaseKey, List[int]] = {case: [] for case in table}
+    for i, key in enumerate(map(_getKey, values)):
+        positions[key].append(i)
+
+    results: List[Any] = [None] * len(values)
+    for case, indices in positions.items():
+        if not indices:
+            continue
+
+        callback, arity = table[case]
+        data = [values[i]._value for i in indices]
+        if isinstance(callback, _BatchedCallback):
+            caseResults = callback.callback(data)
+            if len(caseResults) != len(data):
                 raise ValueError(
-                    f'Unrecognized case {key} in pattern match against {self} (expected one of {caseNames})'
+                    f'Batched callback for {case.name} returned {len(caseResults)} results for {len(data)} values'
                 )
+        elif arity == _TUPLE:
+            caseResults = list(itertools.starmap(callback, data))
+        elif arity == _IDENTITY:
+            caseResults = list(map(callback, data))
+        else:
+            caseResults = [callback() for _ in data]
 
-        for key in caseNames:
-            if key not in upperKeys.values():
-                raise ValueError(
-                    f'Incomplete pattern match against {self} (missing {key})')
+        for i, result in zip(indices, caseResults):
+            results[i] = result
 
-        for key, callback in kwargs.items():
-            upperKey = upperKeys[key]
+    return results
 
-            if self._key == _cases.__members__[upperKey]:
-                caseConstructor: CaseConstructor.AnyConstructor = type(
-                    self).__annotations__[upperKey]
-                return caseConstructor.deconstructCase(self._value, callback)
 
-        assert False, 'Execution should not reach here'
+_getKey = operator.attrgetter('_key')
 
-    if 'match' not in cls.__dict__:
-        cls.match = match
+
+# Slow path for `match` arguments which aren't exactly the lowercase case
+# names: raises for unrecognized or missing cases, and otherwise returns the
+# callbacks keyed by lowercase case name.
+def _validateMatch(self: Any, cases: _CaseKeys,
+                   kwargs: Dict[str, Callable[..., _MatchResult]]
+                   ) -> Dict[str, Callable[..., _MatchResult]]:
+    caseNames = cases.__members__.keys()
+    upperKeys = {k: k.upper() for k in kwargs.keys()}
+
+    for key in upperKeys.values():
+        if key not in caseNames:
+            raise ValueError(
+                _ErrorMessage(
+                    'Unrecognized case {} in pattern match against {} (expected one of {})',
+                    key, self, caseNames))
+
+    for key in caseNames:
+        if key not in upperKeys.values():
+            raise ValueError(
+                _ErrorMessage(
+                    'Incomplete pattern match against {} (missing {})', self,
+                    key))
+
+    return {upperKeys[k].lower(): callback for k, callback in kwargs.items()}
+
+
+# Whether the field type `t` (as given to Case[…]) refers to `cls` itself,
+# whether directly, by name as a forward reference, or as a generic alias.
+def _isSelfReference(cls: Any, t: Any) -> bool:
+    if t is cls or getattr(t, '__origin__', None) is cls:
+        return True
+
+    name = getattr(t, '__forward_arg__', t)
+    if isinstance(name, str):
+        name = name.split('[', 1)[0].strip()
+        return name in (cls.__name__, cls.__qualname__)
+
+    return False
+
+
+def _installFold(cls: Any, cases: _CaseKeys) -> None:
+    # For each case: its key, the handler name, the storage arity, and which
+    # fields hold nested values to fold first (for _IDENTITY, whether the
+    # value does).
+    plans: List[Tuple[_CaseKey, str, int, Tuple[int, ...]]] = []
+    for case, types in zip(cases.__members__.values(), cls._types):
+        arity = case.arity
+        if arity == _TUPLE:
+            recursive = tuple(i for i, t in enumerate(types)
+                              if _isSelfReference(cls, t))
+        elif arity == _IDENTITY and _isSelfReference(cls, types):
+            recursive = (0, )
+        else:
+            recursive = ()
+
+        plans.append((case, case.lowerName, arity, recursive))
+
+    expectedKeys = frozenset(name.lower() for name in cases.__members__)
+
+    # `_memoize` is prefixed like `_root`, so as not to clash with the callback
+    # of a MEMOIZE case.
+    def fold(cls: Any,
+             _root: Any,
+             _memoize: bool = False,
+             _plans: Tuple[Tuple[_CaseKey, str, int, Tuple[int, ...]],
+                           ...] = tuple(plans),
+             _expectedKeys: FrozenSet[str] = expectedKeys,
+             **kwargs: Callable[..., _MatchResult]) -> _MatchResult:
+        if kwargs.keys() != _expectedKeys:
+            kwargs = _validateMatch(_root, cases, kwargs)
+
+        steps = {
+            case: (kwargs[name], arity, recursive)
+            for case, name, arity, recursive in _plans
+        }
+        return _foldIteratively(_root, steps, {} if _memoize else None)
+
+    if 'fold' not in cls.__dict__:
+        cls.fold = classmethod(fold)
+
+
+# Applies the fold described by `steps` (the handler, arity and recursive
+# fields of each case) to the ADT value `root`, bottom-up, without recursing.
+#
+# `work` holds values to fold, and pending handler calls as tuples of
+# (value, handler, fields, recursive), which are made once the results for
+# the `recursive` fields are on top of `results`. Folded values are recorded
+# in `memo` by identity, if given.
+def _foldIteratively(
+        root: Any,
+        steps: Dict[_CaseKey,
+                    Tuple[Callable[..., _MatchResult], int, Tuple[int, ...]]],
+        memo: Optional[Dict[int, Any]]) -> _MatchResult:
+    results: List[Any] = []
+    work: List[Any] = [root]
+
+    while work:
+        item = work.pop()
+        if type(item) is tuple:
+            value, handler, fields, recursive = item
+            if fields is None:
+                result = handler(results.pop())
+            else:
+                args = list(fields)
+                for i in reversed(recursive):
+                    args[i] = results.pop()
+
+                result = handler(*args)
+        elif memo is not None and id(item) in memo:
+            results.append(memo[id(item)])
+            continue
+        else:
+            handler, arity, recursive = steps[item._key]
+            value = item
+            fields = item._value
+            if recursive:
+                # Fields are pushed in reverse so they are folded in order.
+                if arity == _TUPLE:
+                    work.append((value, handler, fields, recursive))
+                    for i in reversed(recursive):
+                        work.append(fields[i])
+                else:
+                    work.append((value, handler, None, recursive))
+                    work.append(fields)
+
+                continue
+            elif arity == _TUPLE:
+                result = handler(*fields)
+            elif arity == _IDENTITY:
+                result = handler(fields)
+            else:
+                result = handler()
+
+        if memo is not None:
+            memo[id(value)] = result
+
+        results.append(result)
+
+    folded: _MatchResult = results.pop()
+    return folded
+
+
+# Returns the ADT class of `cls`, which may be the class of one of its cases.
+def _adtClassOf(cls: Any) -> Any:
+    return getattr(cls, '_adtClass', cls)
+
+
+def _installCodec(cls: Any) -> None:
+    # The codec is looked up on each call, as it can't be created until the
+    # classes named by forward references have been defined. It's the codec of
+    # the class the method is called on (or of the value's class), rather
+    # than of `cls`, so that subclasses use their own.
+    def to_bytes(self: Any) -> bytes:
+        return binary.codecFor(type(self)._adtClass).encode(self)
+
+    def from_bytes(cls: Any, data: bytes) -> Any:
+        return binary.codecFor(_adtClassOf(cls)).decode(data)
+
+    def dump_iter(cls: Any, values: Iterable[Any], file: IO[bytes]) -> None:
+        binary.codecFor(_adtClassOf(cls)).dump_iter(values, file)
+
+    def load_iter(cls: Any, file: IO[bytes]) -> Iterator[Any]:
+        return binary.codecFor(_adtClassOf(cls)).load_iter(file)
+
+    def decode_stream(cls: Any,
+                      reader: 'asyncio.StreamReader',
+                      *,
+                      chunk_size: int = 16384,
+                      max_size: int = 64 * 1024 * 1024) -> AsyncIterator[Any]:
+        return binary.codecFor(_adtClassOf(cls)).decode_stream(
+            reader, chunk_size, max_size)
+
+    def to_json(self: Any) -> str:
+        return jsoncodec.codecFor(type(self)._adtClass).encode(self)
+
+    def to_json_chunks(self: Any, *, chunk_size: int = 65536) -> Iterator[str]:
+        return jsoncodec.codecFor(type(self)._adtClass).encodeChunks(
+            self, chunk_size)
+
+    def from_json(cls: Any, text: str) -> Any:
+        return jsoncodec.codecFor(_adtClassOf(cls)).decode(text)
+
+    methods = {
+        'to_bytes': to_bytes,
+        'from_bytes': classmethod(from_bytes),
+        'dump_iter': classmethod(dump_iter),
+        'load_iter': classmethod(load_iter),
+        'decode_stream': classmethod(decode_stream),
+        'to_json': to_json,
+        'to_json_chunks': to_json_chunks,
+        'from_json': classmethod(from_json),
+    }
+    for name, method in methods.items():
+        if name not in cls.__dict__:
+            setattr(cls, name, method)
+
+
+# Each case is pickled by its index (one less than the `value` of its key),
+# rather than by its `_Key` member (which can't be pickled by reference), so
+# cases should only ever be added after existing ones for pickles to remain
+# compatible.
+def _installReduce(cls: Any, cases: _CaseKeys) -> None:
+    # Also installed as __reduce_ex__, which pickle calls first, to save
+    # object.__reduce_ex__ from looking up __reduce__ for every value.
+    def _reduce(self: Any, protocol: Optional[int] = None) -> Any:
+        key = self._key
+        tag = key.value - 1
+        arity = key.arity
+        value = self._value
+
+        # Nested ADT values are flattened into one reduction, instead of
+        # leaving pickle to recurse into each of them in turn.
+        if arity == _TUPLE:
+            for field in value:
+                if isinstance(type(field), _CaseType):
+                    return (_restoreTree, _flattenTree(self))
+
+            return (_restore, (self._adtClass, tag) + value)
+        elif arity == _IDENTITY:
+            if isinstance(type(value), _CaseType):
+                return (_restoreTree, _flattenTree(self))
+
+            return (_restore, (self._adtClass, tag, value))
+        else:
+            return (_restore, (self._adtClass, tag))
+
+    if '__reduce__' not in cls.__dict__ and '__reduce_ex__' not in cls.__dict__:
+        cls.__reduce__ = _reduce
+        cls.__reduce_ex__ = _reduce
+
+
+# The class of each case (by index) of an ADT class or one of its descendants,
+# for values to be unpickled with.
+def _installCaseClasses(cls: Any) -> None:
+    cls._caseClasses = tuple(
+        getattr(cls, name) for name in cls._Key.__members__)
+
+
+# Unpickles a value from its class, case index, and associated data.
+#
+# This is referred to by name in pickles, so must not be renamed.
+def _restore(cls: Any, tag: int, *fields: Any) -> Any:
+    return cls._caseClasses[tag](*fields)
+
+
+# Describes `root` and all the ADT values nested directly within it, as a
+# table of their shapes, and a flat program to rebuild them bottom up.
+#
+# Each shape is a (class, case index, mask) triple, where the mask has a bit
+# set for each field which holds a nested ADT value. The program contains,
+# for each value in post-order, the index of its shape followed by its other
+# fields; or, for a value which appeared earlier (as when values are shared),
+# the bitwise inverse of its position in that order.
+def _flattenTree(root: Any
+                 ) -> Tuple[List[Tuple[Type[Any], int, int]], List[Any]]:
+    shapes: List[Tuple[Type[Any], int, int]] = []
+    shapeIndices: Dict[Tuple[Type[Any], int, int], int] = {}
+    program: List[Any] = []
+    positions: Dict[int, int] = {}
+
+    # Values waiting to be described, or (value, shape index, other fields)
+    # tuples for those whose nested values have been described already.
+    work: List[Any] = [root]
+    while work:
+        item = work.pop()
+        if type(item) is tuple:
+            value, shapeIndex, others = item
+            positions[id(value)] = len(positions)
+            program.append(shapeIndex)
+            program.extend(others)
+            continue
+
+        position = positions.get(id(item))
+        if position is not None:
+            program.append(~position)
+            continue
+
+        cls = item._adtClass
+        key = item._key
+        tag = key.value - 1
+        arity = key.arity
+        if arity == _TUPLE:
+            fields = item._value
+        elif arity == _IDENTITY:
+            fields = (item._value, )
+        else:
+            fields = ()
+
+        mask = 0
+        nested = []
+        others = []
+        for i, field in enumerate(fields):
+            if isinstance(type(field), _CaseType):
+                mask |= 1 << i
+                nested.append(field)
+            else:
+                others.append(field)
+
+        shape = (cls, tag, mask)
+        shapeIndex = shapeIndices.get(shape)
+        if shapeIndex is None:
+            shapeIndex = shapeIndices[shape] = len(shapes)
+            shapes.append(shape)
+
+        work.append((item, shapeIndex, others))
+        work.extend(reversed(nested))
+
+    return (shapes, program)
+
+
+# Unpickles the values described by _flattenTree, returning the root.
+#
+# This is referred to by name in pickles, so must not be renamed.
+def _restoreTree(shapes: List[Tuple[Type[Any], int, int]],
+                 program: List[Any]) -> Any:
+    # For each shape: its constructor, how many of its fields are in the
+    # program and how many are nested, and (only when both kinds are present)
+    # which are which.
+    plans = []
+    for cls, tag, mask in shapes:
+        types = cls._types[tag]
+        fieldCount = len(types) if isinstance(types, tuple) else int(
+            types is not None)
+        nested = tuple(bool(mask & (1 << i)) for i in range(fieldCount))
+        nestedCount = sum(nested)
+        plans.append(
+            (cls._caseClasses[tag], fieldCount - nestedCount, nestedCount,
+             nested if 0 < nestedCount < fieldCount else None))
+
+    built: List[Any] = []
+    stack: List[Any] = []
+    i = 0
+    end = len(program)
+    while i < end:
+        code = program[i]
+        i += 1
+        if code < 0:
+            stack.append(built[~code])
+            continue
+
+        constructor, otherCount, nestedCount, nested = plans[code]
+        if nestedCount == 0:
+            value = constructor(*program[i:i + otherCount])
+        elif otherCount == 0:
+            value = constructor(*stack[-nestedCount:])
+            del stack[-nestedCount:]
+        else:
+            nestedFields = iter(stack[-nestedCount:])
+            del stack[-nestedCount:]
+            otherFields = iter(program[i:i + otherCount])
+            value = constructor(*[
+                next(nestedFields) if isNested else next(otherFields)
+                for isNested in nested
+            ])
+
+        i += otherCount
+        built.append(value)
+        stack.append(value)
+
+    return stack[0]
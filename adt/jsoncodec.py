@@ -0,0 +1,520 @@
+# mypy: no-warn-unused-ignores
+import _thread
+import json
+import re
+import sys
+from json.decoder import scanstring  # type: ignore
+from json.encoder import encode_basestring_ascii  # type: ignore
+from typing import (Any, Callable, Dict, Iterator, List, Match, Optional,
+                    Tuple, Type, Union, cast)
+
+# How a case's associated data is stored in `_value`, as in adt.decorator.
+_NULLARY = 0
+_IDENTITY = 1
+_TUPLE = 2
+
+# Field specs, describing how to convert decoded JSON into the type of a
+# field. A spec of None means the decoded JSON is used as-is.
+_ADT = 0
+_LIST = 1
+_TUPLE_OF = 2
+_FIXED_TUPLE = 3
+_DICT = 4
+_OPTIONAL = 5
+
+_Spec = Optional[Tuple[Any, ...]]
+
+# A case's constructor, field count, and the spec of each field (or None, if
+# none need converting).
+_Case = Tuple[Callable[..., Any], int, Optional[Tuple[_Spec, ...]]]
+
+
+class Codec:
+    """Encodes and decodes values of an ADT class as JSON.
+
+    Each value is encoded as an object like `{"tag": "CASE", "values": […]}`,
+    holding the name of its case and its associated data, which can include
+    anything `json` can encode, as well as other ADT values. When decoding,
+    the field types given to `Case[…]` determine which JSON objects and
+    arrays become ADT values, and tuples; everything else is left as decoded.
+    Values are processed without recursion, so they can be nested
+    arbitrarily deeply.
+    """
+
+    def __init__(self, cls: Type[Any]):
+        self._cls = cls
+
+        # For encoding: the arity of each case, and the JSON which begins
+        # its values (up to the start of their associated data).
+        self._headers: Dict[Any, Tuple[int, str]] = {}
+
+        # For decoding: each case, by name.
+        self._cases: Dict[str, _Case] = {}
+
+        for key, types in zip(cls._Key.__members__.values(), cls._types):
+            if types is None:
+                arity = _NULLARY
+                types = ()
+            elif isinstance(types, tuple):
+                arity = _TUPLE
+            else:
+                arity = _IDENTITY
+                types = (types, )
+
+            header = f'{{"tag": {encode_basestring_ascii(key.name)}, "values": ['
+            self._headers[key] = (arity, header)
+            specs = tuple(_spec(cls, t) for t in types)
+            self._cases[key.name] = (getattr(cls, key.name), len(types),
+                                     specs if any(specs) else None)
+
+    def encode(self, value: Any) -> str:
+        self._checked(value)
+        return ''.join(_encodeChunks(value, sys.maxsize))
+
+    def encodeChunks(self, value: Any, chunkSize: int) -> Iterator[str]:
+        """Encodes `value` incrementally, yielding strings of at least
+        `chunkSize` characters (except for the last), which join to form the
+        same result as `encode`."""
+        self._checked(value)
+        return _encodeChunks(value, chunkSize)
+
+    def decode(self, text: str) -> Any:
+        try:
+            decoded = json.loads(text)
+        except RecursionError:
+            decoded = _parseIteratively(text)
+
+        return _convert(decoded, (_ADT, self._cls))
+
+    def _checked(self, value: Any) -> None:
+        if not isinstance(value, self._cls):
+            raise TypeError(f'{value!r} is not an instance of {self._cls}')
+
+
+# Held while creating a codec (see codecFor).
+_creatingCodec = _thread.allocate_lock()
+
+
+def codecFor(cls: Type[Any]) -> Codec:
+    """Returns the JSON codec for the ADT class `cls`, creating it on first
+    use (after the classes named by its forward references are defined)."""
+    # Stored on the class, like the binary codec, to be garbage collected
+    # along with it.
+    codec: Optional[Codec] = cls.__dict__.get('_jsonCodec')
+    if codec is None:
+        with _creatingCodec:
+            codec = cls.__dict__.get('_jsonCodec')
+            if codec is None:
+                codec = Codec(cls)
+                setattr(cls, '_jsonCodec', codec)
+
+    return codec
+
+
+def _isADT(cls: Any) -> bool:
+    return isinstance(cls, type) and hasattr(cls, '_Key') and hasattr(
+        cls, '_types')
+
+
+# Returns the spec of a field of type `t`, as given to Case[…] on `cls`.
+# Forward references are resolved in the module defining `cls`, ignoring any
+# type arguments (as in "Tree[T]"), as are generic aliases of ADTs. References
+# to an ADT that `cls` derives from are to `cls` itself, whose cases are that
+# ADT's.
+def _spec(cls: Type[Any], t: Any) -> _Spec:
+    name = getattr(t, '__forward_arg__', t)
+    if isinstance(name, str):
+        name = name.split('[', 1)[0].strip()
+        if name in (cls.__name__, cls.__qualname__):
+            t = cls
+        else:
+            t = getattr(sys.modules.get(cls.__module__), name, None)
+
+    if _isADT(getattr(t, '__origin__', None)):
+        t = t.__origin__
+
+    if _isADT(t):
+        return (_ADT, cls if issubclass(cls, t) else t)
+
+    origin = getattr(t, '__origin__', None)
+    args: Tuple[Any, ...] = getattr(t, '__args__', None) or ()
+    if origin is list and len(args) == 1:
+        inner = _spec(cls, args[0])
+        return None if inner is None else (_LIST, inner)
+    elif origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return (_TUPLE_OF, _spec(cls, args[0]))
+    elif origin is tuple and args and args != ((), ):
+        return (_FIXED_TUPLE, tuple(_spec(cls, arg) for arg in args))
+    elif origin is dict and len(args) == 2:
+        inner = _spec(cls, args[1])
+        return None if inner is None else (_DICT, inner)
+    elif origin is Union and len(args) == 2 and type(None) in args:
+        inner = _spec(cls, args[0] if args[1] is type(None) else args[1])
+        return None if inner is None else (_OPTIONAL, inner)
+    else:
+        return None
+
+
+# Returns the headers of the ADT values of type `cls`, from their codec.
+def _headersFor(cls: Type[Any]) -> Dict[Any, Tuple[int, str]]:
+    if not _isADT(cls):
+        raise TypeError(
+            f'Object of type {cls.__name__} is not JSON serializable')
+
+    # Values are instances of the classes of their cases, which share the
+    # codec of the ADT class.
+    return codecFor(cls._adtClass)._headers
+
+
+# Pieces of JSON are joined together once this many have been produced, to
+# check whether they make up a whole chunk.
+_PIECES_PER_JOIN = 256
+
+
+def _encodeChunks(root: Any, chunkSize: int) -> Iterator[str]:
+    """Yields `root` encoded as JSON in chunks of at least `chunkSize`
+    characters (except for the last), without recursion.
+
+    Everything besides ADT values is encoded exactly as `json.dumps` would
+    encode it by default, which is faster than passing ADT values to
+    `json.dumps` through its `default` hook.
+    """
+    # The headers of each type of ADT value encountered so far, which are
+    # consulted for every value, so are kept in a plain dict.
+    headersByClass: Dict[Type[Any], Dict[Any, Tuple[int, str]]] = {}
+    pieces: List[str] = []
+    joined: List[str] = []
+    joinedSize = 0
+
+    # Pieces of JSON which are ready to be output, and values which still
+    # need to be encoded. Strings are always encoded before they're pushed,
+    # so those can be told apart by type.
+    work: List[Any] = [_encodeIfString(root)]
+    while work:
+        if len(pieces) >= _PIECES_PER_JOIN:
+            joined.append(''.join(pieces))
+            joinedSize += len(joined[-1])
+            pieces = []
+            if joinedSize >= chunkSize:
+                yield ''.join(joined)
+                joined = []
+                joinedSize = 0
+
+        value = work.pop()
+        valueType = type(value)
+        if valueType is str:
+            pieces.append(value)
+            continue
+
+        headers = headersByClass.get(valueType)
+        if headers is not None:
+            arity, header = headers[value._key]
+            pieces.append(header)
+            if arity == _TUPLE:
+                work.append(']}')
+                fields = value._value
+                for i in range(len(fields) - 1, 0, -1):
+                    work.append(_encodeIfString(fields[i]))
+                    work.append(', ')
+
+                work.append(_encodeIfString(fields[0]))
+            elif arity == _IDENTITY:
+                work.append(']}')
+                work.append(_encodeIfString(value._value))
+            else:
+                pieces.append(']}')
+        elif value is None:
+            pieces.append('null')
+        elif value is True:
+            pieces.append('true')
+        elif value is False:
+            pieces.append('false')
+        elif isinstance(value, int):
+            pieces.append(int.__repr__(value))
+        elif isinstance(value, float):
+            pieces.append(_encodeFloat(value))
+        elif isinstance(value, (list, tuple)):
+            if not value:
+                pieces.append('[]')
+                continue
+
+            pieces.append('[')
+            work.append(']')
+            for i in range(len(value) - 1, 0, -1):
+                work.append(_encodeIfString(value[i]))
+                work.append(', ')
+
+            work.append(_encodeIfString(value[0]))
+        elif isinstance(value, dict):
+            if not value:
+                pieces.append('{}')
+                continue
+
+            pieces.append('{')
+            work.append('}')
+            items = list(value.items())
+            for i in range(len(items) - 1, -1, -1):
+                key, item = items[i]
+                work.append(_encodeIfString(item))
+                work.append(_encodeKey(key) + ': ')
+                if i:
+                    work.append(', ')
+        else:
+            # Any other ADT class is looked up (or rejected) and then
+            # encoded as above.
+            headersByClass[valueType] = _headersFor(valueType)
+            work.append(value)
+
+    joined.append(''.join(pieces))
+    yield ''.join(joined)
+
+
+def _encodeIfString(value: Any) -> Any:
+    return encode_basestring_ascii(value) if isinstance(value, str) else value
+
+
+def _encodeFloat(value: float) -> str:
+    if value != value:
+        return 'NaN'
+    elif value == float('inf'):
+        return 'Infinity'
+    elif value == -float('inf'):
+        return '-Infinity'
+    else:
+        return float.__repr__(value)
+
+
+# Dict keys are converted to strings the same way as `json.dumps` does.
+def _encodeKey(key: Any) -> str:
+    if isinstance(key, str):
+        encoded: str = encode_basestring_ascii(key)
+        return encoded
+    elif key is None or key is True or key is False:
+        return f'"{json.dumps(key)}"'
+    elif isinstance(key, int):
+        return f'"{int.__repr__(key)}"'
+    elif isinstance(key, float):
+        return f'"{_encodeFloat(key)}"'
+    else:
+        raise TypeError(
+            f'keys must be str, int, float, bool or None, not {type(key).__name__}'
+        )
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _skip(text: str, i: int) -> int:
+    # This always matches, as the pattern can be empty.
+    return cast(Match[str], _WHITESPACE.match(text, i)).end()
+
+
+_NUMBER = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+_CONSTANTS = (
+    ('null', None),
+    ('true', True),
+    ('false', False),
+    ('NaN', float('nan')),
+    ('Infinity', float('inf')),
+    ('-Infinity', -float('inf')),
+)
+
+
+def _parseIteratively(text: str) -> Any:
+    """Parses `text` like `json.loads` does, but without recursion."""
+    # The arrays and objects being parsed, and (for objects) the key of the
+    # value being parsed within each.
+    containers: List[Any] = []
+    keys: List[Any] = []
+
+    i = _skip(text, 0)
+    try:
+        while True:
+            char = text[i]
+            value: Any
+            if char == '{' or char == '[':
+                i = _skip(text, i + 1)
+                if text[i] == ('}' if char == '{' else ']'):
+                    value = {} if char == '{' else []
+                    i += 1
+                elif char == '{':
+                    key, i = _parseKey(text, i)
+                    containers.append({})
+                    keys.append(key)
+                    continue
+                else:
+                    containers.append([])
+                    keys.append(None)
+                    continue
+            elif char == '"':
+                value, i = scanstring(text, i + 1)
+            else:
+                for literal, constant in _CONSTANTS:
+                    if text.startswith(literal, i):
+                        value = constant
+                        i += len(literal)
+                        break
+                else:
+                    match = _NUMBER.match(text, i)
+                    if match is None:
+                        raise ValueError(f'Expecting value at character {i}')
+
+                    integer, fraction, exponent = match.groups()
+                    value = (float(integer + (fraction or '') +
+                                   (exponent or ''))
+                             if fraction or exponent else int(integer))
+                    i = match.end()
+
+            # Add the value to its container, and then any containers which
+            # are now complete to their own containers, in turn.
+            while True:
+                i = _skip(text, i)
+                if not containers:
+                    if i != len(text):
+                        raise ValueError(f'Extra data at character {i}')
+
+                    return value
+
+                container = containers[-1]
+                if type(container) is list:
+                    container.append(value)
+                else:
+                    container[keys[-1]] = value
+
+                char = text[i]
+                if char == ',':
+                    i = _skip(text, i + 1)
+                    if type(container) is dict:
+                        keys[-1], i = _parseKey(text, i)
+
+                    break
+                elif char != (']' if type(container) is list else '}'):
+                    raise ValueError(
+                        f"Expecting ',' delimiter at character {i}")
+
+                value = containers.pop()
+                keys.pop()
+                i += 1
+    except IndexError:
+        raise ValueError('Unexpected end of JSON') from None
+
+
+# Parses an object key and its following colon, returning the key and the
+# index of the value after it.
+def _parseKey(text: str, i: int) -> Tuple[str, int]:
+    if text[i] != '"':
+        raise ValueError(
+            f'Expecting property name enclosed in double quotes at character {i}'
+        )
+
+    key, i = scanstring(text, i + 1)
+    i = _skip(text, i)
+    if text[i] != ':':
+        raise ValueError(f"Expecting ':' delimiter at character {i}")
+
+    return (key, _skip(text, i + 1))
+
+
+_VISIT = 0
+_BUILD = 1
+_CONSTRUCT = 2
+
+
+def _identity(items: List[Any]) -> List[Any]:
+    return items
+
+
+def _convert(root: Any, rootSpec: Tuple[Any, ...]) -> Any:
+    """Converts decoded JSON to match `rootSpec`, without recursion."""
+    # The cases of each ADT class encountered so far, by name.
+    casesByClass: Dict[Type[Any], Dict[str, _Case]] = {}
+
+    # Values converted so far, some of which are waiting to be combined into
+    # the values they belong to. Those are described by _BUILD entries on the
+    # work stack, alongside _VISIT entries for JSON yet to be converted.
+    #
+    # _BUILD entries hold a function building the result from a list of
+    # converted values, and _CONSTRUCT entries a case constructor, which
+    # takes them as arguments; both followed by how many there are.
+    results: List[Any] = []
+    work: List[Tuple[int, Any, Any]] = [(_VISIT, root, rootSpec)]
+    while work:
+        op, value, spec = work.pop()
+        if op != _VISIT:
+            if spec:
+                items = results[-spec:]
+                del results[-spec:]
+            else:
+                items = []
+
+            results.append(value(*items) if op == _CONSTRUCT else value(items))
+            continue
+
+        if spec is None:
+            results.append(value)
+            continue
+
+        kind = spec[0]
+        if kind == _ADT:
+            cls = spec[1]
+            cases = casesByClass.get(cls)
+            if cases is None:
+                cases = casesByClass[cls] = codecFor(cls)._cases
+
+            try:
+                tag = value['tag']
+                fields = value['values']
+                constructor, fieldCount, specs = cases[tag]
+            except (TypeError, KeyError):
+                raise ValueError(
+                    f'Expected a {cls.__name__} value, got {type(value).__name__}'
+                ) from None
+
+            if type(fields) is not list or len(fields) != fieldCount:
+                raise ValueError(
+                    f'Expected {fieldCount} values for {cls.__name__}.{tag}')
+
+            if specs is None:
+                results.append(constructor(*fields))
+                continue
+
+            work.append((_CONSTRUCT, constructor, fieldCount))
+            specsAndFields = zip(specs, fields)
+        elif kind == _OPTIONAL:
+            if value is None:
+                results.append(None)
+            else:
+                work.append((_VISIT, value, spec[1]))
+
+            continue
+        elif kind == _DICT:
+            if type(value) is not dict:
+                raise ValueError(
+                    f'Expected an object, got {type(value).__name__}')
+
+            keys = list(value)
+            work.append(
+                (_BUILD, lambda items, keys=keys: dict(zip(keys, items)),
+                 len(keys)))
+            specsAndFields = ((spec[1], value[key]) for key in keys)
+        else:
+            if type(value) is not list:
+                raise ValueError(
+                    f'Expected an array, got {type(value).__name__}')
+
+            if kind == _FIXED_TUPLE:
+                if len(value) != len(spec[1]):
+                    raise ValueError(
+                        f'Expected {len(spec[1])} values, got {len(value)}')
+
+                specsAndFields = zip(spec[1], value)
+            else:
+                specsAndFields = ((spec[1], item) for item in value)
+
+            work.append(
+                (_BUILD, _identity if kind == _LIST else tuple, len(value)))
+
+        work.extend([(_VISIT, field, fieldSpec)
+                     for fieldSpec, field in specsAndFields][::-1])
+
+    return results[0]
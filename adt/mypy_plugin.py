@@ -1,13 +1,16 @@
 # mypy: no-warn-redundant-casts
+import hashlib
 import itertools
 from decimal import Decimal
-from typing import Optional, Callable, List, Type, Any, Iterable, Union
+from typing import Optional, Callable, Dict, List, Tuple, Type, Any, Iterable, Union
 import typing
 
 import mypy.types
 import mypy.typevars
 from mypy.nodes import (
     ARG_NAMED,
+    ARG_NAMED_OPT,
+    ARG_OPT,
     ARG_POS,
     MDEF,
     Argument,
@@ -20,10 +23,11 @@ from mypy.nodes import (
     PlaceholderNode,
     SymbolTableNode,
     SymbolNode,
+    TypeInfo,
     TypeVarExpr,
     Var,
 )
-from mypy.plugin import AnalyzeTypeContext, TypeAnalyzerPluginInterface, ClassDefContext, Plugin
+from mypy.plugin import AnalyzeTypeContext, TypeAnalyzerPluginInterface, ClassDefContext, Plugin, ReportConfigContext
 from mypy.semanal import set_callable_name
 from mypy.typevars import fill_typevars
 from mypy.util import get_unique_redefinition_name
@@ -52,6 +56,15 @@ def get_name(x: Union[FuncBase, SymbolNode]) -> str:
     return fn
 
 
+def _plugin_version() -> str:
+    """Identify this version of the plugin, by hashing its source."""
+    with open(__file__, 'rb') as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+
+_PLUGIN_VERSION = _plugin_version()
+
+
 class ADTPlugin(Plugin):
     # Fully-qualified name for @adt
     _ADT_DECORATOR = 'adt.decorator.adt'
@@ -71,6 +84,11 @@ class ADTPlugin(Plugin):
 
         return _transform_class
 
+    def report_config_data(self, ctx: ReportConfigContext) -> str:
+        # Changes to the plugin change the symbols it generates, so must
+        # invalidate any cached analysis of modules which define ADTs.
+        return _PLUGIN_VERSION
+
 
 def _convert_case_type(type_context: AnalyzeTypeContext) -> mypy.types.Type:
     """Convert Case[..] type to CaseConstructor[..]"""
@@ -81,12 +99,29 @@ def _convert_case_type(type_context: AnalyzeTypeContext) -> mypy.types.Type:
     api: TypeAnalyzerPluginInterface = type_context.api
     type_to_convert: mypy.types.UnboundType = type_context.type
 
-    call_args = type_to_convert.args
+    call_args = list(type_to_convert.args)
     function_type = type_context.api.named_type("builtins.function", [])
 
+    # Named fields are given as ("name", type) pairs, and their names are
+    # recorded as those of the arguments.
+    arg_names: List[Optional[str]] = [None for _ in call_args]
+    names = _field_names(call_args)
+    if names is not None:
+        if None in names:
+            api.fail(
+                'Either all fields of a case should be named, or none of them',
+                type_context.context)
+        else:
+            arg_names = list(names)
+
+        call_args = [
+            typing.cast(mypy.types.TupleType, arg).items[1]
+            if name is not None else arg
+            for name, arg in zip(names, call_args)
+        ]
+
     arg_types = list(map(api.analyze_type, call_args))
     arg_kinds = [mypy.types.ARG_POS for _ in call_args]
-    arg_names = [None for _ in call_args]
 
     return_type = api.named_type("adt.CaseConstructor", arg_types)
 
@@ -99,16 +134,41 @@ def _convert_case_type(type_context: AnalyzeTypeContext) -> mypy.types.Type:
     )
 
 
+# The name of each field given to Case[…] as a ("name", type) pair, or None
+# for each field given only as a type, or None if no fields are named at all.
+def _field_names(args: List[mypy.types.Type]) -> Optional[List[Optional[str]]]:
+    names: List[Optional[str]] = []
+    for arg in args:
+        if (isinstance(arg, mypy.types.TupleType) and len(arg.items) == 2
+                and isinstance(arg.items[0], mypy.types.UnboundType)
+                and arg.items[0].original_str_expr is not None):
+            names.append(arg.items[0].original_str_expr)
+        else:
+            names.append(None)
+
+    if all(name is None for name in names):
+        return None
+
+    return names
+
+
 class _CaseDef:
     context: ClassDefContext
     name: str
     types: List[mypy.types.Type]
+    field_names: Optional[List[str]]
 
-    def __init__(self, context: ClassDefContext, name: str,
-                 types: List[mypy.types.Type]):
+    def __init__(self,
+                 context: ClassDefContext,
+                 name: str,
+                 types: List[mypy.types.Type],
+                 field_names: Optional[List[str]] = None):
         self.context = context
         self.name = name
-        self.types = self._normalize_types(types)
+
+        # Named fields are never exploded from (or into) tuples.
+        self.types = types if field_names else self._normalize_types(types)
+        self.field_names = field_names
         super().__init__()
 
     @staticmethod
@@ -129,11 +189,12 @@ class _CaseDef:
             return types
 
     def constructor_args(self) -> List[Argument]:
+        names = self.field_names or [f'_{i}' for i in range(len(self.types))]
         return [
-            Argument(variable=Var(f'_{i}', t),
+            Argument(variable=Var(name, t),
                      type_annotation=t,
                      initializer=None,
-                     kind=ARG_POS) for i, t in enumerate(self.types)
+                     kind=ARG_POS) for name, t in zip(names, self.types)
         ]
 
     def accessor_return(self) -> mypy.types.Type:
@@ -155,6 +216,20 @@ class _CaseDef:
             self.types, argKinds, argNames, return_type,
             self.context.api.named_type('__builtins__.function'))
 
+    def fold_lambda(self, self_type: mypy.types.Instance,
+                    return_type: mypy.types.Type) -> mypy.types.CallableType:
+        # Fields of the ADT's own type have already been folded into results.
+        types = [
+            return_type if isinstance(t, mypy.types.Instance)
+            and t.type == self_type.type else t for t in self.types
+        ]
+        argKinds = list(itertools.repeat(ARG_POS, len(types)))
+        argNames = list(itertools.repeat(None, len(types)))
+
+        return mypy.types.CallableType(
+            types, argKinds, argNames, return_type,
+            self.context.api.named_type('__builtins__.function'))
+
     def __hash__(self) -> int:
         return hash(self.name)
 
@@ -162,7 +237,8 @@ class _CaseDef:
         if not isinstance(other, _CaseDef):
             return False
 
-        return self.name == other.name and self.types == other.types
+        return (self.name == other.name and self.types == other.types
+                and self.field_names == other.field_names)
 
     def __repr__(self) -> str:
         return f'_CaseDef(name={self.name}, types={self.types!r})'
@@ -178,8 +254,8 @@ def _transform_class(context: ClassDefContext) -> None:
     instanceType = fill_typevars(cls.info)
     assert isinstance(instanceType, mypy.types.Instance)
 
-    cases = _get_and_delete_cases(context)
-    if cases is None:  # Cases were not successfully deleted. We need to defer
+    cases = _get_cases(context)
+    if cases is None:  # Cases were not ready yet. We need to defer
         context.api.defer()
         return
 
@@ -188,17 +264,28 @@ def _transform_class(context: ClassDefContext) -> None:
         _add_accessor_for_case(context, case)
 
     _add_match(context, cases)
+    _add_matcher(context, cases, selfType=instanceType)
+    _add_match_many(context, cases, selfType=instanceType)
+    _add_fold(context, cases, selfType=instanceType)
+    _add_codec(context, cases, selfType=instanceType)
+
+    # Added last, to find any of the methods above that a field would hide.
+    _add_fields(context, cases)
 
 
 # Returns ADT cases which were listed as class variables (similar to
-# cls.__annotations__ at runtime), and removes those variables from
-# typechecking, as they will be replaced by constructor methods.
-def _get_and_delete_cases(context: ClassDefContext
-                          ) -> Optional[List[_CaseDef]]:
-    """Search the class body for adt's Case constructions and delete them
+# cls.__annotations__ at runtime).
+def _get_cases(context: ClassDefContext) -> Optional[List[_CaseDef]]:
+    """Search the class body for adt's Case constructions
 
     For a given context, search the class body for assignments of the form
-    `CASENAME: Case[...]`. Delete them, and return a _CaseDef for each.
+    `CASENAME: Case[...]`, and return a _CaseDef for each.
+
+    The assignments are left in place, rather than deleted, so that the class
+    can be analyzed again with the same result: as happens when the module is
+    deferred, and when mypy's fine-grained mode (used by dmypy) strips and
+    reprocesses the class after one of its dependencies changes. Their
+    variables are replaced in the symbol table by the generated methods.
 
     In case the body is not ready (because the semantic analyzer included a
     PlaceHolder expression), this function will return None and is expected
@@ -209,8 +296,7 @@ def _get_and_delete_cases(context: ClassDefContext
     cls = context.cls
 
     caseDefs: List[_CaseDef] = []
-    removed: List[int] = []
-    for i, statement in enumerate(cls.defs.body):
+    for statement in cls.defs.body:
         # Any assignment that doesn't use the new type declaration
         # syntax can be ignored out of hand.
         if not (isinstance(statement, AssignmentStmt)
@@ -223,36 +309,40 @@ def _get_and_delete_cases(context: ClassDefContext
         if not isinstance(lval, NameExpr):
             continue
 
-        sym = cls.info.names.get(lval.name)
-        if sym is None:
-            # This name is likely blocked by a star import. We don't need to defer because
-            # defer() is already called by mark_incomplete().
-            continue
-
-        var = sym.node
-        if isinstance(var, PlaceholderNode):
-            # This node is not ready yet.
+        # The variable is found through the assignment, rather than the
+        # symbol table, as a previous analysis of the class will have
+        # replaced it there.
+        var = lval.node
+        if var is None or isinstance(var, PlaceholderNode):
+            # This node is not ready yet. If its name was blocked by a star
+            # import, we don't need to defer because defer() is already
+            # called by mark_incomplete().
             return None
 
         assert isinstance(var, Var)
+        if var.type is None:
+            # The case's types are not ready yet.
+            return None
+
         assert isinstance(var.type, mypy.types.CallableType)
         assert isinstance(var.type.ret_type, mypy.types.Instance)
         assert get_fullname(
             var.type.ret_type.type) == "adt.case.CaseConstructor"
 
+        names = var.type.arg_names
         caseDefs.append(
             _CaseDef(context=context,
                      name=get_name(var),
-                     types=list(var.type.ret_type.args)))
-        removed.append(i)
-
-    for i in reversed(removed):
-        del cls.defs.body[i]
+                     types=list(var.type.ret_type.args),
+                     field_names=typing.cast(List[str], names)
+                     if names and None not in names else None))
 
     return caseDefs
 
 
-# Class constructor method per case (uppercase)
+# Class constructor method per case (uppercase). At runtime, each case is a
+# class deriving from the ADT, but it's only declared as a constructor here,
+# so mypy doesn't accept it as a class (as in isinstance()).
 def _add_constructor_for_case(context: ClassDefContext, case: _CaseDef,
                               selfType: mypy.types.Instance) -> None:
     _add_method(context,
@@ -262,13 +352,61 @@ def _add_constructor_for_case(context: ClassDefContext, case: _CaseDef,
                 is_classmethod=True)
 
 
-# Accessor method per case (lowercase)
+# Accessor method per case (lowercase), with a predicate and a getter that
+# never raise
 def _add_accessor_for_case(context: ClassDefContext, case: _CaseDef) -> None:
     _add_method(context,
                 name=case.name.lower(),
                 args=[],
                 return_type=case.accessor_return())
 
+    _add_method(context,
+                name=f'is_{case.name.lower()}',
+                args=[],
+                return_type=context.api.named_type('__builtins__.bool'))
+
+    optional_return = case.accessor_return()
+    if case.types:
+        optional_return = mypy.types.UnionType.make_union(
+            [optional_return, mypy.types.NoneType()])
+
+    _add_method(context,
+                name=f'get_{case.name.lower()}',
+                args=[
+                    Argument(variable=Var('default', optional_return),
+                             type_annotation=optional_return,
+                             initializer=None,
+                             kind=ARG_OPT)
+                ],
+                return_type=optional_return)
+
+
+# Attribute per named field (of any case). Like the accessors, these are
+# declared upon the ADT class, but only exist on values of the right case. A
+# field shared by several cases has the union of their types.
+def _add_fields(context: ClassDefContext, cases: Iterable[_CaseDef]) -> None:
+    info = context.cls.info
+    fields: Dict[str, List[mypy.types.Type]] = {}
+    for case in cases:
+        for name, t in zip(case.field_names or [], case.types):
+            field_types = fields.setdefault(name, [])
+            if t not in field_types:
+                field_types.append(t)
+
+    for name, field_types in fields.items():
+        sym = info.names.get(name)
+        if sym is not None and not (sym.plugin_generated
+                                    and isinstance(sym.node, Var)):
+            context.api.fail(
+                f'Field {name} would hide the attribute {name} of "{info.name}"',
+                context.cls)
+            continue
+
+        var = Var(name, mypy.types.UnionType.make_union(field_types))
+        var.info = info
+        var._fullname = f'{get_fullname(info)}.{name}'
+        info.names[name] = SymbolTableNode(MDEF, var, plugin_generated=True)
+
 
 # `match` method for pattern matching (uses lowercase case names)
 def _add_match(context: ClassDefContext, cases: Iterable[_CaseDef]) -> None:
@@ -296,6 +434,177 @@ def _add_match(context: ClassDefContext, cases: Iterable[_CaseDef]) -> None:
                 tvar_def=matchResultType)
 
 
+# `matcher` class method for building reusable pattern matches (uses
+# lowercase case names)
+def _add_matcher(context: ClassDefContext, cases: List[_CaseDef],
+                 selfType: mypy.types.Instance) -> None:
+    # A MATCHER case's accessor takes precedence, as it does at runtime.
+    if any(case.name.lower() == 'matcher' for case in cases):
+        return
+
+    matcherResultType = _add_typevar(context, '_MatcherResult')
+    resultType = mypy.types.TypeVarType(matcherResultType)
+
+    matcherArgs = []
+    for case in cases:
+        callableType = case.match_lambda(return_type=resultType)
+        matcherArgs.append(
+            Argument(variable=Var(case.name.lower(), callableType),
+                     type_annotation=callableType,
+                     initializer=None,
+                     kind=ARG_NAMED))
+
+    _add_method(context,
+                name='matcher',
+                args=matcherArgs,
+                return_type=mypy.types.CallableType(
+                    [selfType], [ARG_POS], [None], resultType,
+                    context.api.named_type('__builtins__.function')),
+                tvar_def=matcherResultType,
+                is_classmethod=True)
+
+
+# `match_many` class method for pattern matching many values at once (uses
+# lowercase case names)
+def _add_match_many(context: ClassDefContext, cases: List[_CaseDef],
+                    selfType: mypy.types.Instance) -> None:
+    # A MATCH_MANY case's accessor takes precedence, as it does at runtime.
+    if any(case.name.lower() == 'match_many' for case in cases):
+        return
+
+    matchManyResultType = _add_typevar(context, '_MatchManyResult')
+    resultType = mypy.types.TypeVarType(matchManyResultType)
+    valuesType = _typing_type(context, 'Iterable', selfType)
+    boolType = context.api.named_type('__builtins__.bool')
+
+    matchManyArgs = [
+        Argument(variable=Var('__values', valuesType),
+                 type_annotation=valuesType,
+                 initializer=None,
+                 kind=ARG_POS),
+        Argument(variable=Var('_batch', boolType),
+                 type_annotation=boolType,
+                 initializer=None,
+                 kind=ARG_NAMED_OPT),
+    ]
+    for case in cases:
+        callableType = case.match_lambda(return_type=resultType)
+        matchManyArgs.append(
+            Argument(variable=Var(case.name.lower(), callableType),
+                     type_annotation=callableType,
+                     initializer=None,
+                     kind=ARG_NAMED))
+
+    _add_method(context,
+                name='match_many',
+                args=matchManyArgs,
+                return_type=_typing_type(context, 'Iterator', resultType),
+                tvar_def=matchManyResultType,
+                is_classmethod=True)
+
+
+# `fold` class method for folding recursive values (uses lowercase case names)
+def _add_fold(context: ClassDefContext, cases: List[_CaseDef],
+              selfType: mypy.types.Instance) -> None:
+    # A FOLD case's accessor takes precedence, as it does at runtime.
+    if any(case.name.lower() == 'fold' for case in cases):
+        return
+
+    foldResultType = _add_typevar(context, '_FoldResult')
+    resultType = mypy.types.TypeVarType(foldResultType)
+    boolType = context.api.named_type('__builtins__.bool')
+
+    foldArgs = [
+        Argument(variable=Var('__root', selfType),
+                 type_annotation=selfType,
+                 initializer=None,
+                 kind=ARG_POS),
+        Argument(variable=Var('_memoize', boolType),
+                 type_annotation=boolType,
+                 initializer=None,
+                 kind=ARG_NAMED_OPT),
+    ]
+    for case in cases:
+        callableType = case.fold_lambda(self_type=selfType,
+                                        return_type=resultType)
+        foldArgs.append(
+            Argument(variable=Var(case.name.lower(), callableType),
+                     type_annotation=callableType,
+                     initializer=None,
+                     kind=ARG_NAMED))
+
+    _add_method(context,
+                name='fold',
+                args=foldArgs,
+                return_type=resultType,
+                tvar_def=foldResultType,
+                is_classmethod=True)
+
+
+# Methods for converting values to and from a binary format
+def _add_codec(context: ClassDefContext, cases: List[_CaseDef],
+               selfType: mypy.types.Instance) -> None:
+    bytesType = context.api.named_type('__builtins__.bytes')
+    strType = context.api.named_type('__builtins__.str')
+    intType = context.api.named_type('__builtins__.int')
+    fileType = _typing_type(context, 'IO', bytesType)
+
+    # asyncio is only known to mypy if something being checked imports it.
+    readerSym = context.api.lookup_fully_qualified_or_none(
+        'asyncio.streams.StreamReader')
+    readerType: mypy.types.Type
+    if readerSym is not None and isinstance(readerSym.node, TypeInfo):
+        readerType = mypy.types.Instance(readerSym.node, [])
+    else:
+        readerType = mypy.types.AnyType(mypy.types.TypeOfAny.special_form)
+
+    def arg(name: str, t: mypy.types.Type, kind: int = ARG_POS) -> Argument:
+        return Argument(variable=Var(name, t),
+                        type_annotation=t,
+                        initializer=None,
+                        kind=kind)
+
+    methods: List[Tuple[str, List[Argument], mypy.types.Type, bool]] = [
+        ('to_bytes', [], bytesType, False),
+        ('from_bytes', [arg('data', bytesType)], selfType, True),
+        ('dump_iter', [
+            arg('values', _typing_type(context, 'Iterable', selfType)),
+            arg('file', fileType)
+        ], mypy.types.NoneType(), True),
+        ('load_iter', [arg('file', fileType)],
+         _typing_type(context, 'Iterator', selfType), True),
+        ('decode_stream', [
+            arg('reader', readerType),
+            arg('chunk_size', intType, ARG_NAMED_OPT),
+            arg('max_size', intType, ARG_NAMED_OPT)
+        ], _typing_type(context, 'AsyncIterator', selfType), True),
+        ('to_json', [], strType, False),
+        ('to_json_chunks', [arg('chunk_size', intType, ARG_NAMED_OPT)],
+         _typing_type(context, 'Iterator', strType), False),
+        ('from_json', [arg('text', strType)], selfType, True),
+    ]
+
+    # Accessors of cases with the same names take precedence, as they do at
+    # runtime.
+    caseNames = {case.name.lower() for case in cases}
+    for name, args, returnType, isClassmethod in methods:
+        if name not in caseNames:
+            _add_method(context,
+                        name=name,
+                        args=args,
+                        return_type=returnType,
+                        is_classmethod=isClassmethod)
+
+
+# Generic types from the `typing` module, which may not have been imported by
+# the module defining the ADT.
+def _typing_type(context: ClassDefContext, name: str,
+                 *args: mypy.types.Type) -> mypy.types.Type:
+    sym = context.api.lookup_fully_qualified_or_none(f'typing.{name}')
+    assert sym is not None and isinstance(sym.node, TypeInfo)
+    return mypy.types.Instance(sym.node, list(args))
+
+
 # Generates a new, unique, unbounded type variable and defines it within the
 # body of the given class.
 def _add_typevar(context: ClassDefContext,
@@ -340,11 +649,17 @@ def _add_method(
     info = ctx.cls.info
 
     # First remove any previously generated methods with the same name
-    # to avoid clashes and problems in new semantic analyzer.
+    # to avoid clashes and problems in new semantic analyzer. These are simply
+    # replaced, so that analyzing the class again generates the same symbols.
+    #
+    # Unlike mypy.plugins.common.add_method(), the methods are only added to
+    # the symbol table, and not to the class body, which is what the type
+    # checker visits. Their bodies are empty, so checking them finds nothing,
+    # but costs dearly for ADTs with many cases.
     if name in info.names:
         sym = info.names[name]
         if sym.plugin_generated and isinstance(sym.node, FuncDef):
-            ctx.cls.defs.body.remove(sym.node)
+            del info.names[name]
 
     if is_classmethod:
         first = Argument(
@@ -388,5 +703,4 @@ def _add_method(
         r_name = get_unique_redefinition_name(name, info.names)
         info.names[r_name] = info.names[name]
 
-    info.defn.defs.body.append(func)
     info.names[name] = SymbolTableNode(MDEF, func, plugin_generated=True)
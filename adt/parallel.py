@@ -0,0 +1,126 @@
+import itertools
+import os
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (Any, Callable, Deque, Dict, Iterable, Iterator, List,
+                    Optional, Tuple, Type, TypeVar)
+
+from adt.decorator import _IDENTITY, _TUPLE, _validateMatch
+
+_MatchResult = TypeVar('_MatchResult')
+
+# How many chunks are sent to each worker at a time, so that one is ready to
+# start as soon as the last is done, without reading too far ahead into the
+# input.
+_CHUNKS_PER_WORKER = 2
+
+# A chunk of values, as sent to a worker: the index of the case of each value
+# (in an array of small integers), and the data associated with each.
+_Chunk = Tuple['array[int]', List[Any]]
+
+
+def map_match(_values: Iterable[Any],
+              _workers: Optional[int] = None,
+              _chunksize: int = 1024,
+              **handlers: Callable[..., _MatchResult]
+              ) -> Iterator[_MatchResult]:
+    """Applies `handlers` to every value in `_values`, like `match_many`, but
+    in a pool of `_workers` processes (by default, one per CPU).
+
+    The values are sent to the workers in chunks of `_chunksize`, and results
+    are returned in order, as each chunk is finished. Only a few chunks are in
+    progress at a time, so `_values` can be a long (or endless) iterable.
+
+    Like the options of `match_many`, those of this function are prefixed with
+    an underscore, so that they can't clash with the handlers of cases named
+    VALUES, WORKERS or CHUNKSIZE.
+
+    All the values must be of the same ADT class, defined at the top level of
+    a module, and the handlers must be picklable (e.g., functions defined at
+    the top level of a module, rather than lambdas).
+
+    Instead of each value being pickled, chunks only hold the case of each
+    value and its associated data, so the ADT values themselves are never
+    rebuilt in the workers.
+    """
+    if _chunksize < 1:
+        raise ValueError(f'_chunksize must be at least 1, not {_chunksize}')
+
+    iterator = iter(_values)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return iter(())
+
+    cls = getattr(type(first), '_adtClass', None)
+    if cls is None:
+        raise TypeError(f'{first!r} is not a value of an ADT')
+
+    cases = cls._Key
+    if handlers.keys() != {key.lowerName for key in cases}:
+        handlers = _validateMatch(first, cases, handlers)
+
+    chunks = _chunks(cls, itertools.chain((first, ), iterator), _chunksize)
+    return _mapChunks(cls, handlers, chunks, _workers or os.cpu_count() or 1)
+
+
+# Splits the values into chunks, checking that each is of the ADT class `cls`.
+def _chunks(cls: Type[Any], values: Iterator[Any],
+            chunksize: int) -> Iterator[_Chunk]:
+    typecode = 'B' if len(cls._Key) <= 256 else 'L'
+    while True:
+        pending = list(itertools.islice(values, chunksize))
+        if not pending:
+            return
+
+        tags = array(typecode)
+        data = []
+        for value in pending:
+            if not isinstance(value, cls):
+                raise TypeError(
+                    f'{type(value).__qualname__} values cannot be matched along with values of {cls.__qualname__}'
+                )
+
+            tags.append(value._key.value - 1)
+            data.append(value._value)
+
+        yield (tags, data)
+
+
+def _mapChunks(cls: Type[Any], handlers: Dict[str, Callable[..., Any]],
+               chunks: Iterator[_Chunk], workers: int) -> Iterator[Any]:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        inFlight: Deque['Future[List[Any]]'] = deque()
+        try:
+            for chunk in chunks:
+                inFlight.append(
+                    executor.submit(_matchChunk, cls, handlers, chunk))
+                if len(inFlight) >= workers * _CHUNKS_PER_WORKER:
+                    yield from inFlight.popleft().result()
+
+            while inFlight:
+                yield from inFlight.popleft().result()
+        finally:
+            # Abandoned early (or failed), so whatever hasn't started yet
+            # doesn't need to.
+            for future in inFlight:
+                future.cancel()
+
+
+# Runs in a worker process, matching each value in `chunk` against its
+# handler, like the generated `match`.
+def _matchChunk(cls: Type[Any], handlers: Dict[str, Callable[..., Any]],
+                chunk: _Chunk) -> List[Any]:
+    table = [(handlers[key.lowerName], key.arity) for key in cls._Key]
+    results = []
+    for tag, data in zip(*chunk):
+        handler, arity = table[tag]
+        if arity == _TUPLE:
+            results.append(handler(*data))
+        elif arity == _IDENTITY:
+            results.append(handler(data))
+        else:
+            results.append(handler())
+
+    return results
@@ -0,0 +1,306 @@
+import mmap
+import os
+import struct
+from typing import (IO, Any, Callable, Generic, Iterable, Iterator, List,
+                    Optional, Tuple, Type, TypeVar, Union, overload)
+
+from adt.binary import _ADT, _decodeVarint, _fieldOffset, _varint, codecFor
+from adt.decorator import _validateMatch
+
+_T = TypeVar('_T')
+_MatchResult = TypeVar('_MatchResult')
+
+# A store begins with this, the format version, and the qualified name of the
+# ADT class of its values (as a varint length and UTF-8).
+_MAGIC = b'ADTS'
+_VERSION = 1
+
+# Then each value follows, encoded as by `to_bytes`, except with the offsets
+# of the fields of values with several fields (see Codec), so that they can be
+# decoded separately. Then the offset of each value (from the start of the
+# file), and finally a footer holding the offset of those, and how many values
+# there are.
+_offset = struct.Struct('<Q')
+_footer = struct.Struct('<QQ4s')
+
+
+class ADTStoreWriter(Generic[_T]):
+    """Writes values of the ADT `cls` to `file`, in the format read by
+    ADTStore.
+
+    Each value is written as soon as it's added. Only their offsets are kept,
+    in a temporary file, so any number of values can be written in constant
+    memory. The store is complete once the writer is closed (which a `with`
+    block does, unless an exception is raised).
+    """
+
+    def __init__(self, cls: Type[_T], file: IO[bytes]):
+        # Imported here, as it's slow to import, and rarely needed.
+        import tempfile
+
+        self._codec = codecFor(cls, fieldOffsets=True)
+        self._file = file
+        self._offsets: Optional[IO[bytes]] = tempfile.TemporaryFile()
+        self._count = 0
+
+        name = _qualifiedName(cls).encode('utf-8')
+        header = _MAGIC + bytes((_VERSION, )) + _varint(len(name)) + name
+        file.write(header)
+        self._position = len(header)
+
+    def append(self, value: _T) -> None:
+        if self._offsets is None:
+            raise ValueError('Cannot add values to a closed ADTStoreWriter')
+
+        out = bytearray()
+        self._codec._encodeInto(self._codec._checked(value, TypeError), out)
+        self._file.write(out)
+        self._offsets.write(_offset.pack(self._position))
+        self._position += len(out)
+        self._count += 1
+
+    def extend(self, values: Iterable[_T]) -> None:
+        for value in values:
+            self.append(value)
+
+    def close(self) -> None:
+        """Finishes the store, by writing the offsets of its values. `file`
+        is left open."""
+        if self._offsets is None:
+            return
+
+        offsets = self._offsets
+        self._offsets = None
+        with offsets:
+            offsets.seek(0)
+            while True:
+                chunk = offsets.read(65536)
+                if not chunk:
+                    break
+
+                self._file.write(chunk)
+
+        self._file.write(_footer.pack(self._position, self._count, _MAGIC))
+
+    def __enter__(self) -> 'ADTStoreWriter[_T]':
+        return self
+
+    def __exit__(self, excType: Any, *_: Any) -> None:
+        if excType is None:
+            self.close()
+        elif self._offsets is not None:
+            # Left without a footer, so it won't be mistaken for a complete
+            # store.
+            self._offsets.close()
+            self._offsets = None
+
+
+class ADTStore(Generic[_T]):
+    """A read-only, list-like sequence of values of the ADT `cls`, stored in
+    the file at `path` by an ADTStoreWriter.
+
+    The file is memory-mapped, and values are only decoded when they're
+    accessed (again on each access), so opening a store takes the same time
+    however large it is. Processes reading the same file share its pages
+    through the OS page cache, rather than each holding a copy of its values.
+    """
+
+    def __init__(self, cls: Type[_T], path: Union[str, 'os.PathLike[str]']):
+        self._cls = cls
+        self._codec = codecFor(cls, fieldOffsets=True)
+        with open(path, 'rb') as file:
+            try:
+                self._data = mmap.mmap(file.fileno(),
+                                       0,
+                                       access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f'{path} is not an ADTStore') from None
+
+        try:
+            self._start, self._index, self._count = self._readHeaders(path)
+        except BaseException:
+            self._data.close()
+            raise
+
+    def lazy(self, index: int) -> 'LazyValue':
+        """Returns the value at `index` without decoding it, so that its
+        fields can be decoded one at a time, as they're accessed."""
+        start, _ = self._bounds(index)
+        return LazyValue(self, start)
+
+    def close(self) -> None:
+        """Unmaps the file. Values already decoded remain usable, but lazy
+        values do not."""
+        self._data.close()
+
+    def __enter__(self) -> 'ADTStore[_T]':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> _T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[_T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[_T, List[_T]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        start, end = self._bounds(index)
+        value, valueEnd = self._codec._decodeFrom(self._data, start)
+        if valueEnd != end:
+            raise ValueError(
+                f'Unexpected data after the end of the encoded value (at byte {valueEnd})'
+            )
+
+        return self._codec._checked(value, ValueError)  # type: ignore
+
+    def __iter__(self) -> Iterator[_T]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f'<ADTStore of {len(self)} {self._cls.__qualname__} values>'
+
+    # Returns the offsets of the start and end of the value at `index`.
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError('ADTStore index out of range')
+
+        offset = self._index + index * _offset.size
+        start = _offset.unpack_from(self._data, offset)[0]
+        if index + 1 < self._count:
+            end = _offset.unpack_from(self._data, offset + _offset.size)[0]
+        else:
+            end = self._index
+
+        if not self._start <= start <= end <= self._index:
+            raise ValueError(f'Invalid offset of value {index} in ADTStore')
+
+        return (start, end)
+
+    # Checks the header and footer, returning the offset of the first value,
+    # the offset of the index, and the number of values.
+    def _readHeaders(self, path: Union[str, 'os.PathLike[str]']
+                     ) -> Tuple[int, int, int]:
+        data = self._data
+        try:
+            if data[:len(_MAGIC)] != _MAGIC:
+                raise ValueError(f'{path} is not an ADTStore')
+
+            version = data[len(_MAGIC)]
+            if version != _VERSION:
+                raise ValueError(
+                    f'{path} is an ADTStore of unsupported version {version}')
+
+            length, start = _decodeVarint(data, len(_MAGIC) + 1)
+            name = data[start:start + length].decode('utf-8', 'replace')
+            start += length
+
+            index, count, magic = _footer.unpack_from(data,
+                                                      len(data) - _footer.size)
+        except (IndexError, struct.error):
+            raise ValueError(f'{path} is not an ADTStore') from None
+
+        if magic != _MAGIC or index + count * _offset.size + _footer.size != len(
+                data) or index < start:
+            raise ValueError(f'{path} is not a complete ADTStore')
+
+        if name != _qualifiedName(self._cls):
+            raise ValueError(
+                f'{path} holds values of {name}, not {_qualifiedName(self._cls)}'
+            )
+
+        return (start, index, count)
+
+
+class LazyValue:
+    """An ADT value in an ADTStore, which hasn't been decoded yet.
+
+    Its case is known without decoding anything, and its fields are decoded
+    when `fields` or `match` is called. Fields which are themselves ADT values
+    are returned as LazyValues in turn, so a large recursive value can be
+    explored without decoding the parts of it which aren't visited. Other
+    fields (including containers of ADT values) are decoded in full.
+    """
+
+    __slots__ = ('_store', '_offset')
+
+    def __init__(self, store: ADTStore[Any], offset: int):
+        self._store = store
+        self._offset = offset
+
+    @property
+    def case(self) -> str:
+        """The name of the case of this value."""
+        constructor, _, _ = self._header()
+        name: str = constructor._key.name
+        return name
+
+    def fields(self) -> Tuple[Any, ...]:
+        """Returns the associated data of this value, as a tuple (even for
+        cases with a single field), with any ADT values in it left lazy."""
+        codec = self._store._codec
+        data = self._store._data
+        _, fieldCount, offset = self._header()
+        if fieldCount == 0:
+            return ()
+
+        # The first field follows the offsets of the ends of the others.
+        base = offset + _fieldOffset.size * (fieldCount - 1)
+        starts = [base] + [
+            base +
+            _fieldOffset.unpack_from(data, offset + _fieldOffset.size * i)[0]
+            for i in range(fieldCount - 1)
+        ]
+
+        fields = []
+        for start in starts:
+            if data[start] & _ADT:
+                fields.append(LazyValue(self._store, start))
+            else:
+                fields.append(codec._decodeFrom(data, start)[0])
+
+        return tuple(fields)
+
+    def match(self, **handlers: Callable[..., _MatchResult]) -> _MatchResult:
+        """Calls the handler of the case of this value with its fields (from
+        `fields`), like the `match` method of ADT values."""
+        constructor, _, _ = self._header()
+        key = constructor._key
+        handlers = _validateMatch(self, constructor._adtClass._Key, handlers)
+        return handlers[key.lowerName](*self.fields())
+
+    def decode(self) -> Any:
+        """Returns this value, decoded in full."""
+        return self._store._codec._decodeFrom(self._store._data,
+                                              self._offset)[0]
+
+    def __repr__(self) -> str:
+        constructor, _, _ = self._header()
+        return f'<lazy {constructor.__qualname__} at byte {self._offset}>'
+
+    # Returns the constructor of the case of this value, its number of fields,
+    # and the offset of the first of them.
+    def _header(self) -> Tuple[Any, int, int]:
+        data = self._store._data
+        cases = self._store._codec._cases
+        marker = data[self._offset]
+        tag, offset = _decodeVarint(data, self._offset + 1)
+        constructor, fieldCount = cases[marker & ~_ADT][tag]
+        return (constructor, abs(fieldCount), offset)
+
+
+def _qualifiedName(cls: Type[Any]) -> str:
+    return f'{cls.__module__}.{cls.__qualname__}'
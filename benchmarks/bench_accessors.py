@@ -0,0 +1,58 @@
+from typing import Any, Callable, Dict
+
+from adt import Case, adt
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Expression:
+    LITERAL: Case[float]
+    NEGATE: Case["Expression"]
+    ADD: Case["Expression", "Expression"]
+
+
+def _balanced(nodes: int) -> Expression:
+    # Built bottom up, as the tree is deeper than the recursion limit allows.
+    level = [Expression.LITERAL(1.0) for _ in range(nodes // 2)]
+    while len(level) > 1:
+        level = [
+            Expression.ADD(*level[i:i + 2]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+
+    return level[0]
+
+
+def _literalByAccessor(value: Expression) -> Any:
+    try:
+        return value.literal()
+    except AttributeError:
+        return None
+
+
+def main() -> None:
+    nodes = 10**5
+    values = {
+        'one node':
+        Expression.ADD(Expression.LITERAL(1.0), Expression.LITERAL(2.0)),
+        f'{nodes} nodes':
+        _balanced(nodes),
+    }
+
+    # Checking for LITERAL misses on all of the above, which are ADDs.
+    checks: Dict[str, Callable[[Expression], Any]] = {
+        'accessor, catching AttributeError': _literalByAccessor,
+        'is_literal()': lambda value: value.is_literal(),
+        'get_literal()': lambda value: value.get_literal(),
+    }
+
+    results: Dict[str, float] = {}
+    for name, value in values.items():
+        for check, fn in checks.items():
+            results[f'{check} ({name})'] = measure(lambda: fn(value))
+
+    report('Checking for another case', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,398 @@
+import sys
+from abc import ABC
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Any, Callable, Dict, List, Tuple
+
+from adt import Case, adt
+from benchmarks.bench_memory import bytesPerValue
+from benchmarks.helpers import measure, report
+
+# The same shapes, represented with `adt` and with each of the alternatives
+# it is compared to in the README.
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+    TRIANGLE: Case[float, float, float]
+
+
+def _adtShape() -> type:
+    @adt
+    class Shape:
+        POINT: Case
+        CIRCLE: Case[float]
+        RECTANGLE: Case[float, float]
+        TRIANGLE: Case[float, float, float]
+
+    return Shape
+
+
+def _adtArea(shape: Shape) -> float:
+    return shape.match(point=lambda: 0.0,
+                       circle=lambda r: 3.14 * r * r,
+                       rectangle=lambda w, h: w * h,
+                       triangle=lambda a, b, c: a * b / 2)
+
+
+def _pointArea() -> float:
+    return 0.0
+
+
+def _circleArea(r: float) -> float:
+    return 3.14 * r * r
+
+
+def _rectangleArea(w: float, h: float) -> float:
+    return w * h
+
+
+def _triangleArea(a: float, b: float, c: float) -> float:
+    return a * b / 2
+
+
+_adtMatcherArea = Shape.matcher(point=_pointArea,
+                                circle=_circleArea,
+                                rectangle=_rectangleArea,
+                                triangle=_triangleArea)
+
+
+@dataclass(frozen=True)
+class DataclassShape:
+    pass
+
+
+@dataclass(frozen=True)
+class Point(DataclassShape):
+    pass
+
+
+@dataclass(frozen=True)
+class Circle(DataclassShape):
+    radius: float
+
+
+@dataclass(frozen=True)
+class Rectangle(DataclassShape):
+    width: float
+    height: float
+
+
+@dataclass(frozen=True)
+class Triangle(DataclassShape):
+    a: float
+    b: float
+    c: float
+
+
+def _dataclassShapes() -> type:
+    @dataclass(frozen=True)
+    class DataclassShape:
+        pass
+
+    @dataclass(frozen=True)
+    class Point(DataclassShape):
+        pass
+
+    @dataclass(frozen=True)
+    class Circle(DataclassShape):
+        radius: float
+
+    @dataclass(frozen=True)
+    class Rectangle(DataclassShape):
+        width: float
+        height: float
+
+    @dataclass(frozen=True)
+    class Triangle(DataclassShape):
+        a: float
+        b: float
+        c: float
+
+    return DataclassShape
+
+
+def _dataclassArea(shape: DataclassShape) -> float:
+    if isinstance(shape, Point):
+        return 0.0
+    elif isinstance(shape, Circle):
+        return 3.14 * shape.radius * shape.radius
+    elif isinstance(shape, Rectangle):
+        return shape.width * shape.height
+    elif isinstance(shape, Triangle):
+        return shape.a * shape.b / 2
+    else:
+        raise ValueError(f'Unexpected type of shape: {shape}')
+
+
+# The README's "Compared to inheritance" example.
+class ABCShape(ABC):
+    pass
+
+
+class InheritedPoint(ABCShape):
+    pass
+
+
+class InheritedCircle(ABCShape):
+    def __init__(self, radius: float):
+        self.radius = radius
+
+
+class InheritedRectangle(ABCShape):
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+
+
+class InheritedTriangle(ABCShape):
+    def __init__(self, a: float, b: float, c: float):
+        self.a = a
+        self.b = b
+        self.c = c
+
+
+def _inheritedArea(shape: ABCShape) -> float:
+    if isinstance(shape, InheritedPoint):
+        return 0.0
+    elif isinstance(shape, InheritedCircle):
+        return 3.14 * shape.radius * shape.radius
+    elif isinstance(shape, InheritedRectangle):
+        return shape.width * shape.height
+    elif isinstance(shape, InheritedTriangle):
+        return shape.a * shape.b / 2
+    else:
+        raise ValueError(f'Unexpected type of shape: {shape}')
+
+
+def _inheritedShapes() -> type:
+    class ABCShape(ABC):
+        pass
+
+    class InheritedPoint(ABCShape):
+        pass
+
+    class InheritedCircle(ABCShape):
+        def __init__(self, radius: float):
+            self.radius = radius
+
+    class InheritedRectangle(ABCShape):
+        def __init__(self, width: float, height: float):
+            self.width = width
+            self.height = height
+
+    class InheritedTriangle(ABCShape):
+        def __init__(self, a: float, b: float, c: float):
+            self.a = a
+            self.b = b
+            self.c = c
+
+    return ABCShape
+
+
+# The README's "Compared to Enums" example, with the data associated with each
+# member kept alongside it in a tuple.
+class ShapeKind(Enum):
+    POINT = auto()
+    CIRCLE = auto()
+    RECTANGLE = auto()
+    TRIANGLE = auto()
+
+
+def _enumShapeKind() -> type:
+    class ShapeKind(Enum):
+        POINT = auto()
+        CIRCLE = auto()
+        RECTANGLE = auto()
+        TRIANGLE = auto()
+
+    return ShapeKind
+
+
+# The data in the tuples is untyped.
+def _enumArea(shape: Tuple[Any, ...]) -> Any:
+    kind = shape[0]
+    if kind is ShapeKind.POINT:
+        return 0.0
+    elif kind is ShapeKind.CIRCLE:
+        return 3.14 * shape[1] * shape[1]
+    elif kind is ShapeKind.RECTANGLE:
+        return shape[1] * shape[2]
+    elif kind is ShapeKind.TRIANGLE:
+        return shape[1] * shape[2] / 2
+    else:
+        raise ValueError(f'Unexpected kind of shape: {kind}')
+
+
+# PEP 634 `match` statements, which are a syntax error before Python 3.10, so
+# are compiled only where they are supported.
+_PEP634_SOURCE = '''
+def _pep634AdtArea(shape):
+    match shape:
+        case Shape.POINT():
+            return 0.0
+        case Shape.CIRCLE(r):
+            return 3.14 * r * r
+        case Shape.RECTANGLE(w, h):
+            return w * h
+        case Shape.TRIANGLE(a, b, _):
+            return a * b / 2
+        case _:
+            raise ValueError(f'Unexpected case of shape: {shape}')
+
+
+def _pep634Area(shape):
+    match shape:
+        case Point():
+            return 0.0
+        case Circle(radius=r):
+            return 3.14 * r * r
+        case Rectangle(width=w, height=h):
+            return w * h
+        case Triangle(a=a, b=b):
+            return a * b / 2
+        case _:
+            raise ValueError(f'Unexpected type of shape: {shape}')
+
+
+def _pep634EnumArea(shape):
+    match shape:
+        case (ShapeKind.POINT, ):
+            return 0.0
+        case (ShapeKind.CIRCLE, r):
+            return 3.14 * r * r
+        case (ShapeKind.RECTANGLE, w, h):
+            return w * h
+        case (ShapeKind.TRIANGLE, a, b, _):
+            return a * b / 2
+        case _:
+            raise ValueError(f'Unexpected kind of shape: {shape}')
+'''
+
+_pep634: Dict[str, Callable[[Any], float]] = {}
+if sys.version_info >= (3, 10):
+    exec(_PEP634_SOURCE, globals(), _pep634)
+
+# Values of each arity, built by each of the alternatives.
+_IMPLEMENTATIONS: Dict[str, Dict[str, Callable[[], Any]]] = {
+    'adt': {
+        'nullary': Shape.POINT,
+        'one field': lambda: Shape.CIRCLE(1.0),
+        'two fields': lambda: Shape.RECTANGLE(1.0, 2.0),
+        'three fields': lambda: Shape.TRIANGLE(1.0, 2.0, 3.0),
+    },
+    'dataclasses': {
+        'nullary': Point,
+        'one field': lambda: Circle(1.0),
+        'two fields': lambda: Rectangle(1.0, 2.0),
+        'three fields': lambda: Triangle(1.0, 2.0, 3.0),
+    },
+    'inheritance': {
+        'nullary': InheritedPoint,
+        'one field': lambda: InheritedCircle(1.0),
+        'two fields': lambda: InheritedRectangle(1.0, 2.0),
+        'three fields': lambda: InheritedTriangle(1.0, 2.0, 3.0),
+    },
+    'Enum + tuple': {
+        'nullary': lambda: (ShapeKind.POINT, ),
+        'one field': lambda: (ShapeKind.CIRCLE, 1.0),
+        'two fields': lambda: (ShapeKind.RECTANGLE, 1.0, 2.0),
+        'three fields': lambda: (ShapeKind.TRIANGLE, 1.0, 2.0, 3.0),
+    },
+}
+
+# How each alternative consumes a value: by `match` (or a reusable `matcher`),
+# isinstance() checks, comparing Enum members, or PEP 634 `match` statements
+# (which `adt` supports with the class of each case).
+_DISPATCHERS: Dict[str, Tuple[str, Callable[[Any], float]]] = {
+    'adt match()': ('adt', _adtArea),
+    'adt matcher()': ('adt', _adtMatcherArea),
+    'dataclasses + isinstance()': ('dataclasses', _dataclassArea),
+    'inheritance + isinstance()': ('inheritance', _inheritedArea),
+    'Enum + tuple, if/elif': ('Enum + tuple', _enumArea),
+}
+if _pep634:
+    _DISPATCHERS['adt + PEP 634 match'] = ('adt', _pep634['_pep634AdtArea'])
+    _DISPATCHERS['dataclasses + PEP 634 match'] = ('dataclasses',
+                                                   _pep634['_pep634Area'])
+    _DISPATCHERS['Enum + tuple, PEP 634 match'] = ('Enum + tuple',
+                                                   _pep634['_pep634EnumArea'])
+
+# How each alternative retrieves the field of a one-field value.
+_ACCESSORS: Dict[str, Callable[[Any], Any]] = {
+    'adt': lambda value: value.circle(),
+    'dataclasses': lambda value: value.radius,
+    'inheritance': lambda value: value.radius,
+    'Enum + tuple': lambda value: value[1],
+}
+
+# Defining each alternative's types, as happens once upon import.
+_DEFINITIONS: Dict[str, Callable[[], type]] = {
+    'adt': _adtShape,
+    'dataclasses': _dataclassShapes,
+    'inheritance': _inheritedShapes,
+    'Enum': _enumShapeKind,
+}
+
+
+def main() -> None:
+    arities = list(_IMPLEMENTATIONS['adt'])
+
+    for arity in arities:
+        report(
+            f'Construction ({arity})', {
+                name: measure(builders[arity])
+                for name, builders in _IMPLEMENTATIONS.items()
+            })
+
+    for arity in arities:
+        results: Dict[str, float] = {}
+        for name, (implementation, dispatch) in _DISPATCHERS.items():
+            value = _IMPLEMENTATIONS[implementation][arity]()
+            results[name] = measure(lambda: dispatch(value))
+
+        report(f'Dispatch upon the case ({arity})', results)
+
+    results = {}
+    for name, accessor in _ACCESSORS.items():
+        value = _IMPLEMENTATIONS[name]['one field']()
+        results[name] = measure(lambda: accessor(value))
+
+    report('Field access (one field)', results)
+
+    # The README's inheritance example doesn't define these methods, so
+    # compares only by identity, and is left out.
+    operations: List[Tuple[str, Callable[[Any, Any], Any]]] = [
+        ('==', lambda a, b: a == b),
+        ('hash', lambda a, b: hash(a)),
+        ('repr', lambda a, b: repr(a)),
+    ]
+    for operation, fn in operations:
+        results = {}
+        for name, builders in _IMPLEMENTATIONS.items():
+            if name == 'inheritance':
+                continue
+
+            value, copy = builders['two fields'](), builders['two fields']()
+            results[name] = measure(lambda: fn(value, copy))
+
+        report(f'{operation} (two fields)', results)
+
+    report('Defining a type of 4 cases', {
+        name: measure(define, number=10) / 1e3
+        for name, define in _DEFINITIONS.items()
+    },
+           unit='us')
+
+    report('Memory per instance (two fields)', {
+        name: bytesPerValue(builders['two fields'])
+        for name, builders in _IMPLEMENTATIONS.items()
+    },
+           unit='bytes')
+
+
+if __name__ == '__main__':
+    main()
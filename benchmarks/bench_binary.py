@@ -0,0 +1,65 @@
+import os
+import pickle
+from typing import Any, Dict, Tuple
+
+from adt import Case, adt
+from benchmarks.helpers import measure, report
+
+# Trees of this depth have 2^(DEPTH + 1) - 1 nodes (about a million, by
+# default).
+DEPTH = int(os.getenv('ADT_BENCHMARK_DEPTH', default='19'))
+
+
+@adt
+class Tree:
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+def balanced(depth: int, start: int = 0) -> Tree:
+    if depth == 0:
+        return Tree.LEAF(start)
+
+    return Tree.NODE(balanced(depth - 1, start),
+                     balanced(depth - 1, start + 2**(depth - 1)))
+
+
+# The same tree as plain tuples, which pickle handles natively.
+def balancedTuples(depth: int, start: int = 0) -> Tuple[Any, ...]:
+    if depth == 0:
+        return ('LEAF', start)
+
+    return ('NODE', (balancedTuples(depth - 1, start),
+                     balancedTuples(depth - 1, start + 2**(depth - 1))))
+
+
+def main() -> None:
+    nodes = 2**(DEPTH + 1) - 1
+    tree = balanced(DEPTH)
+    tuples = balancedTuples(DEPTH)
+
+    data = tree.to_bytes()
+    pickled = pickle.dumps(tuples, protocol=pickle.HIGHEST_PROTOCOL)
+    report(f'Encoded size of a tree of {nodes} nodes, per node', {
+        'to_bytes()': len(data) / nodes,
+        'pickle (highest protocol, tuples)': len(pickled) / nodes,
+    },
+           unit='bytes')
+
+    results: Dict[str, float] = {
+        'to_bytes()':
+        measure(tree.to_bytes, number=1, repeat=3) / nodes,
+        'from_bytes()':
+        measure(lambda: Tree.from_bytes(data), number=1, repeat=3) / nodes,
+        'pickle.dumps (highest protocol, tuples)':
+        measure(lambda: pickle.dumps(tuples, protocol=pickle.HIGHEST_PROTOCOL),
+                number=1,
+                repeat=3) / nodes,
+        'pickle.loads (highest protocol, tuples)':
+        measure(lambda: pickle.loads(pickled), number=1, repeat=3) / nodes,
+    }
+    report(f'Encoding a tree of {nodes} nodes, per node', results)
+
+
+if __name__ == '__main__':
+    main()
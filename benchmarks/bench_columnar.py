@@ -0,0 +1,80 @@
+import os
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from adt import ADTArray, Case, adt
+from benchmarks.helpers import measure, report
+
+SIZE = int(os.getenv('ADT_BENCHMARK_SIZE', default='100000'))
+
+
+@adt
+class Reading:
+    MISSING: Case
+    TEMPERATURE: Case[float]
+    COUNT: Case[int]
+    RANGE: Case[float, float]
+
+
+@adt(slots=True)
+class SlottedReading:
+    MISSING: Case
+    TEMPERATURE: Case[float]
+    COUNT: Case[int]
+    RANGE: Case[float, float]
+
+
+def _readings(cls: Any, size: int) -> List[Any]:
+    makers: List[Callable[[int], Any]] = [
+        lambda i: cls.MISSING(),
+        lambda i: cls.TEMPERATURE(float(i)),
+        lambda i: cls.COUNT(i),
+        lambda i: cls.RANGE(float(i), float(i + 1)),
+    ]
+    return [makers[i % len(makers)](i) for i in range(size)]
+
+
+def _retainedBytes(build: Callable[[], Any]) -> int:
+    """Returns the memory retained by the result of `build`, in bytes."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return after - before
+
+
+def main() -> None:
+    values = _readings(Reading, SIZE)
+    memory: Dict[str, float] = {
+        'list of values':
+        _retainedBytes(lambda: _readings(Reading, SIZE)) / SIZE,
+        'list of slotted values':
+        _retainedBytes(lambda: _readings(SlottedReading, SIZE)) / SIZE,
+        'ADTArray':
+        _retainedBytes(lambda: ADTArray(Reading, values)) / SIZE,
+    }
+    report(f'Memory for {SIZE} values, per value', memory, unit='bytes')
+
+    array = ADTArray(Reading, values)
+    times = {
+        'ADTArray(cls, values)':
+        measure(lambda: ADTArray(Reading, values), number=1) / SIZE,
+        'ADTArray.tolist()':
+        measure(array.tolist, number=1) / SIZE,
+        'ADTArray.select()':
+        measure(lambda: array.select('temperature'), number=1) / SIZE,
+        'ADTArray.counts()':
+        measure(array.counts),
+        'ADTArray[i]':
+        measure(lambda: array[SIZE // 2]),
+    }
+    report(f'Operations on {SIZE} values', times)
+
+
+if __name__ == '__main__':
+    main()
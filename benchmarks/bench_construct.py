@@ -0,0 +1,28 @@
+from typing import Dict
+
+from adt import Case, adt
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+    TERNARY: Case["Tree", "Tree", "Tree"]
+
+
+def main() -> None:
+    leaf = Tree.LEAF(1)
+    results: Dict[str, float] = {
+        'EMPTY()': measure(lambda: Tree.EMPTY()),
+        'LEAF(1)': measure(lambda: Tree.LEAF(1)),
+        'NODE(a, b)': measure(lambda: Tree.NODE(leaf, leaf)),
+        'TERNARY(a, b, c)': measure(lambda: Tree.TERNARY(leaf, leaf, leaf)),
+    }
+
+    report('Construction per call', results)
+
+
+if __name__ == '__main__':
+    main()
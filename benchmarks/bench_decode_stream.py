@@ -0,0 +1,137 @@
+import asyncio
+import io
+import time
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+
+from adt import Case, adt
+from benchmarks.helpers import report
+
+
+@adt
+class Tree:
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+def balanced(depth: int, start: int = 0) -> Tree:
+    if depth == 0:
+        return Tree.LEAF(start)
+
+    return Tree.NODE(balanced(depth - 1, start),
+                     balanced(depth - 1, start + 2**(depth - 1)))
+
+
+# Each connection sends many small values, and a few large ones, which take
+# long enough to decode to hold up the event loop.
+_SMALL = 1000
+_LARGE = 4
+_VALUES = [balanced(4)] * _SMALL + [balanced(14)] * _LARGE
+
+# How often the event loop is checked on, while values are being decoded.
+_INTERVAL = 0.001
+
+Decoder = Callable[[asyncio.StreamReader], AsyncIterator[Tree]]
+
+
+# The straightforward alternative: each value is read in full, then decoded
+# all at once.
+async def _readThenDecode(reader: asyncio.StreamReader) -> AsyncIterator[Tree]:
+    while True:
+        length = 0
+        shift = 0
+        while True:
+            byte = await reader.read(1)
+            if not byte:
+                return
+
+            length |= (byte[0] & 0x7F) << shift
+            shift += 7
+            if byte[0] < 0x80:
+                break
+
+        yield Tree.from_bytes(await reader.readexactly(length))
+
+
+async def _decodeStream(reader: asyncio.StreamReader) -> AsyncIterator[Tree]:
+    async for value in Tree.decode_stream(reader):
+        yield value
+
+
+# Receives the values from `connections` connections at once, and returns the
+# time taken per value (in ns) and the longest delay of the event loop (in
+# ms).
+async def _receive(data: bytes, connections: int,
+                   decode: Decoder) -> Tuple[float, float]:
+    async def send(reader: asyncio.StreamReader,
+                   writer: asyncio.StreamWriter) -> None:
+        writer.write(data)
+        await writer.drain()
+        writer.close()
+
+    async def receive() -> int:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        count = 0
+        async for _ in decode(reader):
+            count += 1
+
+        writer.close()
+        return count
+
+    longestDelay = 0.0
+    done = False
+
+    async def monitor() -> None:
+        nonlocal longestDelay
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(_INTERVAL)
+            delay = time.perf_counter() - start - _INTERVAL
+            longestDelay = max(longestDelay, delay)
+
+    server = await asyncio.start_server(send, '127.0.0.1', 0)
+    assert server.sockets is not None
+    port = server.sockets[0].getsockname()[1]
+    monitoring = asyncio.ensure_future(monitor())
+
+    start = time.perf_counter_ns()
+    counts = await asyncio.gather(*(receive() for _ in range(connections)))
+    elapsed = time.perf_counter_ns() - start
+
+    done = True
+    await monitoring
+    server.close()
+    await server.wait_closed()
+
+    assert sum(counts) == connections * len(_VALUES)
+    return (elapsed / sum(counts), longestDelay * 1000)
+
+
+def main() -> None:
+    file = io.BytesIO()
+    Tree.dump_iter(_VALUES, file)
+    data = file.getvalue()
+
+    decoders: List[Tuple[str, Decoder]] = [
+        ('read, then from_bytes', _readThenDecode),
+        ('decode_stream', _decodeStream),
+    ]
+
+    perValue: Dict[str, float] = {}
+    delays: Dict[str, float] = {}
+    for connections in [1, 4, 16]:
+        for name, decode in decoders:
+            label = f'{name}, {connections} connection{"s" if connections > 1 else ""}'
+            results = [
+                asyncio.run(_receive(data, connections, decode))
+                for _ in range(3)
+            ]
+            perValue[label] = min(ns for ns, _ in results)
+            delays[label] = min(ms for _, ms in results)
+
+    report(f'Time per value received ({len(data)} bytes per connection)',
+           perValue)
+    report('Longest event loop delay', delays, unit='ms')
+
+
+if __name__ == '__main__':
+    main()
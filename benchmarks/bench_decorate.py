@@ -0,0 +1,82 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+from benchmarks.helpers import measure, report
+
+COUNT = int(os.getenv('ADT_BENCHMARK_CLASSES', default='1000'))
+
+_MODULE = 'synthetic_adts'
+
+
+def _source(count: int, decorate: bool = True) -> str:
+    """Returns the source of a module defining `count` ADTs."""
+    lines = ['from typing import List', 'from adt import Case, adt', '']
+    for i in range(count):
+        lines += [
+            '@adt' if decorate else '',
+            f'class ADT{i}:',
+            '    EMPTY: Case',
+            '    ONE: Case[int]',
+            '    TWO: Case[int, str]',
+            f'    MANY: Case[List["ADT{i}"]]',
+            '    OTHER: Case[str]',
+            '',
+        ]
+
+    return '\n'.join(lines)
+
+
+def _importTime(directory: str) -> float:
+    """Imports the module in `directory` in a new interpreter, and returns
+    its cumulative import time, as reported by `python -X importtime`, in
+    microseconds."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ,
+               PYTHONPATH=os.pathsep.join([directory, root]),
+               PYTHONDONTWRITEBYTECODE='')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {_MODULE}'],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True)
+
+    match = re.search(rf'\|\s*(\d+) \| {_MODULE}$', result.stderr,
+                      re.MULTILINE)
+    assert match is not None, result.stderr
+    return float(match.group(1))
+
+
+def main() -> None:
+    decorated = compile(_source(COUNT), _MODULE, 'exec')
+    undecorated = compile(_source(COUNT, decorate=False), _MODULE, 'exec')
+
+    results: Dict[str, float] = {
+        'classes':
+        measure(lambda: exec(undecorated, {}), number=1) / 1e6,
+        'classes decorated with @adt':
+        measure(lambda: exec(decorated, {}), number=1) / 1e6,
+    }
+    results['@adt alone'] = results['classes decorated with @adt'] - results[
+        'classes']
+    report(f'Defining {COUNT} ADTs with 5 cases each', results, unit='ms')
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, f'{_MODULE}.py'), 'w') as file:
+            file.write(_source(COUNT))
+
+        # The first import also compiles the module, which is excluded.
+        _importTime(directory)
+        times: List[float] = [_importTime(directory) for _ in range(5)]
+
+    report(f'Importing a module of {COUNT} ADTs (python -X importtime)',
+           {'cumulative import time (best of 5)': min(times) / 1e3},
+           unit='ms')
+
+
+if __name__ == '__main__':
+    main()
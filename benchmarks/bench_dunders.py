@@ -0,0 +1,84 @@
+from typing import Any, Dict
+
+from adt import Case, adt, set_format_limits
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Expression:
+    LITERAL: Case[float]
+    NEGATE: Case["Expression"]
+    ADD: Case["Expression", "Expression"]
+
+
+def _negations(depth: int) -> Expression:
+    value = Expression.LITERAL(1.0)
+    for _ in range(depth):
+        value = Expression.NEGATE(value)
+
+    return value
+
+
+def main() -> None:
+    values: Dict[str, Any] = {
+        'LITERAL(1.0)':
+        lambda: Expression.LITERAL(1.0),
+        'NEGATE(LITERAL(1.0))':
+        lambda: Expression.NEGATE(Expression.LITERAL(1.0)),
+        'ADD(LITERAL(1.0), LITERAL(2.0))':
+        lambda: Expression.ADD(Expression.LITERAL(1.0), Expression.LITERAL(2.0)
+                               ),
+    }
+
+    results: Dict[str, float] = {}
+    for name, build in values.items():
+        value, copy = build(), build()
+        results[f'== {name}'] = measure(lambda: value == copy)
+        results[f'hash {name}'] = measure(lambda: hash(value))
+        results[f'repr {name}'] = measure(lambda: repr(value))
+
+    report('Generated methods on shallow values', results)
+
+    # Deep values are handled iteratively instead, at a cost per nested value.
+    depth = 10**5
+    deep, deepCopy = _negations(depth), _negations(depth)
+    results = {
+        f'== NEGATE^{depth}': measure(lambda: deep == deepCopy, number=1),
+        f'hash NEGATE^{depth}': measure(lambda: hash(deep), number=1),
+        f'repr NEGATE^{depth}': measure(lambda: repr(deep), number=1),
+    }
+
+    report('Generated methods on deep values, per nested value',
+           {name: ns / depth
+            for name, ns in results.items()})
+
+    # With limits, and in error messages, only the outermost values are
+    # rendered, however deep the value is.
+    results = {}
+    set_format_limits(depth=10, length=200)
+    for length in [10, depth]:
+        value = _negations(length)
+        results[f'repr NEGATE^{length}, limited'] = measure(lambda: repr(value)
+                                                            )
+
+    set_format_limits()
+
+    for length in [10, depth]:
+        value = _negations(length)
+        results[f'Incomplete match error, NEGATE^{length}'] = measure(
+            lambda: _incompleteMatchMessage(value))
+
+    report('Bounded rendering', results)
+
+
+def _incompleteMatchMessage(value: Expression) -> str:
+    try:
+        value.match(literal=lambda x: x)  # type: ignore
+    except ValueError as e:
+        return str(e)
+
+    raise AssertionError('The match was complete')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+from typing import Dict
+
+from adt import Case, adt
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Expression:
+    LITERAL: Case[float]
+    NEGATE: Case["Expression"]
+    ADD: Case["Expression", "Expression"]
+
+
+def _negate(x: float) -> float:
+    return -x
+
+
+def _add(a: float, b: float) -> float:
+    return a + b
+
+
+def evaluateWithMatch(e: Expression) -> float:
+    return e.match(
+        literal=lambda x: x,
+        negate=lambda e: -evaluateWithMatch(e),
+        add=lambda a, b: evaluateWithMatch(a) + evaluateWithMatch(b))
+
+
+def evaluateWithFold(e: Expression) -> float:
+    return Expression.fold(e, literal=lambda x: x, negate=_negate, add=_add)
+
+
+def _plusOne(n: int) -> int:
+    return n + 1
+
+
+def _plusBoth(a: int, b: int) -> int:
+    return a + b + 1
+
+
+def size(e: Expression) -> int:
+    return Expression.fold(e,
+                           literal=lambda _: 1,
+                           negate=_plusOne,
+                           add=_plusBoth)
+
+
+def balanced(depth: int) -> Expression:
+    if depth == 0:
+        return Expression.LITERAL(1.0)
+
+    return Expression.ADD(balanced(depth - 1),
+                          Expression.NEGATE(balanced(depth - 1)))
+
+
+def chain(length: int) -> Expression:
+    value = Expression.LITERAL(1.0)
+    for _ in range(length):
+        value = Expression.NEGATE(value)
+
+    return value
+
+
+def main() -> None:
+    # Shallow enough that the recursive evaluator still works.
+    values = {
+        'balanced tree, depth 10': balanced(10),
+        'chain of 200 NEGATEs': chain(200),
+    }
+
+    results: Dict[str, float] = {}
+    for name, value in values.items():
+        nodes = size(value)
+        results[f'recursive match ({name})'] = measure(
+            lambda: evaluateWithMatch(value)) / nodes
+        results[f'fold ({name})'] = measure(lambda: evaluateWithFold(value)
+                                            ) / nodes
+
+    report('Evaluation per nested value', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+from typing import Any, Dict
+
+from adt import Case, adt
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Tree:
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+@adt(frozen=True)
+class FrozenTree:
+    LEAF: Case[int]
+    NODE: Case["FrozenTree", "FrozenTree"]
+
+
+def balanced(cls: Any, depth: int, start: int = 0) -> Any:
+    if depth == 0:
+        return cls.LEAF(start)
+
+    return cls.NODE(balanced(cls, depth - 1, start),
+                    balanced(cls, depth - 1, start + 2**(depth - 1)))
+
+
+def main() -> None:
+    depth = 14
+    results: Dict[str, float] = {}
+    for name, cls in (('', Tree), (' (frozen)', FrozenTree)):
+        tree = balanced(cls, depth)
+        twin = balanced(cls, depth)
+        other = balanced(cls, depth, start=1)
+        members = {tree}
+        results[f'hash{name}'] = measure(lambda: hash(tree))
+        results[f'in set, same object{name}'] = measure(lambda: tree in members
+                                                        )
+        results[f'in set, equal copy{name}'] = measure(lambda: twin in members)
+        results[f'not in set{name}'] = measure(lambda: other in members)
+
+    report(f'Hashing a tree of {2**(depth + 1) - 1} nodes', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import json
+import os
+from typing import Any, Dict
+
+from benchmarks.bench_binary import Tree, balanced
+from benchmarks.helpers import measure, report
+
+# Trees of this depth have 2^(DEPTH + 1) - 1 nodes.
+DEPTH = int(os.getenv('ADT_BENCHMARK_DEPTH', default='16'))
+
+
+# The same tree as the plain dicts which `to_json` produces.
+def balancedDicts(depth: int, start: int = 0) -> Dict[str, Any]:
+    if depth == 0:
+        return {'tag': 'LEAF', 'values': [start]}
+
+    return {
+        'tag':
+        'NODE',
+        'values': [
+            balancedDicts(depth - 1, start),
+            balancedDicts(depth - 1, start + 2**(depth - 1))
+        ]
+    }
+
+
+def main() -> None:
+    nodes = 2**(DEPTH + 1) - 1
+    tree = balanced(DEPTH)
+    dicts = balancedDicts(DEPTH)
+
+    text = tree.to_json()
+    assert text == json.dumps(dicts)
+
+    results: Dict[str, float] = {
+        'to_json()':
+        measure(tree.to_json, number=1) / nodes,
+        'to_json_chunks()':
+        measure(lambda: list(tree.to_json_chunks()), number=1) / nodes,
+        'json.dumps (dicts)':
+        measure(lambda: json.dumps(dicts), number=1) / nodes,
+        'from_json()':
+        measure(lambda: Tree.from_json(text), number=1) / nodes,
+        'json.loads (dicts)':
+        measure(lambda: json.loads(text), number=1) / nodes,
+    }
+    report(f'JSON for a tree of {nodes} nodes, per node', results)
+
+
+if __name__ == '__main__':
+    main()
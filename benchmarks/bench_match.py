@@ -0,0 +1,57 @@
+from typing import Any, Dict
+
+from adt import Case, adt
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+    TRIANGLE: Case[float, float, float]
+    POLYGON: Case[int, float]
+    ELLIPSE: Case[float, float]
+
+
+def _handlers() -> Dict[str, Any]:
+    return dict(point=lambda: 0.0,
+                circle=lambda r: r,
+                rectangle=lambda w, h: w,
+                triangle=lambda a, b, c: a,
+                polygon=lambda n, s: s,
+                ellipse=lambda a, b: a)
+
+
+def main() -> None:
+    handlers = _handlers()
+    values = {
+        'nullary': Shape.POINT(),
+        'one field': Shape.CIRCLE(1.0),
+        'two fields': Shape.RECTANGLE(1.0, 2.0),
+        'three fields': Shape.TRIANGLE(1.0, 2.0, 3.0),
+    }
+
+    results: Dict[str, float] = {}
+    for name, value in values.items():
+        results[f'match ({name})'] = measure(lambda: value.match(**handlers))
+
+    matcher = Shape.matcher(**handlers)
+    for name, value in values.items():
+        results[f'matcher ({name})'] = measure(lambda: matcher(value))
+
+    # The unavoidable costs of a `match` call, for comparison: passing the
+    # handlers as keyword arguments, and calling one of them.
+    def takesKwargs(**kwargs: Any) -> Any:
+        return kwargs['circle'](1.0)
+
+    results['**handlers call floor'] = measure(lambda: takesKwargs(**handlers))
+
+    circle = handlers['circle']
+    results['direct handler call'] = measure(lambda: circle(1.0))
+
+    report('match() per call', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import collections
+import os
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from adt import Case, adt, batched
+from benchmarks.helpers import measure, report
+
+# How many values to match. The default keeps a run to a few seconds; the
+# results scale linearly, e.g. with ADT_BENCHMARK_SIZE=10000000.
+SIZE = int(os.getenv('ADT_BENCHMARK_SIZE', default='1000000'))
+
+
+@adt
+class Result:
+    OK: Case[int]
+    ERROR: Case[str]
+
+
+def _values(size: int) -> List[Result]:
+    error = Result.ERROR('failed')
+    return [Result.OK(i) if i % 4 else error for i in range(size)]
+
+
+def _identity(xs: List[int]) -> List[int]:
+    return xs
+
+
+def _zeros(xs: List[str]) -> List[int]:
+    return [0] * len(xs)
+
+
+def _peakBytes(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        return peak
+    finally:
+        tracemalloc.stop()
+
+
+def _consume(iterable: Any) -> None:
+    collections.deque(iterable, maxlen=0)
+
+
+def main() -> None:
+    values = _values(SIZE)
+    ok: Callable[[int], int] = lambda x: x
+    error: Callable[[str], int] = lambda s: 0
+
+    approaches: Dict[str, Callable[[], Any]] = {
+        'list comprehension of match()':
+        lambda: [x.match(ok=ok, error=error) for x in values],
+        'match_many()':
+        lambda: list(Result.match_many(values, ok=ok, error=error)),
+        'match_many(_batch=True)':
+        lambda: list(Result.match_many(values, _batch=True, ok=ok, error=error)
+                     ),
+        'match_many(_batch=True), batched callbacks':
+        lambda: list(
+            Result.match_many(values,
+                              _batch=True,
+                              ok=batched(_identity),
+                              error=batched(_zeros))),
+        'match_many(), consumed while streaming':
+        lambda: _consume(Result.match_many(values, ok=ok, error=error)),
+    }
+
+    times: Dict[str, float] = {}
+    peaks: Dict[str, float] = {}
+    for name, approach in approaches.items():
+        times[name] = measure(approach, number=1) / SIZE
+        peaks[name] = _peakBytes(approach) / SIZE
+
+    report(f'Matching {SIZE} values, per value', times)
+    report(f'Peak memory allocated while matching {SIZE} values, per value',
+           peaks,
+           unit='bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from adt import Case, adt
+from benchmarks.helpers import report
+
+
+@adt
+class Expression:
+    LITERAL: Case[float]
+    ADD: Case["Expression", "Expression"]
+
+
+@adt(slots=True)
+class SlottedExpression:
+    LITERAL: Case[float]
+    ADD: Case["SlottedExpression", "SlottedExpression"]
+
+
+def bytesPerValue(build: Callable[[], Any], count: int = 100000) -> float:
+    """Returns the memory retained by one value from `build`, in bytes."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        values: List[Any] = [build() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    # Don't count the list holding the values.
+    return (after - before) / count - 8
+
+
+def main() -> None:
+    literal = 1.0
+    results: Dict[str, float] = {
+        'LITERAL':
+        bytesPerValue(lambda: Expression.LITERAL(literal)),
+        'LITERAL (slots)':
+        bytesPerValue(lambda: SlottedExpression.LITERAL(literal)),
+    }
+
+    lhs, rhs = Expression.LITERAL(1.0), Expression.LITERAL(2.0)
+    results['ADD'] = bytesPerValue(lambda: Expression.ADD(lhs, rhs))
+
+    slhs, srhs = SlottedExpression.LITERAL(1.0), SlottedExpression.LITERAL(2.0)
+    results['ADD (slots)'] = bytesPerValue(lambda: SlottedExpression.ADD(
+        slhs, srhs))
+
+    report('Memory per instance', results, unit='bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import itertools
+import os
+import tempfile
+from typing import Callable, Dict, List
+
+import mypy.api
+
+from benchmarks.helpers import measure, report
+
+# Numbers of cases in the generated ADTs. Override with a comma-separated
+# ADT_BENCHMARK_CASES environment variable.
+CASES = [
+    int(count) for count in os.getenv('ADT_BENCHMARK_CASES',
+                                      default='10,100,1000').split(',')
+]
+
+# How many `match` call sites, each handling every case, to type-check.
+CALL_SITES = 10
+
+
+def _adtSource(count: int) -> str:
+    """Returns the source of a module defining an ADT of `count` cases."""
+    lines = ['from typing import List', 'from adt import Case, adt', '']
+    lines += ['@adt', 'class Message:']
+    for i in range(count):
+        lines.append(
+            f'    CASE{i}: ' +
+            ['Case', 'Case[int]', 'Case[str, int]', 'Case[List["Message"]]'][
+                i % 4])
+
+    return '\n'.join(lines) + '\n'
+
+
+def _callSitesSource(count: int) -> str:
+    """Returns the source of a module which exhaustively matches upon the ADT
+    defined by _adtSource(count), at each of CALL_SITES call sites."""
+    handlers = [[
+        'lambda: 0', 'lambda n: n', 'lambda s, n: n', 'lambda ms: len(ms)'
+    ][i % 4] for i in range(count)]
+
+    lines = ['from messages import Message', '']
+    for site in range(CALL_SITES):
+        lines += [
+            f'def handle{site}(message: Message) -> int:',
+            '    return message.match(',
+        ]
+        lines += [
+            f'        case{i}={handler},' for i, handler in enumerate(handlers)
+        ]
+        lines += ['    )', '']
+
+    return '\n'.join(lines)
+
+
+def _typeCheck(paths: List[str], cacheDir: str) -> None:
+    report, errors, status = mypy.api.run(['--cache-dir', cacheDir] + paths)
+    assert status == 0, report + errors
+
+
+def _changed(path: str) -> Callable[[], None]:
+    """Returns a function which changes the module at `path`, without
+    changing its interface, so that it alone is type-checked again."""
+    revisions = itertools.count()
+
+    def change() -> None:
+        with open(path, 'a') as file:
+            file.write(f'# Revision {next(revisions)}\n')
+
+    return change
+
+
+def main() -> None:
+    for count in CASES:
+        with tempfile.TemporaryDirectory() as directory:
+            paths: Dict[str, str] = {}
+            for name, source in [('empty', 'import adt\n'),
+                                 ('messages', _adtSource(count)),
+                                 ('call_sites', _callSitesSource(count))]:
+                paths[name] = os.path.join(directory, f'{name}.py')
+                with open(paths[name], 'w') as file:
+                    file.write(source)
+
+            # Everything else is type-checked once, and then read from the
+            # cache: only the module which was changed is checked again.
+            cacheDir = os.path.join(directory, '.mypy_cache')
+            everything = list(paths.values())
+            _typeCheck(everything, cacheDir)
+
+            times: Dict[str, float] = {}
+            for name in paths:
+                change = _changed(paths[name])
+
+                def recheck() -> None:
+                    change()
+                    _typeCheck(everything, cacheDir)
+
+                times[name] = measure(recheck, number=1) / 1e6
+
+        # Absolute times, as each is only as steady as a run of mypy, so
+        # their differences can come out negative. Rechecking the empty
+        # module shows how long mypy takes regardless of what changed.
+        results: Dict[str, float] = {
+            'after changing an empty module':
+            times['empty'],
+            'after changing the ADT':
+            times['messages'],
+            f'after changing {CALL_SITES} exhaustive match calls':
+            times['call_sites'],
+        }
+        report(f'Type-checking an ADT of {count} cases again (mypy)',
+               results,
+               unit='ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+from enum import Enum
+from typing import Dict
+
+from adt import Case, adt
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Color:
+    RED: Case
+    GREEN: Case
+    BLUE: Case
+
+
+class EnumColor(Enum):
+    RED = 1
+    GREEN = 2
+    BLUE = 3
+
+
+def main() -> None:
+    red, green = Color.RED(), Color.GREEN()
+    enumRed, enumGreen = EnumColor.RED, EnumColor.GREEN
+    lookup = {red: 1, green: 2}
+    enumLookup = {enumRed: 1, enumGreen: 2}
+
+    results: Dict[str, float] = {
+        'construct': measure(lambda: Color.RED()),
+        'construct (Enum)': measure(lambda: EnumColor.RED),
+        '== (equal)': measure(lambda: red == red),
+        '== (equal, Enum)': measure(lambda: enumRed == enumRed),
+        '== (unequal)': measure(lambda: red == green),
+        '== (unequal, Enum)': measure(lambda: enumRed == enumGreen),
+        'hash': measure(lambda: hash(red)),
+        'hash (Enum)': measure(lambda: hash(enumRed)),
+        'dict lookup': measure(lambda: lookup[green]),
+        'dict lookup (Enum)': measure(lambda: enumLookup[enumGreen]),
+    }
+
+    report('Nullary-only ADT compared to Enum', results)
+
+
+if __name__ == '__main__':
+    main()
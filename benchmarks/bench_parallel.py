@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from adt import Case, adt
+from adt.parallel import map_match
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+
+
+# Handlers which do enough work for each value that running them in parallel
+# can pay for sending the values to other processes.
+def _point() -> float:
+    return 0.0
+
+
+def _circle(r: float) -> float:
+    total = 0.0
+    for i in range(200):
+        total += r * i
+    return total
+
+
+def _rectangle(w: float, h: float) -> float:
+    total = 0.0
+    for i in range(200):
+        total += w * h * i
+    return total
+
+
+def _area(shape: Shape) -> float:
+    return shape.match(point=_point, circle=_circle, rectangle=_rectangle)
+
+
+_VALUES: List[Shape] = [
+    Shape.POINT() if i % 3 == 0 else Shape.CIRCLE(float(i)) if i %
+    3 == 1 else Shape.RECTANGLE(float(i), 2.0) for i in range(20000)
+]
+
+
+def _serial() -> None:
+    for shape in _VALUES:
+        _area(shape)
+
+
+# The straightforward alternative: each value is pickled and sent to a worker
+# on its own.
+def _executorMap(workers: int) -> None:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(_area, _VALUES):
+            pass
+
+
+def _mapMatch(workers: int) -> None:
+    for _ in map_match(_VALUES,
+                       _workers=workers,
+                       point=_point,
+                       circle=_circle,
+                       rectangle=_rectangle):
+        pass
+
+
+def main() -> None:
+    maxWorkers = max(4, os.cpu_count() or 1)
+    counts: List[int] = []
+    count = 1
+    while count < maxWorkers:
+        counts.append(count)
+        count *= 2
+
+    counts.append(maxWorkers)
+
+    perValue: Dict[str, float] = {
+        'serial match':
+        measure(_serial, number=1) / len(_VALUES),
+        f'ProcessPoolExecutor.map, {maxWorkers} workers':
+        measure(lambda: _executorMap(maxWorkers), number=1, repeat=1) /
+        len(_VALUES),
+    }
+
+    for count in counts:
+        name = f'map_match, {count} worker{"s" if count > 1 else ""}'
+        perValue[name] = measure(lambda: _mapMatch(count),
+                                 number=1) / len(_VALUES)
+
+    # Workers only run at once with enough cores, so on fewer, map_match can
+    # at best match the serial loop.
+    serial = perValue['serial match']
+    report(f'Time per value ({os.cpu_count()} CPUs)', perValue)
+    report('Speedup over the serial match loop',
+           {name: serial / ns
+            for name, ns in perValue.items()},
+           unit='x')
+
+
+if __name__ == '__main__':
+    main()
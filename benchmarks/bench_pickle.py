@@ -0,0 +1,51 @@
+import os
+import pickle
+from typing import Any, Dict
+
+from benchmarks.bench_binary import DEPTH, Tree, balanced, balancedTuples
+from benchmarks.helpers import measure, report
+
+SIZE = int(os.getenv('ADT_BENCHMARK_SIZE', default='100000'))
+
+
+def _roundTrip(value: Any) -> Any:
+    return pickle.loads(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def main() -> None:
+    nodes = 2**(DEPTH + 1) - 1
+    tree = balanced(DEPTH)
+    tuples = balancedTuples(DEPTH)
+
+    leaves = [Tree.LEAF(i) for i in range(SIZE)]
+    leafTuples = [('LEAF', i) for i in range(SIZE)]
+
+    sizes: Dict[str, float] = {
+        'tree (ADT values)':
+        len(pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)) / nodes,
+        'tree (tuples)':
+        len(pickle.dumps(tuples, protocol=pickle.HIGHEST_PROTOCOL)) / nodes,
+        'list of leaves (ADT values)':
+        len(pickle.dumps(leaves, protocol=pickle.HIGHEST_PROTOCOL)) / SIZE,
+        'list of leaves (tuples)':
+        len(pickle.dumps(leafTuples, protocol=pickle.HIGHEST_PROTOCOL)) / SIZE,
+    }
+    report('Pickled size (highest protocol), per node', sizes, unit='bytes')
+
+    results: Dict[str, float] = {
+        'tree (ADT values)':
+        measure(lambda: _roundTrip(tree), number=1, repeat=3) / nodes,
+        'tree (tuples)':
+        measure(lambda: _roundTrip(tuples), number=1, repeat=3) / nodes,
+        'list of leaves (ADT values)':
+        measure(lambda: _roundTrip(leaves), number=1, repeat=3) / SIZE,
+        'list of leaves (tuples)':
+        measure(lambda: _roundTrip(leafTuples), number=1, repeat=3) / SIZE,
+    }
+    report(
+        f'Pickle round trip of a {nodes}-node tree, or {SIZE} leaves, per node',
+        results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+import os
+import pickle
+import random
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from adt import ADTStore, ADTStoreWriter, Case, adt
+from adt.store import LazyValue
+from benchmarks.helpers import measure, report
+
+# How many values are stored, like the rules of a large rule set.
+COUNT = int(os.getenv('ADT_BENCHMARK_COUNT', default='100000'))
+
+
+@adt
+class Expression:
+    FIELD: Case[str]
+    CONSTANT: Case[int]
+    EQUALS: Case["Expression", "Expression"]
+    AND: Case["Expression", "Expression"]
+    NOT: Case["Expression"]
+
+
+@adt
+class Rule:
+    RULE: Case[str, "Expression", int]
+    TREE: Case[Expression]
+
+
+def _rule(i: int) -> Rule:
+    condition = Expression.AND(
+        Expression.EQUALS(Expression.FIELD('country'),
+                          Expression.CONSTANT(i % 200)),
+        Expression.NOT(
+            Expression.EQUALS(Expression.FIELD('score'),
+                              Expression.CONSTANT(i))))
+    return Rule.RULE(f'rule-{i}', condition, i % 10)
+
+
+def _balanced(depth: int) -> Expression:
+    if depth == 0:
+        return Expression.CONSTANT(depth)
+
+    return Expression.AND(_balanced(depth - 1), _balanced(depth - 1))
+
+
+# Returns the number of bytes allocated by `fn` which are still in use once it
+# returns, along with its result.
+def _retained(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        result = fn()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return retained
+
+
+def _loadPickle(path: str) -> List[Rule]:
+    with open(path, 'rb') as file:
+        rules: List[Rule] = pickle.load(file)
+        return rules
+
+
+# Follows the leftmost branch of a lazy tree, down to a leaf.
+def _leftmostLeaf(value: LazyValue) -> LazyValue:
+    while value.case == 'AND':
+        value = value.fields()[0]
+
+    return value
+
+
+def main() -> None:
+    rules = [_rule(i) for i in range(COUNT)]
+    tree = Rule.TREE(_balanced(16))
+
+    with tempfile.TemporaryDirectory() as directory:
+        picklePath = os.path.join(directory, 'rules.pickle')
+        storePath = os.path.join(directory, 'rules.adts')
+
+        with open(picklePath, 'wb') as file:
+            pickle.dump(rules, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with open(storePath, 'wb') as file, ADTStoreWriter(Rule,
+                                                           file) as writer:
+            writer.extend(rules)
+            writer.append(tree)
+
+        report(f'File size of {COUNT} rules', {
+            'pickle (highest protocol)': os.path.getsize(picklePath),
+            'ADTStore': os.path.getsize(storePath),
+        },
+               unit='bytes')
+
+        store = ADTStore(Rule, storePath)
+        indices = [random.randrange(COUNT) for _ in range(1000)]
+        results: Dict[str, float] = {
+            'pickle.load (all rules)':
+            measure(lambda: _loadPickle(picklePath), number=1, repeat=3),
+            'ADTStore() (open)':
+            measure(lambda: ADTStore(Rule, storePath).close()),
+            'ADTStore[i] (1000 random rules)':
+            measure(lambda: [store[i] for i in indices]),
+            'list(ADTStore) (all rules)':
+            measure(lambda: list(store), number=1, repeat=3),
+        }
+        report(f'Loading {COUNT} rules', results)
+
+        report(f'Memory retained after loading {COUNT} rules', {
+            'pickle.load': _retained(lambda: _loadPickle(picklePath)),
+            'ADTStore()': _retained(lambda: ADTStore(Rule, storePath)),
+        },
+               unit='bytes')
+
+        nodes = 2**17 - 1
+        report(
+            f'Reaching one leaf of a tree of {nodes} nodes', {
+                'ADTStore[i] (decoding all of it)':
+                measure(lambda: store[-1], number=1, repeat=3),
+                'ADTStore.lazy(i) (decoding one path)':
+                measure(lambda: _leftmostLeaf(store.lazy(-1).fields()[0])),
+            })
+
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import threading
+from typing import Callable, Dict, List
+
+from adt import Case, adt
+from benchmarks.helpers import measure, report
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+
+
+def _area(shape: Shape) -> float:
+    return shape.match(point=lambda: 0.0,
+                       circle=lambda r: 3.14 * r * r,
+                       rectangle=lambda w, h: w * h)
+
+
+# Constructs and matches this many values in each thread.
+_OPERATIONS = 20000
+
+
+def _work() -> None:
+    for i in range(_OPERATIONS // 2):
+        _area(Shape.CIRCLE(1.0))
+        _area(Shape.RECTANGLE(1.0, 2.0))
+
+
+# Runs `work` in `count` threads at once, and waits for them all to finish.
+def _inThreads(work: Callable[[], None], count: int) -> None:
+    threads = [threading.Thread(target=work) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+
+def main() -> None:
+    maxThreads = max(4, os.cpu_count() or 1)
+    counts: List[int] = []
+    count = 1
+    while count < maxThreads:
+        counts.append(count)
+        count *= 2
+
+    counts.append(maxThreads)
+
+    # Without the GIL, threads run at once (given enough cores), so each
+    # operation should take less wall time with more of them.
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    title = f'construction + match, {"with" if gil else "without"} the GIL'
+
+    perOperation: Dict[str, float] = {}
+    for count in counts:
+        elapsed = measure(lambda: _inThreads(_work, count), number=1)
+        name = f'{count} thread{"s" if count > 1 else ""}'
+        perOperation[name] = elapsed / (count * _OPERATIONS)
+
+    single = perOperation['1 thread']
+    report(f'Wall time per operation ({title})', perOperation)
+    report(f'Speedup over 1 thread ({title})',
+           {name: single / ns
+            for name, ns in perOperation.items()},
+           unit='x')
+
+
+if __name__ == '__main__':
+    main()
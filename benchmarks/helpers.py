@@ -0,0 +1,63 @@
+import json
+import os
+import platform
+import sys
+import timeit
+from typing import Any, Callable, Dict, Optional
+
+# Roughly how long each measurement should run for. Override with the
+# ADT_BENCHMARK_SECONDS environment variable for quicker (or steadier) runs.
+TARGET_SECONDS = float(os.getenv('ADT_BENCHMARK_SECONDS', default='0.2'))
+REPEAT = 5
+
+# If set, the path of a JSON file to which every report is also added, for
+# comparison across versions. Results are merged into any existing file,
+# grouped by the name of the benchmark module reporting them.
+JSON_PATH = os.getenv('ADT_BENCHMARK_JSON')
+
+
+def measure(fn: Callable[[], Any],
+            number: Optional[int] = None,
+            repeat: int = REPEAT) -> float:
+    """Returns the best observed time per call to `fn`, in nanoseconds."""
+    timer = timeit.Timer(fn)
+    if number is None:
+        number, elapsed = timer.autorange()
+        number = max(1, int(number * TARGET_SECONDS / max(elapsed, 1e-9)))
+
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e9
+
+
+def report(title: str, results: Dict[str, float], unit: str = 'ns') -> None:
+    print(title)
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f'  {name.ljust(width)}  {value:12.1f} {unit}')
+
+    if JSON_PATH:
+        _save(title, results, unit)
+
+
+def _save(title: str, results: Dict[str, float], unit: str) -> None:
+    assert JSON_PATH
+    try:
+        with open(JSON_PATH) as file:
+            saved = json.load(file)
+    except FileNotFoundError:
+        saved = {
+            'python': sys.version,
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'benchmarks': {},
+        }
+
+    module = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    saved['benchmarks'].setdefault(module, {})[title] = {
+        'unit': unit,
+        'results': results,
+    }
+
+    with open(JSON_PATH, 'w') as file:
+        json.dump(saved, file, indent=2)
+        file.write('\n')
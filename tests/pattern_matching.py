@@ -0,0 +1,80 @@
+# `match` statements upon ADT values, which are a syntax error before Python
+# 3.10, so this module is only imported (by test_pattern_matching.py) where
+# they are supported.
+from typing import Optional, Tuple
+
+from adt import Case, adt
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+class DerivedTree(Tree):
+    pass
+
+
+@adt(slots=True, frozen=True)
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+
+
+@adt(slots=True, frozen=True)
+class Expression:
+    LITERAL: Case[("value", int), ]
+    ADD: Case[("lhs", "Expression"), ("rhs", "Expression")]
+
+
+def total(tree: Tree) -> int:
+    match tree:
+        case Tree.EMPTY():
+            return 0
+        case Tree.LEAF(n):
+            return n
+        case Tree.NODE(left, right):
+            return total(left) + total(right)
+        case _:
+            raise ValueError(f'Unexpected tree: {tree}')
+
+
+def leafPair(tree: Tree) -> Optional[Tuple[int, int]]:
+    match tree:
+        case Tree.NODE(Tree.LEAF(a), Tree.LEAF(b)):
+            return (a, b)
+        case _:
+            return None
+
+
+def area(shape: Shape) -> float:
+    match shape:
+        case Shape.POINT():
+            return 0.0
+        case Shape.CIRCLE(r):
+            return 3.14 * r * r
+        case Shape.RECTANGLE(_1=h, _0=w):
+            return w * h
+        case _:
+            raise ValueError(f'Unexpected shape: {shape}')
+
+
+def isDerived(tree: Tree) -> bool:
+    match tree:
+        case DerivedTree():
+            return True
+        case _:
+            return False
+
+
+def evaluate(expression: Expression) -> int:
+    match expression:
+        case Expression.LITERAL(value):
+            return value
+        case Expression.ADD(rhs=rhs, lhs=lhs):
+            return evaluate(lhs) + evaluate(rhs)
+        case _:
+            raise ValueError(f'Unexpected expression: {expression}')
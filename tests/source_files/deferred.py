@@ -0,0 +1,29 @@
+from adt import adt, Case
+
+
+@adt
+class Shape:
+    CIRCLE: Case[float]
+    SQUARE: Case[float, "Unit"]
+
+    def area(self) -> float:
+        return self.match(circle=lambda r: 3.14 * r * r,
+                          square=lambda side, unit: side * side)
+
+
+# Referring to a class before its definition defers analysis of the module,
+# so the @adt hook runs more than once.
+class Metres(Unit):
+    pass
+
+
+class Unit:
+    pass
+
+
+def perimeter(shape: Shape) -> float:
+    return shape.match(circle=lambda r: 2 * 3.14 * r,
+                       square=lambda side, unit: 4 * side)
+
+
+square: Shape = Shape.SQUARE(1.0, Metres())
@@ -0,0 +1,22 @@
+from typing import Optional, Union
+from adt import adt, Case
+
+
+@adt
+class Expression:
+    LITERAL: Case[("value", int), ]
+    ADD: Case[("lhs", "Expression"), ("rhs", "Expression")]
+    NEGATE: Case[("value", "Expression"), ]
+
+    def evaluate(self) -> int:
+        return self.match(literal=lambda value: value,
+                          add=lambda lhs, rhs: lhs.evaluate() + rhs.evaluate(),
+                          negate=lambda value: -value.evaluate())
+
+
+expression = Expression.ADD(lhs=Expression.LITERAL(1),
+                            rhs=Expression.NEGATE(value=Expression.LITERAL(2)))
+lhs: Expression = expression.lhs
+value: Union[int, Expression] = expression.value
+total: int = expression.evaluate()
+literal: int = Expression.LITERAL(1).literal()
@@ -0,0 +1,31 @@
+from typing import List
+
+from adt import Case, adt
+
+
+# Cases named like the options of generated methods.
+@adt
+class Job:
+    SINGLE: Case[str]
+    BATCH: Case[List[str]]
+
+
+def sizes(jobs: List[Job]) -> List[int]:
+    return list(
+        Job.match_many(jobs,
+                       _batch=True,
+                       single=lambda name: 1,
+                       batch=lambda names: len(names)))
+
+
+@adt
+class Cache:
+    EMPTY: Case
+    MEMOIZE: Case[str, "Cache"]
+
+
+def keys(cache: Cache) -> str:
+    return Cache.fold(cache,
+                      _memoize=True,
+                      empty=lambda: '',
+                      memoize=lambda key, rest: key + rest)
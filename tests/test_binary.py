@@ -0,0 +1,150 @@
+import io
+import unittest
+from typing import Any, Dict, List, Optional, Tuple
+
+from adt import Case, adt, binary
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+class DerivedTree(Tree):
+    pass
+
+
+@adt
+class Payload:
+    ANYTHING: Case[Any]
+    TEXT: Case[str, bytes]
+    NUMBERS: Case[int, float, bool]
+    CONTAINERS: Case[Tuple[int, ...], List[Any], Dict[str, Any]]
+    TREES: Case[List[Tree], Optional["Payload"]]
+
+
+@adt(slots=True, frozen=True)
+class FrozenList:
+    NIL: Case
+    CONS: Case[int, "FrozenList"]
+
+
+def roundTrip(value: Payload) -> Payload:
+    return Payload.from_bytes(value.to_bytes())
+
+
+class TestBinary(unittest.TestCase):
+    def test_roundTripsFieldTypes(self) -> None:
+        values = [
+            Payload.ANYTHING(None),
+            Payload.TEXT('héllo, wörld', b'\x00\xff'),
+            Payload.NUMBERS(-(2**100), -0.5, True),
+            Payload.NUMBERS(0, float('inf'), False),
+            Payload.CONTAINERS((1, 2, 3), [None, [], ()], {
+                'a': {},
+                'b': [1.5]
+            }),
+            Payload.TREES(
+                [Tree.NODE(Tree.LEAF(1), Tree.EMPTY())],
+                Payload.TREES([], None),
+            ),
+        ]
+
+        for value in values:
+            self.assertEqual(roundTrip(value), value)
+
+    def test_subclassesRoundTrip(self) -> None:
+        codec = binary.codecFor(DerivedTree)
+        value = DerivedTree.NODE(
+            DerivedTree.LEAF(1),
+            DerivedTree.NODE(DerivedTree.EMPTY(), Tree.LEAF(2)))
+
+        decoded = codec.decode(codec.encode(value))
+        self.assertEqual(decoded, value)
+        self.assertIsInstance(decoded, DerivedTree)
+
+        left, right = decoded.node()
+        self.assertIsInstance(left, DerivedTree)
+
+        # Values of the base class keep their own class.
+        self.assertNotIsInstance(right.node()[1], DerivedTree)
+
+    def test_subclassesUseTheirOwnCodec(self) -> None:
+        value = DerivedTree.NODE(DerivedTree.LEAF(1), DerivedTree.EMPTY())
+        decoded = DerivedTree.from_bytes(value.to_bytes())
+        self.assertEqual(decoded, value)
+        self.assertIsInstance(decoded, DerivedTree)
+
+        file = io.BytesIO()
+        DerivedTree.dump_iter([value, DerivedTree.LEAF(2)], file)
+
+        file.seek(0)
+        for loaded in DerivedTree.load_iter(file):
+            self.assertIsInstance(loaded, DerivedTree)
+
+        # Base values aren't values of the subclass.
+        with self.assertRaises(TypeError):
+            DerivedTree.dump_iter([Tree.LEAF(1)], io.BytesIO())
+
+    def test_typesArePreservedExactly(self) -> None:
+        value = Payload.NUMBERS(True, 1, False)
+        decoded = roundTrip(value).numbers()
+        self.assertIs(decoded[0], True)
+        self.assertIs(type(decoded[1]), int)
+
+    def test_nullaryCasesDecodeToSharedInstance(self) -> None:
+        self.assertIs(Tree.from_bytes(Tree.EMPTY().to_bytes()), Tree.EMPTY())
+
+    def test_encodingIsCompact(self) -> None:
+        # One byte for the class and case, plus one for each small int.
+        self.assertEqual(len(Tree.LEAF(5).to_bytes()), 4)
+        self.assertEqual(len(Tree.EMPTY().to_bytes()), 2)
+
+    def test_deepValues(self) -> None:
+        xs = FrozenList.NIL()
+        for i in range(10**5):
+            xs = FrozenList.CONS(i, xs)
+
+        self.assertEqual(FrozenList.from_bytes(xs.to_bytes()), xs)
+
+    def test_streaming(self) -> None:
+        trees = [
+            Tree.LEAF(i) if i % 3 else Tree.NODE(Tree.LEAF(i), Tree.EMPTY())
+            for i in range(100)
+        ]
+
+        file = io.BytesIO()
+        Tree.dump_iter(iter(trees), file)
+
+        file.seek(0)
+        loaded = Tree.load_iter(file)
+        self.assertEqual(next(loaded), trees[0])
+        self.assertEqual(list(loaded), trees[1:])
+
+    def test_truncatedStream(self) -> None:
+        file = io.BytesIO()
+        Tree.dump_iter([Tree.LEAF(1), Tree.LEAF(2)], file)
+
+        truncated = io.BytesIO(file.getvalue()[:-1])
+        with self.assertRaises(ValueError):
+            list(Tree.load_iter(truncated))
+
+    def test_unsupportedValuesRaise(self) -> None:
+        with self.assertRaises(TypeError):
+            Payload.ANYTHING({1, 2}).to_bytes()
+
+        with self.assertRaises(TypeError):
+            Payload.ANYTHING(FrozenList.NIL()).to_bytes()
+
+    def test_invalidDataRaises(self) -> None:
+        data = Payload.TEXT('text', b'bytes').to_bytes()
+
+        for invalid in (data[:-1], data + b'\x00', b'', b'\xff\x00', b'\x0f'):
+            with self.assertRaises(ValueError):
+                Payload.from_bytes(invalid)
+
+        # Valid, but not a Tree.
+        with self.assertRaises(ValueError):
+            Tree.from_bytes(data)
@@ -0,0 +1,121 @@
+import copy
+import pickle
+import unittest
+from array import array
+from typing import List
+
+from adt import ADTArray, Case, adt
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+    LABEL: Case[str]
+    POLYGON: Case[int, float]
+
+
+def shapes() -> List[Shape]:
+    return [
+        Shape.CIRCLE(1.0),
+        Shape.POINT(),
+        Shape.RECTANGLE(2.0, 3.0),
+        Shape.LABEL('origin'),
+        Shape.CIRCLE(2.5),
+        Shape.POLYGON(6, 1.5),
+    ]
+
+
+class TestColumnar(unittest.TestCase):
+    def test_roundTrip(self) -> None:
+        values = ADTArray(Shape, shapes())
+        self.assertEqual(len(values), 6)
+        self.assertEqual(values.tolist(), shapes())
+        self.assertEqual(list(values), shapes())
+
+    def test_indexing(self) -> None:
+        values = ADTArray(Shape, shapes())
+        self.assertEqual(values[0], Shape.CIRCLE(1.0))
+        self.assertEqual(values[-1], Shape.POLYGON(6, 1.5))
+        self.assertIs(values[1], Shape.POINT())
+
+        with self.assertRaises(IndexError):
+            values[6]
+
+    def test_slicing(self) -> None:
+        values = ADTArray(Shape, shapes())
+        self.assertEqual(values[1:4].tolist(), shapes()[1:4])
+        self.assertEqual(values[::-2].tolist(), shapes()[::-2])
+        self.assertEqual(values[::2].counts()['CIRCLE'], 2)
+
+    def test_appendAndExtend(self) -> None:
+        values = ADTArray(Shape)
+        values.append(Shape.LABEL('first'))
+        values.extend(shapes())
+        values.extend(values)
+        self.assertEqual(values.tolist(),
+                         ([Shape.LABEL('first')] + shapes()) * 2)
+
+        with self.assertRaises(TypeError):
+            values.append('not a shape')  # type: ignore
+
+    def test_countsAndSelect(self) -> None:
+        values = ADTArray(Shape, shapes())
+        self.assertEqual(values.counts(), {
+            'POINT': 1,
+            'CIRCLE': 2,
+            'RECTANGLE': 1,
+            'LABEL': 1,
+            'POLYGON': 1,
+        })
+
+        circles = values.select('circle')
+        self.assertEqual(
+            circles.tolist(),
+            [Shape.CIRCLE(1.0), Shape.CIRCLE(2.5)])
+        self.assertEqual(circles.counts()['CIRCLE'], 2)
+        self.assertEqual(values.select('POINT').tolist(), [Shape.POINT()])
+
+        circles.append(Shape.POINT())
+        self.assertEqual(values.counts()['POINT'], 1)
+
+        with self.assertRaises(ValueError):
+            values.select('triangle')
+
+    def test_numericFieldsAreStoredNatively(self) -> None:
+        values = ADTArray(Shape, shapes())
+        self.assertEqual(values.columns('circle'), (array('d', [1.0, 2.5]), ))
+
+        sides, = values.columns('polygon')[:1]
+        self.assertIsInstance(sides, array)
+        self.assertEqual(values.columns('label'), (['origin'], ))
+
+    def test_valuesAreNeverChanged(self) -> None:
+        # Values which can't be represented exactly in a native column are
+        # still stored, and returned unchanged.
+        unusual = [
+            Shape.POLYGON(2**70, 1.0),
+            Shape.POLYGON(True, 1.0),
+            Shape.CIRCLE(1),
+        ]
+        values = ADTArray(Shape, shapes() + unusual)
+        self.assertEqual(values.tolist(), shapes() + unusual)
+        self.assertIs(values[-2].polygon()[0], True)
+        self.assertIs(type(values[-1].circle()), int)
+
+    def test_equalityAndRepr(self) -> None:
+        self.assertEqual(ADTArray(Shape, shapes()), ADTArray(Shape, shapes()))
+        self.assertNotEqual(ADTArray(Shape, shapes()), ADTArray(Shape))
+        self.assertEqual(repr(ADTArray(Shape, [Shape.POINT()])),
+                         f'ADTArray(Shape, [{Shape.POINT()!r}])')
+
+    def test_pickleAndCopy(self) -> None:
+        values = ADTArray(Shape, shapes())
+        for copied in [
+                pickle.loads(pickle.dumps(values)),
+                copy.deepcopy(values)
+        ]:
+            self.assertEqual(copied, values)
+            copied.append(Shape.POINT())
+            self.assertEqual(copied.counts()['POINT'], 2)
@@ -0,0 +1,147 @@
+import pickle
+import sys
+import unittest
+from typing import Any, List
+
+from adt import Case, adt
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+
+
+class DerivedShape(Shape):
+    pass
+
+
+initialized: List[str] = []
+
+
+@adt
+class CustomInit:
+    FIRST: Case
+    SECOND: Case[str]
+
+    def __init__(self) -> None:
+        initialized.append(
+            self.match(first=lambda: 'FIRST', second=lambda s: s))
+
+
+registered: List[str] = []
+
+
+@adt
+class Registered:
+    A: Case
+    B: Case[int]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)  # type: ignore
+        registered.append(cls.__qualname__)
+
+
+class RegisteredChild(Registered):
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        registered.append('child of ' + cls.__qualname__)
+
+
+class RegisteredGrandchild(RegisteredChild):
+    pass
+
+
+class TestConstructors(unittest.TestCase):
+    def test_wrongNumberOfArgumentsRaises(self) -> None:
+        with self.assertRaises(TypeError):
+            Shape.POINT(1.0)  # type: ignore
+
+        with self.assertRaises(TypeError):
+            Shape.CIRCLE()  # type: ignore
+
+        with self.assertRaises(TypeError):
+            Shape.RECTANGLE(1.0)  # type: ignore
+
+        with self.assertRaises(TypeError):
+            Shape.RECTANGLE(1.0, 2.0, 3.0)  # type: ignore
+
+    @unittest.skipIf(sys.version_info < (3, 10),
+                     'argument errors only name functions in Python 3.10+')
+    def test_wrongArgumentsNameTheCase(self) -> None:
+        with self.assertRaisesRegex(TypeError, r'^Shape\.RECTANGLE\(\)'):
+            Shape.RECTANGLE(1.0)  # type: ignore
+
+        with self.assertRaisesRegex(TypeError, r'^Shape\.CIRCLE\(\)'):
+            Shape.CIRCLE(radius=1.0)  # type: ignore
+
+    def test_constructorsAreNamedAfterCases(self) -> None:
+        self.assertEqual(Shape.RECTANGLE.__name__, 'RECTANGLE')
+        self.assertEqual(Shape.RECTANGLE.__qualname__, 'Shape.RECTANGLE')
+
+    def test_constructorsProduceInstancesOfTheClass(self) -> None:
+        self.assertIsInstance(Shape.POINT(), Shape)
+        self.assertIsInstance(Shape.CIRCLE(1.0), Shape)
+        self.assertEqual(Shape.RECTANGLE(1.0, 2.0).rectangle(), (1.0, 2.0))
+
+    def test_customInitIsCalledAfterConstruction(self) -> None:
+        # The shared FIRST instance was initialized at decoration time.
+        self.assertEqual(initialized[0], 'FIRST')
+
+        del initialized[:]
+        CustomInit.FIRST()
+        CustomInit.SECOND('foobar')
+        self.assertEqual(initialized, ['foobar'])
+
+    def test_casesAreSubclassesOfTheClass(self) -> None:
+        cases: Any = Shape
+        self.assertTrue(issubclass(cases.CIRCLE, Shape))
+        self.assertIsInstance(Shape.CIRCLE(1.0), cases.CIRCLE)
+        self.assertNotIsInstance(Shape.CIRCLE(1.0), cases.RECTANGLE)
+        self.assertNotIsInstance(Shape.POINT(), cases.CIRCLE)
+
+    def test_matchArgsNameTheAssociatedData(self) -> None:
+        cases: Any = Shape
+        self.assertEqual(cases.POINT.__match_args__, ())
+        self.assertEqual(cases.CIRCLE.__match_args__, ('_value', ))
+        self.assertEqual(cases.RECTANGLE.__match_args__, ('_0', '_1'))
+
+        rectangle: Any = Shape.RECTANGLE(1.0, 2.0)
+        self.assertEqual((rectangle._0, rectangle._1), (1.0, 2.0))
+        with self.assertRaises(AttributeError):
+            rectangle._0 = 3.0
+
+    def test_classCannotBeInstantiatedDirectly(self) -> None:
+        with self.assertRaises(TypeError):
+            Shape()
+
+    def test_descendantsHaveTheirOwnCases(self) -> None:
+        cases: Any = Shape
+        derivedCases: Any = DerivedShape
+        rectangle = DerivedShape.RECTANGLE(1.0, 2.0)
+        self.assertIsInstance(rectangle, DerivedShape)
+        self.assertIsInstance(rectangle, cases.RECTANGLE)
+        self.assertIsInstance(rectangle, derivedCases.RECTANGLE)
+        self.assertEqual(derivedCases.RECTANGLE.__qualname__,
+                         'DerivedShape.RECTANGLE')
+        self.assertEqual(rectangle, Shape.RECTANGLE(1.0, 2.0))
+        self.assertEqual(repr(rectangle),
+                         f'{DerivedShape}.RECTANGLE((1.0, 2.0))')
+        self.assertEqual(pickle.loads(pickle.dumps(rectangle)), rectangle)
+        self.assertIsInstance(pickle.loads(pickle.dumps(rectangle)),
+                              DerivedShape)
+
+    def test_valuesAreReprByTheirClass(self) -> None:
+        self.assertEqual(repr(Shape.CIRCLE(1.0)), f'{Shape}.CIRCLE(1.0)')
+        self.assertEqual(str(Shape.POINT()), f'<{Shape}.POINT: None>')
+
+    def test_customInitSubclassSkipsCaseClasses(self) -> None:
+        self.assertEqual(registered, [
+            'RegisteredChild', 'RegisteredGrandchild',
+            'child of RegisteredGrandchild'
+        ])
+
+        grandchild = RegisteredGrandchild.B(1)
+        self.assertIsInstance(grandchild, RegisteredGrandchild)
+        self.assertEqual(grandchild, Registered.B(1))
@@ -0,0 +1,192 @@
+import asyncio
+import io
+import unittest
+from typing import Iterable, List
+
+from adt import Case, adt
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[str]
+    NODE: Case["Tree", "Tree"]
+
+
+class DerivedTree(Tree):
+    pass
+
+
+@adt
+class Other:
+    VALUE: Case[int]
+
+
+def encoded(values: Iterable[Tree]) -> bytes:
+    file = io.BytesIO()
+    Tree.dump_iter(values, file)
+    return file.getvalue()
+
+
+def trees() -> List[Tree]:
+    deep = Tree.LEAF('leaf')
+    for _ in range(1000):
+        deep = Tree.NODE(deep, Tree.EMPTY())
+
+    return [
+        Tree.EMPTY(),
+        Tree.LEAF('héllo'),
+        deep,
+        Tree.NODE(Tree.LEAF('x' * 100000), Tree.LEAF('')),
+    ]
+
+
+# Returns a reader which is given `data` in pieces of `size` bytes, from
+# another task, as if from a pipe.
+def pipe(data: bytes, size: int) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+
+    async def write() -> None:
+        for i in range(0, len(data), size):
+            reader.feed_data(data[i:i + size])
+            await asyncio.sleep(0)
+
+        reader.feed_eof()
+
+    asyncio.ensure_future(write())
+    return reader
+
+
+async def decodeAll(reader: asyncio.StreamReader,
+                    chunk_size: int = 65536,
+                    max_size: int = 2**26) -> List[Tree]:
+    return [
+        value async for value in Tree.decode_stream(
+            reader, chunk_size=chunk_size, max_size=max_size)
+    ]
+
+
+class TestDecodeStream(unittest.TestCase):
+    def test_decodesFromPipe(self) -> None:
+        data = encoded(trees())
+        for pieceSize, chunkSize in [(len(data), 65536), (1, 1), (7, 3),
+                                     (1000, 64)]:
+            with self.subTest(pieceSize=pieceSize, chunkSize=chunkSize):
+
+                async def test() -> List[Tree]:
+                    return await decodeAll(pipe(data, pieceSize), chunkSize)
+
+                self.assertEqual(asyncio.run(test()), trees())
+
+    def test_decodesFromServer(self) -> None:
+        data = encoded(trees())
+
+        async def test() -> List[List[Tree]]:
+            async def send(reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+                writer.write(data)
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(send, '127.0.0.1', 0)
+            assert server.sockets is not None
+            port = server.sockets[0].getsockname()[1]
+
+            async def receive() -> List[Tree]:
+                reader, writer = await asyncio.open_connection(
+                    '127.0.0.1', port)
+                try:
+                    return await decodeAll(reader, chunk_size=4096)
+                finally:
+                    writer.close()
+
+            try:
+                return list(await
+                            asyncio.gather(*(receive() for _ in range(4))))
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        self.assertEqual(asyncio.run(test()), [trees()] * 4)
+
+    def test_yieldsToTheEventLoop(self) -> None:
+        data = encoded([Tree.LEAF(str(i)) for i in range(20000)])
+
+        async def test() -> int:
+            ticks = 0
+            done = False
+
+            async def tick() -> None:
+                nonlocal ticks
+                while not done:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            ticker = asyncio.ensure_future(tick())
+            await asyncio.sleep(0)
+
+            # All the data is available at once, so the reader never has to
+            # wait for it.
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+
+            ticksBefore = ticks
+            async for _ in Tree.decode_stream(reader, chunk_size=1024):
+                pass
+
+            done = True
+            await ticker
+            return ticks - ticksBefore
+
+        self.assertGreater(asyncio.run(test()), 10)
+
+    def test_decodesSubclasses(self) -> None:
+        file = io.BytesIO()
+        values = [
+            DerivedTree.LEAF('leaf'),
+            DerivedTree.NODE(DerivedTree.EMPTY(), DerivedTree.LEAF(''))
+        ]
+        DerivedTree.dump_iter(values, file)
+
+        async def test() -> List[Tree]:
+            return [
+                value async for value in DerivedTree.decode_stream(
+                    pipe(file.getvalue(), 3))
+            ]
+
+        decoded = asyncio.run(test())
+        self.assertEqual(decoded, values)
+        for value in decoded:
+            self.assertIsInstance(value, DerivedTree)
+
+    def test_invalidStreamsRaise(self) -> None:
+        data = encoded(trees())
+        otherFile = io.BytesIO()
+        Other.dump_iter([Other.VALUE(1)], otherFile)
+
+        invalid = [
+            data[:-1],
+            data[:1],
+            b'\x00',
+            b'\xff' * 11,
+            b'\x03\x81\x00\x00',
+            otherFile.getvalue(),
+        ]
+        for stream in invalid:
+            with self.subTest(stream=stream[:20]):
+
+                async def test() -> List[Tree]:
+                    return await decodeAll(pipe(stream, 2))
+
+                with self.assertRaises(ValueError):
+                    asyncio.run(test())
+
+    def test_largeValuesRaiseBeforeBeingRead(self) -> None:
+        async def test() -> None:
+            reader = asyncio.StreamReader()
+            reader.feed_data(encoded([Tree.LEAF('x' * 1000)])[:3])
+            await decodeAll(reader, max_size=100)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(test())
@@ -0,0 +1,104 @@
+import unittest
+from typing import Generic, TypeVar
+
+from adt import Case, adt
+
+_T = TypeVar('_T')
+
+
+@adt
+class ListADT(Generic[_T]):
+    NIL: Case
+    CONS: Case[_T, "ListADT[_T]"]
+
+
+@adt(frozen=True)
+class FrozenList(Generic[_T]):
+    NIL: Case
+    CONS: Case[_T, "FrozenList[_T]"]
+
+
+@adt
+class Nested:
+    LEAF: Case[int]
+    WRAP: Case["Nested"]
+    PAIR: Case[int, "Nested"]
+
+
+def longList(length: int, last: int = 0) -> ListADT[int]:
+    xs: ListADT[int] = ListADT.CONS(last, ListADT.NIL())
+    for i in range(length - 1):
+        xs = ListADT.CONS(i, xs)
+
+    return xs
+
+
+def longFrozenList(length: int) -> FrozenList[int]:
+    xs: FrozenList[int] = FrozenList.NIL()
+    for i in range(length):
+        xs = FrozenList.CONS(i, xs)
+
+    return xs
+
+
+def deeplyNested(depth: int) -> Nested:
+    value = Nested.LEAF(0)
+    for i in range(depth):
+        if i % 2:
+            value = Nested.WRAP(value)
+        else:
+            value = Nested.PAIR(i, value)
+
+    return value
+
+
+class TestDeep(unittest.TestCase):
+    def test_equality(self) -> None:
+        self.assertEqual(longList(10**6), longList(10**6))
+        self.assertNotEqual(longList(10**5), longList(10**5, last=1))
+        self.assertNotEqual(longList(10**5), longList(10**5 - 1))
+
+    def test_hash(self) -> None:
+        self.assertEqual(hash(longList(10**5)), hash(longList(10**5)))
+
+        self.assertEqual(hash(deeplyNested(10**5)), hash(deeplyNested(10**5)))
+
+    def test_hashMatchesShallowValues(self) -> None:
+        # Deep values are hashed differently, but must agree with the usual
+        # hashing of their nested values.
+        xs = longList(10**5)
+        tail = xs
+        for _ in range(10**5 - 10):
+            (_, tail) = tail.cons()
+
+        self.assertEqual(hash(tail), hash(longList(10)))
+
+    def test_frozen(self) -> None:
+        xs = longFrozenList(10**5)
+        ys = longFrozenList(10**5)
+        self.assertEqual(hash(xs), hash(ys))
+        self.assertEqual(xs, ys)
+        self.assertIn(ys, {xs})
+        self.assertNotEqual(xs, FrozenList.CONS(-1, ys))
+
+    def test_nestedCaseTypes(self) -> None:
+        self.assertEqual(deeplyNested(10**5), deeplyNested(10**5))
+        self.assertNotEqual(deeplyNested(10**5), deeplyNested(10**5 + 1))
+
+    def test_reprAndStr(self) -> None:
+        length = 10**5
+        deep = longList(length)
+
+        # CONS values nest their tuples' reprs, one inside the next.
+        prefix = ''.join(f'{ListADT}.CONS(({i}, '
+                         for i in reversed(range(length - 1)))
+        inner: ListADT[int] = ListADT.CONS(0, ListADT.NIL())
+        self.assertEqual(repr(deep),
+                         prefix + repr(inner) + '))' * (length - 1))
+
+        self.assertTrue(
+            str(deep).startswith(f'<{ListADT}.CONS: ({length - 2}, '))
+        self.assertTrue(
+            str(deep).endswith(repr(inner) + '))' * (length - 2) + ')>'))
+
+        self.assertEqual(repr(deeplyNested(10**5)).count('LEAF'), 1)
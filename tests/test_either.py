@@ -89,3 +89,16 @@ class TestEither(unittest.TestCase):
             self.assertEqual(
                 e.left(),
                 e.match(left=lambda x: x, right=helpers.invalidPatternMatch))
+
+    def test_matchAcceptsUppercaseCaseNames(self) -> None:
+        e: Either[int, str] = Either.LEFT(5)
+        self.assertEqual(
+            e.match(LEFT=lambda n: n + 1,
+                    RIGHT=helpers.invalidPatternMatch),  # type: ignore
+            6)
+
+    def test_matchRejectsUnrecognizedCases(self) -> None:
+        e: Either[int, str] = Either.LEFT(5)
+        with self.assertRaises(ValueError):
+            e.match(left=lambda n: n, right=lambda s: s,
+                    middle=lambda x: x)  # type: ignore
@@ -0,0 +1,161 @@
+import unittest
+from typing import Generic, List, Tuple, TypeVar
+
+from adt import Case, adt
+from tests import helpers
+
+_T = TypeVar('_T')
+
+
+@adt
+class Expression:
+    LITERAL: Case[int]
+    NEGATE: Case["Expression"]
+    ADD: Case["Expression", "Expression"]
+    SUM: Case[List["Expression"]]
+
+
+@adt
+class LinkedList(Generic[_T]):
+    NIL: Case
+    CONS: Case[_T, "LinkedList[_T]"]
+
+
+@adt
+class Cache:
+    EMPTY: Case
+    MEMOIZE: Case[str, "Cache"]
+
+
+@adt
+class Tagged:
+    EMPTY: Case
+    TAGGED: Case[str, "Tagged"]
+
+
+def negate(n: int) -> int:
+    return -n
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def total(xs: List[Expression]) -> int:
+    return sum(evaluate(x) for x in xs)
+
+
+def evaluate(e: Expression) -> int:
+    return Expression.fold(e,
+                           literal=lambda n: n,
+                           negate=negate,
+                           add=add,
+                           sum=total)
+
+
+def noTags() -> List[str]:
+    return []
+
+
+def tagNames(tag: str, rest: List[str]) -> List[str]:
+    return [tag] + rest
+
+
+class TestFold(unittest.TestCase):
+    def test_foldsBottomUp(self) -> None:
+        e = Expression.ADD(Expression.LITERAL(1),
+                           Expression.NEGATE(Expression.LITERAL(5)))
+        self.assertEqual(evaluate(e), -4)
+        self.assertEqual(
+            e.fold(e, literal=lambda n: n, negate=negate, add=add, sum=total),
+            -4)
+
+    def test_otherFieldsAreUnchanged(self) -> None:
+        # Only fields of exactly the ADT's type are folded beforehand.
+        e = Expression.SUM([Expression.LITERAL(1), Expression.LITERAL(2)])
+        self.assertEqual(evaluate(e), 3)
+
+        tags = Tagged.TAGGED('a', Tagged.TAGGED('b', Tagged.EMPTY()))
+        self.assertEqual(Tagged.fold(tags, empty=noTags, tagged=tagNames),
+                         ['a', 'b'])
+
+    def test_fieldsAreFoldedInOrder(self) -> None:
+        order: List[int] = []
+
+        def literal(n: int) -> int:
+            order.append(n)
+            return n
+
+        e = Expression.ADD(
+            Expression.ADD(Expression.LITERAL(1), Expression.LITERAL(2)),
+            Expression.LITERAL(3))
+        Expression.fold(e, literal=literal, negate=negate, add=add, sum=total)
+        self.assertEqual(order, [1, 2, 3])
+
+    def test_genericRecursiveField(self) -> None:
+        xs: LinkedList[int] = LinkedList.CONS(
+            1, LinkedList.CONS(2, LinkedList.NIL()))
+        self.assertEqual(
+            LinkedList.fold(xs, nil=lambda: 0, cons=lambda x, acc: x + acc), 3)
+
+    def test_deepValues(self) -> None:
+        xs: LinkedList[int] = LinkedList.NIL()
+        for i in range(10**5):
+            xs = LinkedList.CONS(i, xs)
+
+        self.assertEqual(
+            LinkedList.fold(xs, nil=lambda: 0, cons=lambda x, acc: x + acc),
+            sum(range(10**5)))
+
+    def test_memoizeSharedValues(self) -> None:
+        e = Expression.LITERAL(1)
+        for _ in range(50):
+            e = Expression.ADD(e, e)
+
+        literals: List[int] = []
+
+        def literal(n: int) -> int:
+            literals.append(n)
+            return n
+
+        self.assertEqual(
+            Expression.fold(e,
+                            _memoize=True,
+                            literal=literal,
+                            negate=negate,
+                            add=add,
+                            sum=total), 2**50)
+        self.assertEqual(literals, [1])
+
+    def test_incompleteFoldRaises(self) -> None:
+        with self.assertRaises(ValueError):
+            Expression.fold(  # type: ignore
+                Expression.LITERAL(1),
+                literal=lambda n: n,
+                negate=negate)
+
+        with self.assertRaises(ValueError):
+            LinkedList.fold(  # type: ignore
+                LinkedList.NIL(),
+                nil=helpers.invalidPatternMatch,
+                cons=helpers.invalidPatternMatch,
+                snoc=helpers.invalidPatternMatch)
+
+    def test_tupleResults(self) -> None:
+        # Handler results are never mistaken for pending work.
+        def pair(x: int, rest: Tuple[int, int]) -> Tuple[int, int]:
+            return (x, rest[0] + rest[1])
+
+        xs: LinkedList[int] = LinkedList.CONS(
+            1, LinkedList.CONS(2, LinkedList.NIL()))
+        self.assertEqual(LinkedList.fold(xs, nil=lambda: (0, 0), cons=pair),
+                         (1, 2))
+
+    def test_memoizeCaseHasItsOwnCallback(self) -> None:
+        cache = Cache.MEMOIZE('a', Cache.MEMOIZE('b', Cache.EMPTY()))
+        for memoize in (False, True):
+            self.assertEqual(
+                Cache.fold(cache,
+                           _memoize=memoize,
+                           empty=lambda: '',
+                           memoize=lambda key, rest: key + rest), 'ab')
@@ -0,0 +1,106 @@
+import pickle
+import unittest
+from typing import Any
+
+from adt import Case, adt, set_format_limits
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+def chain(length: int) -> Tree:
+    tree = Tree.EMPTY()
+    for i in range(length):
+        tree = Tree.NODE(Tree.LEAF(i), tree)
+
+    return tree
+
+
+class Unprintable:
+    def __repr__(self) -> str:
+        raise AssertionError('The value was formatted')
+
+
+@adt
+class Wrapper:
+    EMPTY: Case
+    WRAPPED: Case[Unprintable]
+
+
+class TestFormatLimits(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_format_limits()
+
+    def test_valuesAreRenderedInFullByDefault(self) -> None:
+        tree = Tree.NODE(Tree.LEAF(1), Tree.EMPTY())
+        self.assertEqual(repr(tree),
+                         f'{Tree}.NODE(({Tree}.LEAF(1), {Tree}.EMPTY(None)))')
+
+    def test_depthLimit(self) -> None:
+        tree = Tree.NODE(Tree.LEAF(1), Tree.NODE(Tree.LEAF(2), Tree.EMPTY()))
+        set_format_limits(depth=1)
+        self.assertEqual(
+            repr(tree),
+            f'{Tree}.NODE(({Tree}.LEAF(1), {Tree}.NODE((..., ...))))')
+        self.assertEqual(
+            str(tree),
+            f'<{Tree}.NODE: ({Tree}.LEAF(1), {Tree}.NODE((..., ...)))>')
+
+        set_format_limits(depth=0)
+        self.assertEqual(repr(tree), f'{Tree}.NODE((..., ...))')
+
+    def test_lengthLimit(self) -> None:
+        set_format_limits(length=20)
+        self.assertEqual(repr(chain(10**5)), repr(chain(1))[:20] + '...')
+
+        # Shorter values are unaffected.
+        set_format_limits(length=100)
+        self.assertEqual(repr(Tree.LEAF(1)), f'{Tree}.LEAF(1)')
+
+    def test_limitsCanBeRemoved(self) -> None:
+        set_format_limits(depth=0, length=0)
+        set_format_limits()
+        self.assertEqual(repr(Tree.LEAF(1)), f'{Tree}.LEAF(1)')
+
+    def test_errorsAreOnlyRenderedWhenPrinted(self) -> None:
+        wrapped = Wrapper.WRAPPED(Unprintable())
+        with self.assertRaises(AttributeError):
+            wrapped.empty()
+
+        with self.assertRaises(ValueError):
+            wrapped.match(empty=lambda: None)  # type: ignore
+
+        with self.assertRaises(ValueError):
+            wrapped.match(empty=lambda: None,
+                          wrapped=lambda _: None,
+                          other=lambda: None)  # type: ignore
+
+    def test_errorsRenderLimitedValues(self) -> None:
+        tree = chain(10**5)
+        with self.assertRaises(AttributeError) as context:
+            tree.leaf()
+
+        message = str(context.exception)
+        self.assertTrue(message.startswith(f'<{Tree}.NODE: ({Tree}.LEAF('))
+        self.assertTrue(
+            message.endswith(
+                '... was constructed as case NODE, so leaf is not accessible'))
+        self.assertLess(len(message), 300)
+
+        with self.assertRaises(ValueError) as matchContext:
+            tree.match(empty=lambda: None)  # type: ignore
+
+        self.assertIn('(missing LEAF)', str(matchContext.exception))
+
+    def test_errorsArePickledAsTheirMessages(self) -> None:
+        with self.assertRaises(AttributeError) as context:
+            Tree.LEAF(1).node()
+
+        error: Any = pickle.loads(pickle.dumps(context.exception))
+        self.assertEqual(error.args, (
+            f'<{Tree}.LEAF: 1> was constructed as case LEAF, so node is not accessible',
+        ))
@@ -0,0 +1,87 @@
+import unittest
+from typing import Any
+
+from adt import Case, adt
+
+
+class Counted:
+    """A payload which counts how often it's hashed and compared."""
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+        self.hashes = 0
+        self.comparisons = 0
+
+    def __hash__(self) -> int:
+        self.hashes += 1
+        return hash(self.value)
+
+    def __eq__(self, other: Any) -> bool:
+        self.comparisons += 1
+        return isinstance(other, Counted) and self.value == other.value
+
+
+@adt(frozen=True)
+class Tree:
+    EMPTY: Case
+    LEAF: Case[Counted]
+    NODE: Case["Tree", "Tree"]
+
+
+@adt(slots=True, frozen=True)
+class SlottedTree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["SlottedTree", "SlottedTree"]
+
+
+class TestFrozen(unittest.TestCase):
+    def test_cannotAssignOrDeleteAttributes(self) -> None:
+        for tree in (Tree.LEAF(Counted(1)), SlottedTree.LEAF(1)):
+            with self.assertRaises(AttributeError):
+                tree._value = 5  # type: ignore
+
+            with self.assertRaises(AttributeError):
+                tree.extra = 5  # type: ignore
+
+            with self.assertRaises(AttributeError):
+                del tree._value  # type: ignore
+
+    def test_hashIsComputedOnce(self) -> None:
+        payload = Counted(1)
+        tree = Tree.NODE(Tree.LEAF(payload), Tree.EMPTY())
+
+        self.assertEqual(hash(tree), hash(tree))
+        self.assertEqual(payload.hashes, 1)
+
+        # Hashing a new parent reuses the cached hashes of its children.
+        parent = Tree.NODE(tree, tree)
+        hash(parent)
+        self.assertEqual(payload.hashes, 1)
+
+    def test_equalHashesAgree(self) -> None:
+        a = SlottedTree.NODE(SlottedTree.LEAF(1), SlottedTree.EMPTY())
+        b = SlottedTree.NODE(SlottedTree.LEAF(1), SlottedTree.EMPTY())
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(len({a, b}), 1)
+        self.assertNotEqual(a, SlottedTree.LEAF(1))
+
+    def test_mismatchedHashesSkipComparison(self) -> None:
+        first, second = Counted(1), Counted(2)
+        a, b = Tree.LEAF(first), Tree.LEAF(second)
+        hash(a)
+        hash(b)
+
+        self.assertNotEqual(a, b)
+        self.assertEqual(first.comparisons + second.comparisons, 0)
+
+    def test_cannotDefineSetattr(self) -> None:
+        with self.assertRaises(TypeError):
+
+            @adt(frozen=True)
+            class Mutable:
+                CASE: Case[int]
+
+                def __setattr__(self, name: str, value: Any) -> None:
+                    pass
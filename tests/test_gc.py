@@ -0,0 +1,65 @@
+import gc
+import pickle
+import unittest
+import weakref
+from typing import Any, List
+
+from adt import Case, adt
+
+_CLASSES = 100
+
+
+# Restores `value` as pickle would (which can't refer to the local classes
+# below by name).
+def _unpickled(value: Any) -> Any:
+    restore, args = value.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+    return restore(*args)
+
+
+def _add(a: int, b: int) -> int:
+    return a + b
+
+
+# Defines a throwaway ADT class, and uses it in all the ways that could leave
+# it referenced from somewhere else.
+def _useThrowawayClass(index: int) -> 'weakref.ReferenceType[Any]':
+    @adt(slots=bool(index % 2), frozen=bool(index % 3))
+    class Tree:
+        EMPTY: Case
+        LEAF: Case[int]
+        NODE: Case["Tree", "Tree"]
+
+        def __init__(self) -> None:
+            super().__init__()
+
+    class DerivedTree(Tree):
+        pass
+
+    tree = Tree.NODE(Tree.LEAF(index), Tree.NODE(Tree.EMPTY(), Tree.LEAF(1)))
+    assert tree == Tree.NODE(Tree.LEAF(index),
+                             Tree.NODE(Tree.EMPTY(), Tree.LEAF(1)))
+    assert hash(tree) == hash(_unpickled(tree))
+    assert repr(tree) and str(tree)
+    assert Tree.from_bytes(tree.to_bytes()) == tree
+    assert Tree.from_json(tree.to_json()) == tree
+    assert tree.match(empty=lambda: 0,
+                      leaf=lambda n: n,
+                      node=lambda left, right: 1)
+    assert Tree.fold(tree, empty=lambda: 0, leaf=lambda n: n,
+                     node=_add) == index + 1
+
+    derived = DerivedTree.LEAF(index)
+    assert _unpickled(derived) == derived
+    assert DerivedTree.from_json(derived.to_json()) == derived
+
+    return weakref.ref(Tree)
+
+
+class TestGarbageCollection(unittest.TestCase):
+    def test_classesAreCollected(self) -> None:
+        refs: List['weakref.ReferenceType[Any]'] = [
+            _useThrowawayClass(i) for i in range(_CLASSES)
+        ]
+        gc.collect()
+
+        self.assertEqual([ref for ref in refs if ref() is not None], [])
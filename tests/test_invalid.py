@@ -11,7 +11,7 @@ try:
 
     @adt
     class Invalid(Generic[_T]):
-        CASE: Case[Optional[_T]] = None
+        CASE: Case[Optional[_T]] = None  # type: ignore
 
     invalid_defined = True
 except AttributeError as e:
@@ -0,0 +1,153 @@
+import json
+import unittest
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from adt import Case, adt
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+class DerivedTree(Tree):
+    pass
+
+
+@adt
+class Payload:
+    ANYTHING: Case[Any]
+    TEXT: Case[str, float]
+    PAIR: Case[int, Tuple[int, str]]
+    TREES: Case[List[Tree], Dict[str, Tree], Optional[Tree]]
+    NESTED: Case[Tuple[Tree, ...], Optional["Payload"]]
+
+
+_T = TypeVar('_T')
+
+
+@adt
+class GenericList(Generic[_T]):
+    NIL: Case
+    CONS: Case[_T, "GenericList[_T]"]
+
+
+@adt
+class Holder:
+    LISTS: Case[GenericList[int], List["GenericList[str]"]]
+
+
+class TestJSON(unittest.TestCase):
+    def test_taggedFormat(self) -> None:
+        self.assertEqual(
+            json.loads(Tree.NODE(Tree.LEAF(1), Tree.EMPTY()).to_json()), {
+                'tag':
+                'NODE',
+                'values': [{
+                    'tag': 'LEAF',
+                    'values': [1]
+                }, {
+                    'tag': 'EMPTY',
+                    'values': []
+                }]
+            })
+
+    def test_roundTrip(self) -> None:
+        values = [
+            Payload.ANYTHING({
+                'a': [1, None, True],
+                'b': 'ünïcode'
+            }),
+            Payload.TEXT('"quoted"\n', 1.5),
+            Payload.PAIR(0, (1, 'one')),
+            Payload.TREES([Tree.LEAF(1), Tree.EMPTY()], {'x': Tree.LEAF(2)},
+                          None),
+            Payload.TREES([], {}, Tree.NODE(Tree.EMPTY(), Tree.EMPTY())),
+            Payload.NESTED((Tree.LEAF(3), ), Payload.PAIR(0, (2, 'two'))),
+        ]
+
+        for value in values:
+            decoded = Payload.from_json(value.to_json())
+            self.assertEqual(decoded, value)
+
+        # Tuples are restored where the field types call for them.
+        self.assertIs(type(Payload.from_json(values[2].to_json()).pair()[1]),
+                      tuple)
+
+    def test_subclassesRoundTrip(self) -> None:
+        value = DerivedTree.NODE(DerivedTree.LEAF(1), DerivedTree.EMPTY())
+        for encoded in (value.to_json(), ''.join(value.to_json_chunks())):
+            decoded = DerivedTree.from_json(encoded)
+            self.assertEqual(decoded, value)
+            self.assertIsInstance(decoded, DerivedTree)
+
+            # Including the values of its fields, which refer to the base
+            # class by name.
+            left, right = decoded.node()
+            self.assertIsInstance(left, DerivedTree)
+            self.assertIsInstance(right, DerivedTree)
+
+    def test_genericRoundTrip(self) -> None:
+        xs: GenericList[int] = GenericList.CONS(
+            1, GenericList.CONS(2, GenericList.NIL()))
+        self.assertEqual(GenericList.from_json(xs.to_json()), xs)
+
+        ys: GenericList[str] = GenericList.CONS('a', GenericList.NIL())
+        holder = Holder.LISTS(xs, [ys, GenericList.NIL()])
+        self.assertEqual(Holder.from_json(holder.to_json()), holder)
+
+    def test_deepValues(self) -> None:
+        tree = Tree.LEAF(0)
+        for i in range(10**5):
+            tree = Tree.NODE(tree, Tree.LEAF(i))
+
+        encoded = tree.to_json()
+        self.assertEqual(encoded, ''.join(tree.to_json_chunks()))
+        self.assertEqual(Tree.from_json(encoded), tree)
+
+    def test_chunksMatchEncoding(self) -> None:
+        value = Payload.ANYTHING({
+            'text': 'é\u2028"',
+            1: [1.5, float('inf'), None, False],
+            None: (),
+            2.5: {},
+            'trees': [Tree.LEAF(i) for i in range(1000)],
+        })
+
+        chunks = list(value.to_json_chunks(chunk_size=100))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) >= 100 for chunk in chunks[:-1]))
+        self.assertEqual(''.join(chunks), value.to_json())
+
+    def test_unsupportedValuesRaise(self) -> None:
+        with self.assertRaises(TypeError):
+            Payload.ANYTHING({1, 2}).to_json()
+
+        with self.assertRaises(TypeError):
+            list(Payload.ANYTHING({(1, 2): 3}).to_json_chunks())
+
+    def test_invalidJSONRaises(self) -> None:
+        invalid = [
+            '',
+            '[]',
+            '{"tag": "LEAF"}',
+            '{"tag": "BRANCH", "values": []}',
+            '{"tag": "LEAF", "values": [1, 2]}',
+            '{"tag": "NODE", "values": [1, 2]}',
+        ]
+
+        for text in invalid:
+            with self.assertRaises(ValueError):
+                Tree.from_json(text)
+
+    def test_invalidDeepJSONRaises(self) -> None:
+        leaf = '{"tag": "LEAF", "values": [1]}'
+        deep = '{"tag": "NODE", "values": [' * 10**4 + leaf
+        valid = deep + (', ' + leaf + ']}') * 10**4
+        self.assertEqual(Tree.from_json(valid).node()[1], Tree.LEAF(1))
+
+        for text in (deep, deep + ']}', deep + ', ' + leaf + ']} x'):
+            with self.assertRaises(ValueError):
+                Tree.from_json(text)
@@ -0,0 +1,142 @@
+import unittest
+from typing import Iterator, List, Tuple
+
+from adt import Case, adt, batched
+from tests import helpers
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+
+
+def circleAreas(radii: List[float]) -> List[float]:
+    return [3.0 * r * r for r in radii]
+
+
+def rectangleAreas(sides: List[Tuple[float, float]]) -> List[float]:
+    return [w * h for w, h in sides]
+
+
+def shapes() -> List[Shape]:
+    return [
+        Shape.CIRCLE(1.0),
+        Shape.RECTANGLE(2.0, 3.0),
+        Shape.POINT(),
+        Shape.CIRCLE(2.0),
+        Shape.RECTANGLE(1.0, 1.0),
+    ]
+
+
+expectedAreas = [3.0, 6.0, 0.0, 12.0, 1.0]
+
+
+@adt
+class Job:
+    SINGLE: Case[str]
+    BATCH: Case[List[str]]
+
+
+class TestMatchMany(unittest.TestCase):
+    def test_streamingPreservesOrder(self) -> None:
+        results = Shape.match_many(shapes(),
+                                   point=lambda: 0.0,
+                                   circle=lambda r: 3.0 * r * r,
+                                   rectangle=lambda w, h: w * h)
+        self.assertEqual(list(results), expectedAreas)
+
+    def test_streamingIsLazy(self) -> None:
+        consumed: List[Shape] = []
+
+        def generate() -> Iterator[Shape]:
+            for shape in shapes():
+                consumed.append(shape)
+                yield shape
+
+        results = Shape.match_many(generate(),
+                                   point=lambda: 0.0,
+                                   circle=lambda r: 3.0 * r * r,
+                                   rectangle=lambda w, h: w * h)
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(results), 3.0)
+        self.assertEqual(len(consumed), 1)
+
+    def test_batchPreservesOrder(self) -> None:
+        results = Shape.match_many(shapes(),
+                                   _batch=True,
+                                   point=lambda: 0.0,
+                                   circle=lambda r: 3.0 * r * r,
+                                   rectangle=lambda w, h: w * h)
+        self.assertEqual(list(results), expectedAreas)
+
+    def test_batchedCallbacksAreCalledOncePerCase(self) -> None:
+        batches: List[List[float]] = []
+
+        def circles(radii: List[float]) -> List[float]:
+            batches.append(radii)
+            return circleAreas(radii)
+
+        results = Shape.match_many(shapes(),
+                                   _batch=True,
+                                   point=lambda: 0.0,
+                                   circle=batched(circles),
+                                   rectangle=batched(rectangleAreas))
+        self.assertEqual(list(results), expectedAreas)
+        self.assertEqual(batches, [[1.0, 2.0]])
+
+    def test_batchedCallbacksWorkOneAtATime(self) -> None:
+        self.assertEqual(
+            list(
+                Shape.match_many(shapes(),
+                                 point=lambda: 0.0,
+                                 circle=batched(circleAreas),
+                                 rectangle=batched(rectangleAreas))),
+            expectedAreas)
+
+        self.assertEqual(
+            Shape.RECTANGLE(2.0, 3.0).match(point=lambda: 0.0,
+                                            circle=batched(circleAreas),
+                                            rectangle=batched(rectangleAreas)),
+            6.0)
+
+    def test_batchedCallbackMustReturnOneResultPerValue(self) -> None:
+        with self.assertRaises(ValueError):
+            Shape.match_many(shapes(),
+                             _batch=True,
+                             point=lambda: 0.0,
+                             circle=batched(lambda radii: []),
+                             rectangle=lambda w, h: w * h)
+
+    def test_incompleteMatchRaisesBeforeIterating(self) -> None:
+        def generate() -> Iterator[Shape]:
+            self.fail('Values should not be consumed')
+            yield Shape.POINT()
+
+        with self.assertRaises(ValueError):
+            Shape.match_many(  # type: ignore
+                generate(),
+                point=helpers.invalidPatternMatch,
+                circle=helpers.invalidPatternMatch)
+
+    def test_emptyInput(self) -> None:
+        for batch in (False, True):
+            self.assertEqual(
+                list(
+                    Shape.match_many([],
+                                     _batch=batch,
+                                     point=helpers.invalidPatternMatch,
+                                     circle=helpers.invalidPatternMatch,
+                                     rectangle=helpers.invalidPatternMatch)),
+                [])
+
+    def test_batchCaseHasItsOwnCallback(self) -> None:
+        jobs = [Job.BATCH(['a', 'b']), Job.SINGLE('c')]
+        for batch in (False, True):
+            self.assertEqual(
+                list(
+                    Job.match_many(jobs,
+                                   _batch=batch,
+                                   single=lambda name: 1,
+                                   batch=lambda names: len(names))), [2, 1])
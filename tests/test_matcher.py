@@ -0,0 +1,78 @@
+import threading
+import unittest
+from typing import List
+
+from adt import Case, adt
+from tests import helpers
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+
+
+@adt
+class Matched:
+    MATCHER: Case[int]
+    OTHER: Case
+
+
+area = Shape.matcher(point=lambda: 0.0,
+                     circle=lambda r: 3.0 * r * r,
+                     rectangle=lambda w, h: w * h)
+
+
+class TestMatcher(unittest.TestCase):
+    def test_dispatchesOnCase(self) -> None:
+        self.assertEqual(area(Shape.POINT()), 0.0)
+        self.assertEqual(area(Shape.CIRCLE(2.0)), 12.0)
+        self.assertEqual(area(Shape.RECTANGLE(2.0, 3.0)), 6.0)
+
+    def test_agreesWithMatch(self) -> None:
+        for shape in (Shape.POINT(), Shape.CIRCLE(1.5),
+                      Shape.RECTANGLE(1.0, 4.0)):
+            self.assertEqual(
+                area(shape),
+                shape.match(point=lambda: 0.0,
+                            circle=lambda r: 3.0 * r * r,
+                            rectangle=lambda w, h: w * h))
+
+    def test_acceptsUppercaseCaseNames(self) -> None:
+        m = Shape.matcher(  # type: ignore
+            POINT=lambda: 'point',
+            CIRCLE=lambda r: 'circle',
+            RECTANGLE=lambda w, h: 'rectangle')
+        self.assertEqual(m(Shape.CIRCLE(1.0)), 'circle')
+
+    def test_incompleteMatcherRaisesImmediately(self) -> None:
+        with self.assertRaises(ValueError):
+            Shape.matcher(  # type: ignore
+                point=helpers.invalidPatternMatch,
+                circle=helpers.invalidPatternMatch)
+
+        with self.assertRaises(ValueError):
+            Shape.matcher(  # type: ignore
+                point=helpers.invalidPatternMatch,
+                circle=helpers.invalidPatternMatch,
+                rectangle=helpers.invalidPatternMatch,
+                triangle=helpers.invalidPatternMatch)
+
+    def test_accessorTakesPrecedence(self) -> None:
+        self.assertEqual(Matched.MATCHER(5).matcher(), 5)
+
+    def test_sharedBetweenThreads(self) -> None:
+        shapes = [Shape.CIRCLE(1.0), Shape.RECTANGLE(2.0, 3.0)] * 1000
+        results: List[List[float]] = []
+
+        def run() -> None:
+            results.append([area(shape) for shape in shapes])
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [[3.0, 6.0] * 1000] * 8)
@@ -1,7 +1,11 @@
 import os
 import sys
+import tempfile
 import unittest
+from typing import List
 
+import mypy.api
+import mypy.dmypy_server
 import mypy.main
 import mypy.version
 
@@ -22,6 +26,112 @@ class TestMyPyPlugin(unittest.TestCase):
         # cf. https://github.com/jspahrsummers/adt/issues/26
         self._call_mypy_on_source_file("issue26.py")
 
+    def test_deferred_analysis(self) -> None:
+        # The @adt hook runs again when analysis of the module is deferred.
+        self._call_mypy_on_source_file("deferred.py")
+
+    def test_named_fields(self) -> None:
+        self._call_mypy_on_source_file("named_fields.py")
+
+    def test_option_names(self) -> None:
+        # Cases may share the names of options like `_batch`, minus the
+        # underscore.
+        self._call_mypy_on_source_file("option_names.py")
+
+    def test_named_field_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "errors.py")
+            self._write(path, _NAMED_FIELD_ERRORS)
+            report, _, status = mypy.api.run([path])
+
+        self.assertEqual(status, 1, msg=report)
+        errors = [
+            line.split(": error: ")[1] for line in report.splitlines()
+            if ": error: " in line
+        ]
+        self.assertEqual(errors, [
+            'Either all fields of a case should be named, or none of them',
+            'Field match would hide the attribute match of "Hiding"',
+            'Argument "value" to "LITERAL" of "Expression" has incompatible '
+            'type "str"; expected "int"',
+            'Unexpected keyword argument "other" for "LITERAL" of "Expression"',
+            'Incompatible types in assignment (expression has type "int", '
+            'variable has type "str")',
+        ])
+
+    def test_incremental_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            shapes = os.path.join(directory, "shapes.py")
+            consumer = os.path.join(directory, "consumer.py")
+            self._write(shapes, _SHAPES)
+            self._write(consumer, _CONSUMER)
+
+            args = [
+                "--verbose", "--cache-dir",
+                os.path.join(directory, ".mypy_cache"), shapes, consumer
+            ]
+            self._run_mypy(args)
+
+            log = self._run_mypy(args)
+            self.assertIn("Metadata fresh for shapes", log)
+            self.assertIn("Metadata fresh for consumer", log)
+
+            # Changing only the implementation of the ADT's module must not
+            # change its interface, so its consumers remain cached.
+            self._write(shapes, _SHAPES.replace("return 1.0", "return 2.0"))
+            log = self._run_mypy(args)
+            self.assertIn("Cached module shapes has same interface", log)
+            self.assertNotIn("Parsing " + consumer, log)
+
+            # Changing only the consumer leaves the ADT's module cached.
+            self._write(consumer, _CONSUMER + "\n\nunused = 1\n")
+            log = self._run_mypy(args)
+            self.assertIn("Metadata fresh for shapes", log)
+            self.assertNotIn("Parsing " + shapes, log)
+
+    def test_fine_grained_updates(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            units = os.path.join(directory, "units.py")
+            shapes = os.path.join(directory, "shapes.py")
+            consumer = os.path.join(directory, "consumer.py")
+            with_units = "from units import Unit\n" + _SHAPES.replace(
+                "Case[float, float]", "Case[float, float, Unit]")
+            self._write(units, "class Unit:\n    pass\n")
+            self._write(shapes, with_units)
+            self._write(
+                consumer,
+                _CONSUMER.replace("lambda w, h:", "lambda w, h, unit:"))
+
+            sources, options = mypy.main.process_options(
+                [units, shapes, consumer])
+            server = mypy.dmypy_server.Server(
+                options, os.path.join(directory, "dmypy.json"))
+
+            def check() -> List[str]:
+                result = server.check(sources, is_tty=False, terminal_width=80)
+                return [
+                    line for line in result["out"].splitlines()
+                    if ": error:" in line
+                ]
+
+            self.assertEqual(check(), [])
+
+            # Changing the base of a class the ADT depends upon makes the
+            # daemon strip what the plugin generated, and analyze the ADT
+            # again from the same syntax tree.
+            self._write(
+                units, "class Base:\n    pass\n\n\n"
+                "class Unit(Base):\n    pass\n")
+            self.assertEqual(check(), [])
+
+            # Changes to the ADT itself are still picked up.
+            self._write(shapes, with_units.replace("Case[float]", "Case[str]"))
+            errors = check()
+            self.assertTrue(
+                any('Argument 1 to "CIRCLE" of "Shape" has incompatible type'
+                    in error for error in errors),
+                msg=errors)
+
     def test_readme_examples(self) -> None:
         readme_code = extract_code_from_readme()
 
@@ -49,3 +159,59 @@ class TestMyPyPlugin(unittest.TestCase):
             mypy.main.main(None, sys.stdout, sys.stderr, args=[testfile])
         except SystemExit:
             self.fail(msg="Error during type-check")
+
+    def _run_mypy(self, args: List[str]) -> str:
+        """Type-checks with the given arguments, and returns mypy's log."""
+        report, log, status = mypy.api.run(args)
+        self.assertEqual(status, 0, msg=report)
+        return log
+
+    def _write(self, path: str, source: str) -> None:
+        with open(path, "w") as file:
+            file.write(source)
+
+
+_SHAPES = """
+from adt import adt, Case
+
+
+@adt
+class Shape:
+    CIRCLE: Case[float]
+    SQUARE: Case[float, float]
+
+    def scale(self) -> float:
+        return 1.0
+"""
+
+_CONSUMER = """
+from shapes import Shape
+
+
+def area(shape: Shape) -> float:
+    return shape.match(circle=lambda r: 3.14 * r * r,
+                       square=lambda w, h: w * h)
+
+
+circle: Shape = Shape.CIRCLE(1.0)
+"""
+
+_NAMED_FIELD_ERRORS = """
+from adt import adt, Case
+
+
+@adt
+class Expression:
+    LITERAL: Case[("value", int), ]
+    ADD: Case[("lhs", "Expression"), "Expression"]
+
+
+@adt
+class Hiding:
+    LITERAL: Case[("match", int), ]
+
+
+Expression.LITERAL(value="x")
+Expression.LITERAL(other=1)
+value: str = Expression.LITERAL(1).value
+"""
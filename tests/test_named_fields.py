@@ -0,0 +1,103 @@
+import pickle
+import unittest
+from typing import Any, Union
+
+from adt import Case, adt
+
+
+@adt
+class Expression:
+    LITERAL: Case[("value", int), ]
+    ADD: Case[("lhs", "Expression"), ("rhs", "Expression")]
+    NEGATE: Case[("value", "Expression"), ]
+
+    def evaluate(self) -> int:
+        return self.match(literal=lambda value: value,
+                          add=lambda lhs, rhs: lhs.evaluate() + rhs.evaluate(),
+                          negate=lambda value: -value.evaluate())
+
+
+@adt(slots=True, frozen=True)
+class Point:
+    ORIGIN: Case
+    CARTESIAN: Case[("x", float), ("y", float)]
+
+
+class TestNamedFields(unittest.TestCase):
+    def test_fieldsArePassedByPositionOrKeyword(self) -> None:
+        self.assertEqual(
+            Expression.ADD(Expression.LITERAL(1), Expression.LITERAL(2)),
+            Expression.ADD(rhs=Expression.LITERAL(2),
+                           lhs=Expression.LITERAL(value=1)))
+        with self.assertRaises(TypeError):
+            Expression.LITERAL(other=1)  # type: ignore
+
+        with self.assertRaises(TypeError):
+            Expression.ADD(Expression.LITERAL(1))  # type: ignore
+
+    def test_fieldsAreAttributes(self) -> None:
+        expression = Expression.ADD(lhs=Expression.LITERAL(1),
+                                    rhs=Expression.LITERAL(2))
+        self.assertEqual(expression.lhs, Expression.LITERAL(1))
+        self.assertEqual(expression.rhs.value, 2)
+        self.assertEqual(expression.evaluate(), 3)
+
+        # Only the values of a case have its fields.
+        with self.assertRaises(AttributeError):
+            Expression.LITERAL(1).lhs
+
+        value: Union[int, Expression] = Expression.NEGATE(
+            Expression.LITERAL(1)).value
+        self.assertEqual(value, Expression.LITERAL(1))
+
+    def test_accessorsReturnTheFieldsAsATuple(self) -> None:
+        self.assertEqual(Point.CARTESIAN(1.0, 2.0).cartesian(), (1.0, 2.0))
+        self.assertEqual(Expression.LITERAL(1).literal(), 1)
+
+    def test_matchArgsAreTheFieldNames(self) -> None:
+        cases: Any = Expression
+        self.assertEqual(cases.LITERAL.__match_args__, ('value', ))
+        self.assertEqual(cases.ADD.__match_args__, ('lhs', 'rhs'))
+
+    def test_fieldsAreStoredInline(self) -> None:
+        point: Any = Point.CARTESIAN(1.0, 2.0)
+        self.assertFalse(hasattr(point, '__dict__'))
+        with self.assertRaises(AttributeError):
+            point.x = 3.0
+
+        self.assertEqual(hash(point), hash(Point.CARTESIAN(x=1.0, y=2.0)))
+
+        expression: Any = Expression.LITERAL(1)
+        expression.value = 2
+        self.assertEqual(expression, Expression.LITERAL(2))
+        self.assertEqual(expression._value, 2)
+
+    def test_valuesRoundTrip(self) -> None:
+        expression = Expression.NEGATE(
+            Expression.ADD(lhs=Expression.LITERAL(1),
+                           rhs=Expression.LITERAL(2)))
+        self.assertEqual(pickle.loads(pickle.dumps(expression)), expression)
+        self.assertEqual(Expression.from_json(expression.to_json()),
+                         expression)
+
+        point = Point.CARTESIAN(1.0, 2.0)
+        self.assertEqual(pickle.loads(pickle.dumps(point)), point)
+
+    def test_invalidNamesRaise(self) -> None:
+        for fields in [
+            (("value", int), str),
+            (("value", int), ("value", str)),
+            (("not a name", int), ),
+            (("class", int), ),
+            (("_private", int), ),
+        ]:
+            with self.subTest(fields=fields):
+                with self.assertRaises(TypeError):
+                    Case[fields]
+
+    def test_fieldsCannotHideAttributes(self) -> None:
+        with self.assertRaises(TypeError):
+
+            @adt
+            class Hiding:  # type: ignore
+                LITERAL: Case[("match", int), ]
@@ -0,0 +1,48 @@
+import unittest
+
+from adt import Case, adt
+
+
+@adt
+class Color:
+    RED: Case
+    GREEN: Case
+    BLUE: Case
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+class DerivedTree(Tree):
+    pass
+
+
+class TestNullary(unittest.TestCase):
+    def test_nullaryConstructorsReturnSharedInstance(self) -> None:
+        self.assertIs(Color.RED(), Color.RED())
+        self.assertIs(Tree.EMPTY(), Tree.EMPTY())
+        self.assertIsNot(Color.RED(), Color.GREEN())
+
+    def test_casesWithDataAreNotShared(self) -> None:
+        self.assertIsNot(Tree.LEAF(1), Tree.LEAF(1))
+        self.assertEqual(Tree.LEAF(1), Tree.LEAF(1))
+
+    def test_equalityAndHashing(self) -> None:
+        self.assertEqual(Color.RED(), Color.RED())
+        self.assertNotEqual(Color.RED(), Color.BLUE())
+        self.assertEqual(hash(Color.RED()), hash(Color.RED()))
+
+        lookup = {Color.RED(): 'red', Color.GREEN(): 'green'}
+        self.assertEqual(lookup[Color.GREEN()], 'green')
+        self.assertNotIn(Color.BLUE(), lookup)
+
+    def test_descendantsGetTheirOwnInstances(self) -> None:
+        empty = DerivedTree.EMPTY()
+        self.assertIsInstance(empty, DerivedTree)
+        self.assertIsNot(empty, DerivedTree.EMPTY())
+        self.assertEqual(empty, Tree.EMPTY())
+        self.assertEqual(hash(empty), hash(Tree.EMPTY()))
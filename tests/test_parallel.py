@@ -0,0 +1,186 @@
+import unittest
+from typing import List
+
+from adt import Case, adt
+from adt.parallel import map_match
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+
+
+@adt
+class Expression:
+    LITERAL: Case[("value", int), ]
+    ADD: Case[("lhs", "Expression"), ("rhs", "Expression")]
+    NEGATE: Case[("value", "Expression"), ]
+
+    def evaluate(self) -> int:
+        return self.match(literal=lambda value: value,
+                          add=lambda lhs, rhs: lhs.evaluate() + rhs.evaluate(),
+                          negate=lambda value: -value.evaluate())
+
+
+@adt
+class Setting:
+    VALUES: Case[List[int]]
+    WORKERS: Case[int]
+    CHUNKSIZE: Case[int]
+
+
+# Handlers are sent to the worker processes, so must be defined at the top
+# level, rather than as lambdas.
+def point() -> float:
+    return 0.0
+
+
+def circle(r: float) -> float:
+    return 3.0 * r * r
+
+
+def rectangle(w: float, h: float) -> float:
+    return w * h
+
+
+def fail(r: float) -> float:
+    raise KeyError(r)
+
+
+def literal(value: int) -> int:
+    return value
+
+
+def add(lhs: Expression, rhs: Expression) -> int:
+    return lhs.evaluate() + rhs.evaluate()
+
+
+def negate(value: Expression) -> int:
+    return -value.evaluate()
+
+
+def total(values: List[int]) -> int:
+    return sum(values)
+
+
+def identity(n: int) -> int:
+    return n
+
+
+def shapes(count: int) -> List[Shape]:
+    return [
+        Shape.POINT() if i % 3 == 0 else Shape.CIRCLE(float(i)) if i %
+        3 == 1 else Shape.RECTANGLE(float(i), 2.0) for i in range(count)
+    ]
+
+
+def area(shape: Shape) -> float:
+    return shape.match(point=point, circle=circle, rectangle=rectangle)
+
+
+class TestParallel(unittest.TestCase):
+    def test_resultsAreInOrder(self) -> None:
+        values = shapes(1000)
+        expected = [area(shape) for shape in values]
+        for chunksize in [1, 7, 1000, 5000]:
+            with self.subTest(chunksize=chunksize):
+                self.assertEqual(
+                    list(
+                        map_match(values,
+                                  _workers=2,
+                                  _chunksize=chunksize,
+                                  point=point,
+                                  circle=circle,
+                                  rectangle=rectangle)), expected)
+
+    def test_acceptsAnyIterable(self) -> None:
+        results = map_match(iter(shapes(10)),
+                            _workers=2,
+                            _chunksize=3,
+                            point=point,
+                            circle=circle,
+                            rectangle=rectangle)
+        self.assertEqual(list(results), [area(shape) for shape in shapes(10)])
+
+    def test_nestedValues(self) -> None:
+        expression = Expression.LITERAL(1)
+        for i in range(50):
+            expression = Expression.NEGATE(
+                Expression.ADD(expression, Expression.LITERAL(i)))
+
+        values = [
+            expression,
+            Expression.LITERAL(2),
+            Expression.NEGATE(expression)
+        ]
+        self.assertEqual(
+            list(
+                map_match(values,
+                          _workers=2,
+                          _chunksize=2,
+                          literal=literal,
+                          add=add,
+                          negate=negate)),
+            [value.evaluate() for value in values])
+
+    def test_emptyInput(self) -> None:
+        self.assertEqual(list(map_match([], point=point)), [])
+
+    def test_missingHandlersRaiseEagerly(self) -> None:
+        with self.assertRaises(ValueError):
+            map_match(shapes(3), point=point, circle=circle)
+
+        with self.assertRaises(ValueError):
+            map_match(shapes(3),
+                      point=point,
+                      circle=circle,
+                      rectangle=rectangle,
+                      square=rectangle)
+
+    def test_invalidChunksizeRaises(self) -> None:
+        with self.assertRaises(ValueError):
+            map_match(shapes(3),
+                      _chunksize=0,
+                      point=point,
+                      circle=circle,
+                      rectangle=rectangle)
+
+    def test_otherValuesRaise(self) -> None:
+        with self.assertRaises(TypeError):
+            map_match([1.0], point=point)
+
+        results = map_match(
+            [Shape.POINT(), Expression.LITERAL(1)],
+            _workers=2,
+            point=point,
+            circle=circle,
+            rectangle=rectangle)
+        with self.assertRaises(TypeError):
+            list(results)
+
+    def test_handlerExceptionsPropagate(self) -> None:
+        results = map_match(shapes(10),
+                            _workers=2,
+                            _chunksize=2,
+                            point=point,
+                            circle=fail,
+                            rectangle=rectangle)
+        with self.assertRaises(KeyError):
+            list(results)
+
+    def test_casesNamedLikeOptions(self) -> None:
+        settings = [
+            Setting.VALUES([1, 2]),
+            Setting.WORKERS(3),
+            Setting.CHUNKSIZE(4)
+        ]
+        self.assertEqual(
+            list(
+                map_match(settings,
+                          _workers=2,
+                          _chunksize=2,
+                          values=total,
+                          workers=identity,
+                          chunksize=identity)), [3, 3, 4])
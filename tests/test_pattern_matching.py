@@ -0,0 +1,45 @@
+import importlib
+import sys
+import unittest
+from typing import Any
+
+# Imported by name, as the module can't even be parsed before Python 3.10.
+patterns: Any = importlib.import_module(
+    'tests.pattern_matching') if sys.version_info >= (3, 10) else None
+
+
+@unittest.skipIf(patterns is None, 'match statements need Python 3.10+')
+class TestPatternMatching(unittest.TestCase):
+    def test_classPatterns(self) -> None:
+        Tree = patterns.Tree
+        tree = Tree.NODE(Tree.LEAF(1), Tree.NODE(Tree.EMPTY(), Tree.LEAF(2)))
+        self.assertEqual(patterns.total(tree), 3)
+        self.assertEqual(patterns.total(Tree.EMPTY()), 0)
+
+    def test_nestedPatterns(self) -> None:
+        Tree = patterns.Tree
+        self.assertEqual(
+            patterns.leafPair(Tree.NODE(Tree.LEAF(1), Tree.LEAF(2))), (1, 2))
+        self.assertIsNone(
+            patterns.leafPair(Tree.NODE(Tree.LEAF(1), Tree.EMPTY())))
+        self.assertIsNone(patterns.leafPair(Tree.LEAF(1)))
+
+    def test_slottedFrozenValues(self) -> None:
+        Shape = patterns.Shape
+        self.assertEqual(patterns.area(Shape.POINT()), 0.0)
+        self.assertEqual(patterns.area(Shape.CIRCLE(1.0)), 3.14)
+        self.assertEqual(patterns.area(Shape.RECTANGLE(2.0, 3.0)), 6.0)
+
+    def test_descendantsMatchTheCasesOfTheirAncestors(self) -> None:
+        DerivedTree = patterns.DerivedTree
+        tree = DerivedTree.NODE(DerivedTree.LEAF(1), patterns.Tree.LEAF(2))
+        self.assertEqual(patterns.total(tree), 3)
+        self.assertEqual(patterns.leafPair(tree), (1, 2))
+        self.assertTrue(patterns.isDerived(tree))
+        self.assertFalse(patterns.isDerived(patterns.Tree.EMPTY()))
+
+    def test_namedFields(self) -> None:
+        Expression = patterns.Expression
+        expression = Expression.ADD(Expression.LITERAL(1),
+                                    rhs=Expression.LITERAL(2))
+        self.assertEqual(patterns.evaluate(expression), 3)
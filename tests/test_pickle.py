@@ -0,0 +1,100 @@
+import copy
+import pickle
+import unittest
+from typing import Any, List
+
+from adt import Case, adt
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+@adt(slots=True, frozen=True)
+class FrozenList:
+    NIL: Case
+    CONS: Case[int, "FrozenList"]
+
+
+@adt
+class Document:
+    TEXT: Case[str]
+    SECTION: Case[str, "Document", List["Document"]]
+    QUOTE: Case[Tree]
+
+
+class DerivedTree(Tree):
+    pass
+
+
+class TestPickle(unittest.TestCase):
+    def assertRoundTrips(self, value: Any) -> Any:
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(
+                pickle.loads(pickle.dumps(value, protocol=protocol)), value)
+
+        return pickle.loads(pickle.dumps(value))
+
+    def test_roundTrip(self) -> None:
+        self.assertRoundTrips(Tree.LEAF(1))
+        self.assertRoundTrips(Tree.NODE(Tree.LEAF(1), Tree.EMPTY()))
+        self.assertRoundTrips(FrozenList.CONS(1, FrozenList.NIL()))
+        self.assertRoundTrips(
+            Document.SECTION(
+                'title', Document.TEXT('body'),
+                [Document.QUOTE(Tree.LEAF(2)),
+                 Document.TEXT('footer')]))
+
+    def test_nullaryCasesUnpickleToSharedInstance(self) -> None:
+        self.assertIs(self.assertRoundTrips(Tree.EMPTY()), Tree.EMPTY())
+
+    def test_frozenValuesRemainFrozen(self) -> None:
+        xs = self.assertRoundTrips(FrozenList.CONS(1, FrozenList.NIL()))
+        with self.assertRaises(AttributeError):
+            xs._value = None
+
+    def test_picklesAreCompact(self) -> None:
+        # Beyond the names of the class and the function restoring values,
+        # each value is just its case index and associated data.
+        leaves = [Tree.LEAF(i) for i in range(100)]
+        self.assertLess(len(pickle.dumps(leaves)), 100 * 16)
+        self.assertNotIn(b'_Key', pickle.dumps(leaves))
+
+    def test_sharedValuesRemainShared(self) -> None:
+        leaf = Tree.LEAF(1)
+        node = Tree.NODE(leaf, leaf)
+        tree = self.assertRoundTrips(Tree.NODE(node, node))
+
+        left, right = tree.node()
+        self.assertIs(left, right)
+        self.assertIs(left.node()[0], left.node()[1])
+
+    def test_deepValues(self) -> None:
+        xs = FrozenList.NIL()
+        tree = Tree.LEAF(0)
+        for i in range(10**5):
+            xs = FrozenList.CONS(i, xs)
+            tree = Tree.NODE(tree, Tree.LEAF(i))
+
+        self.assertEqual(pickle.loads(pickle.dumps(xs)), xs)
+        self.assertEqual(pickle.loads(pickle.dumps(tree)), tree)
+        self.assertEqual(copy.deepcopy(tree), tree)
+
+    def test_nestedClasses(self) -> None:
+        # Values of other ADT classes are flattened along with the root.
+        tree = Tree.LEAF(0)
+        for i in range(10**4):
+            tree = Tree.NODE(tree, Tree.LEAF(i))
+
+        self.assertRoundTrips(Document.QUOTE(tree))
+
+    def test_descendants(self) -> None:
+        tree = DerivedTree.NODE(
+            Tree.LEAF(1), DerivedTree.NODE(DerivedTree.EMPTY(), Tree.LEAF(2)))
+        restored = self.assertRoundTrips(tree)
+        self.assertIsInstance(restored, DerivedTree)
+        self.assertIsInstance(restored.node()[1], DerivedTree)
+        self.assertNotIsInstance(restored.node()[0], DerivedTree)
@@ -0,0 +1,65 @@
+import unittest
+from typing import Optional, Tuple
+
+from adt import Case, adt
+
+
+@adt
+class Shape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[float, float]
+
+
+class DerivedShape(Shape):
+    pass
+
+
+@adt
+class OverriddenPredicate:
+    FIRST: Case
+    SECOND: Case[int]
+
+    def is_second(self) -> bool:
+        return False
+
+
+class TestPredicates(unittest.TestCase):
+    def test_predicatesCheckTheCase(self) -> None:
+        circle = Shape.CIRCLE(1.0)
+        self.assertTrue(circle.is_circle())
+        self.assertFalse(circle.is_point())
+        self.assertFalse(circle.is_rectangle())
+        self.assertTrue(Shape.POINT().is_point())
+        self.assertTrue(DerivedShape.RECTANGLE(1.0, 2.0).is_rectangle())
+
+    def test_gettersReturnTheDataOfTheirCase(self) -> None:
+        rectangle = Shape.RECTANGLE(1.0, 2.0)
+        self.assertEqual(rectangle.get_rectangle(), (1.0, 2.0))
+        self.assertEqual(Shape.CIRCLE(1.0).get_circle(), 1.0)
+        self.assertEqual(DerivedShape.CIRCLE(1.0).get_circle(3.0), 1.0)
+
+    def test_gettersReturnTheDefaultForOtherCases(self) -> None:
+        circle = Shape.CIRCLE(1.0)
+        self.assertIsNone(circle.get_rectangle())
+        default: Optional[Tuple[float, float]] = circle.get_rectangle(
+            (0.0, 0.0))
+        self.assertEqual(default, (0.0, 0.0))
+
+    def test_missesDoNotFormatTheValue(self) -> None:
+        class Unprintable:
+            def __repr__(self) -> str:
+                raise AssertionError('The value was formatted')
+
+        @adt
+        class Wrapper:
+            EMPTY: Case
+            WRAPPED: Case[Unprintable]
+
+        wrapped = Wrapper.WRAPPED(Unprintable())
+        self.assertFalse(wrapped.is_empty())
+        wrapped.get_empty()
+
+    def test_definedMethodsAreNotReplaced(self) -> None:
+        self.assertFalse(OverriddenPredicate.SECOND(1).is_second())
+        self.assertEqual(OverriddenPredicate.SECOND(1).get_second(), 1)
@@ -0,0 +1,166 @@
+import unittest
+import weakref
+from typing import Callable, Generic, List, Optional, TypeVar
+
+from adt import Case, adt
+from tests import helpers
+
+_T = TypeVar('_T')
+
+
+@adt(slots=True)
+class SlottedList(Generic[_T]):
+    NIL: Case
+    CONS: Case[_T, "SlottedList[_T]"]
+
+    def length(self) -> int:
+        return self.match(nil=lambda: 0, cons=lambda _, xs: 1 + xs.length())
+
+
+@adt(slots=True)
+class SlottedAccessors:
+    INTVALUE: Case[int]
+    STRVALUE: Case[str]
+
+    @property
+    def intvalue(self) -> Optional[int]:
+        return self.match(intvalue=lambda x: optionality(x),
+                          strvalue=lambda _: None)
+
+    def __repr__(self) -> str:
+        return 'SlottedAccessors'
+
+
+@adt(slots=True)
+class SlottedMatch:
+    INTVALUE: Case[int]
+    STRVALUE: Case[str]
+
+    def match(self, intvalue: Callable[[int], str],
+              strvalue: Callable[[str], str]) -> str:
+        try:
+            x = self.intvalue()
+        except AttributeError:
+            return strvalue(self.strvalue())
+
+        return intvalue(x)
+
+
+def optionality(x: _T) -> Optional[_T]:
+    return x
+
+
+@adt(slots=True)
+class SlottedSuper:
+    NAMED: Case[str]
+
+    def __repr__(self) -> str:
+        return 'custom ' + super().__repr__()
+
+    @property
+    def description(self) -> str:
+        return 'described ' + super().__str__()
+
+
+@adt(slots=True, frozen=True)
+class SlottedShape:
+    POINT: Case
+    CIRCLE: Case[float]
+    RECTANGLE: Case[("width", float), ("height", float)]
+
+
+class TestSlots(unittest.TestCase):
+    def test_instancesHaveNoDict(self) -> None:
+        xs: SlottedList[int] = SlottedList.CONS(1, SlottedList.NIL())
+        self.assertFalse(hasattr(xs, '__dict__'))
+
+        with self.assertRaises(AttributeError):
+            xs.extra = 5  # type: ignore
+
+    def test_generatedMethods(self) -> None:
+        xs: SlottedList[int] = SlottedList.CONS(
+            1, SlottedList.CONS(2, SlottedList.NIL()))
+        self.assertEqual(
+            xs, SlottedList.CONS(1, SlottedList.CONS(2, SlottedList.NIL())))
+        self.assertNotEqual(xs, SlottedList.NIL())
+        self.assertEqual(hash(SlottedList.NIL()), hash(SlottedList.NIL()))
+        self.assertEqual(xs.cons()[0], 1)
+        self.assertEqual(xs.length(), 2)
+        self.assertIn('CONS', repr(xs))
+
+        with self.assertRaises(AttributeError):
+            xs.nil()
+
+    def test_classIdentityPreserved(self) -> None:
+        self.assertEqual(SlottedList.__name__, 'SlottedList')
+        self.assertEqual(SlottedList.__qualname__, 'SlottedList')
+        self.assertIsInstance(SlottedList.NIL(), SlottedList)
+
+    def test_overriddenAccessor(self) -> None:
+        x = SlottedAccessors.INTVALUE(5)
+        self.assertEqual(x.intvalue, 5)
+        self.assertEqual(repr(x), 'SlottedAccessors')
+
+        y = SlottedAccessors.STRVALUE("foobar")
+        self.assertIsNone(y.intvalue)
+        self.assertEqual(y.strvalue(), "foobar")
+
+    def test_overriddenMatch(self) -> None:
+        x = SlottedMatch.INTVALUE(5)
+        self.assertEqual(
+            x.match(intvalue=lambda n: str(n),
+                    strvalue=helpers.invalidPatternMatch), "5")
+
+        y = SlottedMatch.STRVALUE("foobar")
+        self.assertEqual(
+            y.match(intvalue=helpers.invalidPatternMatch,
+                    strvalue=lambda s: s), "foobar")
+
+    def test_superInMethods(self) -> None:
+        x = SlottedSuper.NAMED('x')
+        self.assertTrue(repr(x).startswith('custom <'))
+        self.assertEqual(x.description, 'described ' + repr(x))
+
+    def test_instancesCanBeWeaklyReferenced(self) -> None:
+        x: SlottedList[int] = SlottedList.CONS(1, SlottedList.NIL())
+        self.assertIs(weakref.ref(x)(), x)
+
+    def test_namedFieldsOnlyHaveTheirOwnSlots(self) -> None:
+        def slots(value: SlottedShape) -> List[str]:
+            return [
+                slot for cls in type(value).__mro__
+                for slot in cls.__dict__.get('__slots__', ())
+            ]
+
+        self.assertEqual(sorted(slots(SlottedShape.RECTANGLE(1.0, 2.0))),
+                         ['__weakref__', '_hash', 'height', 'width'])
+        self.assertEqual(sorted(slots(SlottedShape.CIRCLE(1.0))),
+                         ['__weakref__', '_hash', '_value'])
+        self.assertEqual(SlottedShape.CIRCLE(1.0).circle(), 1.0)
+        self.assertEqual(SlottedShape.POINT(), SlottedShape.POINT())
+
+    def test_subclassSlotsConflictingWithNamedFields(self) -> None:
+        class DerivedShape(SlottedShape):
+            pass
+
+        self.assertEqual(DerivedShape.RECTANGLE(1.0, 2.0).width, 1.0)
+
+        with self.assertRaisesRegex(TypeError, 'SlottedDerivedShape'):
+
+            class SlottedDerivedShape(SlottedShape):
+                __slots__ = ('extra', )
+
+        # Without named fields, the slots of both can be combined.
+        class SlottedDerivedList(SlottedList[int]):
+            __slots__ = ('extra', )
+
+        xs = SlottedDerivedList.CONS(1, SlottedDerivedList.NIL())
+        self.assertEqual(xs, SlottedList.CONS(1, SlottedList.NIL()))
+
+    def test_existingSlotsRejected(self) -> None:
+        with self.assertRaises(TypeError):
+
+            @adt(slots=True)
+            class AlreadySlotted:
+                __slots__ = ('foo', )
+                CASE: Case
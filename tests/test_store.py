@@ -0,0 +1,193 @@
+import os
+import tempfile
+import unittest
+from typing import Any, Iterator, List
+
+from adt import ADTStore, ADTStoreWriter, Case, adt
+from adt.store import LazyValue
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+    LABELLED: Case[str, List["Tree"], "Tree"]
+
+
+class DerivedTree(Tree):
+    pass
+
+
+@adt
+class Other:
+    VALUE: Case[int]
+
+
+def balanced(depth: int, start: int = 0) -> Tree:
+    if depth == 0:
+        return Tree.LEAF(start)
+
+    return Tree.NODE(balanced(depth - 1, start),
+                     balanced(depth - 1, start + 2**(depth - 1)))
+
+
+def trees() -> List[Tree]:
+    return [
+        Tree.EMPTY(),
+        Tree.LEAF(-1),
+        balanced(6),
+        Tree.LABELLED('root', [Tree.LEAF(1), Tree.EMPTY()], balanced(2)),
+    ]
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'trees.adts')
+
+    def write(self, values: List[Tree]) -> None:
+        with open(self.path, 'wb') as file, ADTStoreWriter(Tree,
+                                                           file) as writer:
+            writer.extend(values)
+
+    def test_roundTrip(self) -> None:
+        self.write(trees())
+        with ADTStore(Tree, self.path) as store:
+            self.assertEqual(len(store), 4)
+            self.assertEqual(list(store), trees())
+            self.assertEqual(store[2], balanced(6))
+            self.assertEqual(store[-1], trees()[-1])
+            self.assertEqual(store[1:3], trees()[1:3])
+            self.assertIs(store[0], Tree.EMPTY())
+
+            with self.assertRaises(IndexError):
+                store[4]
+
+    def test_subclasses(self) -> None:
+        values: List[Any] = [
+            DerivedTree.EMPTY(),
+            DerivedTree.NODE(DerivedTree.LEAF(1), DerivedTree.EMPTY()),
+        ]
+        with open(self.path, 'wb') as file, ADTStoreWriter(DerivedTree,
+                                                           file) as writer:
+            writer.extend(values)
+
+        with ADTStore(DerivedTree, self.path) as store:
+            self.assertEqual(list(store), values)
+            for value in store:
+                self.assertIsInstance(value, DerivedTree)
+
+            left, _ = store.lazy(1).fields()
+            self.assertIsInstance(left.decode(), DerivedTree)
+
+    def test_emptyStore(self) -> None:
+        self.write([])
+        with ADTStore(Tree, self.path) as store:
+            self.assertEqual(len(store), 0)
+            self.assertEqual(list(store), [])
+
+    def test_writerStreamsValues(self) -> None:
+        def values() -> Iterator[Tree]:
+            for i in range(10000):
+                yield Tree.LEAF(i)
+
+        with open(self.path, 'wb') as file:
+            writer = ADTStoreWriter(Tree, file)
+            writer.extend(values())
+            writer.append(Tree.EMPTY())
+
+            # Nothing is buffered in memory, beyond the file itself.
+            file.flush()
+            self.assertGreater(os.path.getsize(self.path), 10000 * 3)
+
+            writer.close()
+            with self.assertRaises(ValueError):
+                writer.append(Tree.EMPTY())
+
+        with ADTStore(Tree, self.path) as store:
+            self.assertEqual(len(store), 10001)
+            self.assertEqual(store[1234], Tree.LEAF(1234))
+            self.assertEqual(store[-1], Tree.EMPTY())
+
+    def test_lazyValues(self) -> None:
+        self.write(trees())
+        with ADTStore(Tree, self.path) as store:
+            self.assertEqual(store.lazy(0).case, 'EMPTY')
+            self.assertEqual(store.lazy(0).fields(), ())
+            self.assertEqual(store.lazy(1).fields(), (-1, ))
+
+            node = store.lazy(2)
+            self.assertEqual(node.case, 'NODE')
+            left, right = node.fields()
+            self.assertIsInstance(left, LazyValue)
+            self.assertEqual(right.decode(), balanced(5, 32))
+
+            # Follows the rightmost branch, without decoding the rest.
+            leaf = node
+            while leaf.case == 'NODE':
+                leaf = leaf.fields()[1]
+
+            self.assertEqual(leaf.fields(), (63, ))
+            self.assertEqual(node.decode(), balanced(6))
+
+            label, children, tree = store.lazy(3).fields()
+            self.assertEqual(label, 'root')
+            self.assertEqual(children, [Tree.LEAF(1), Tree.EMPTY()])
+            self.assertEqual(tree.decode(), balanced(2))
+
+    def test_lazyMatch(self) -> None:
+        self.write(trees())
+
+        def total(value: LazyValue) -> int:
+            result: int = value.match(
+                empty=lambda: 0,
+                leaf=lambda n: int(n),
+                node=lambda left, right: total(left) + total(right),
+                labelled=lambda label, children, tree: total(tree))
+            return result
+
+        with ADTStore(Tree, self.path) as store:
+            self.assertEqual(total(store.lazy(2)), sum(range(64)))
+            self.assertEqual(total(store.lazy(3)), sum(range(4)))
+
+            with self.assertRaises(ValueError):
+                store.lazy(2).match(leaf=lambda n: int(n))
+
+    def test_unsupportedValuesRaise(self) -> None:
+        with open(self.path, 'wb') as file, ADTStoreWriter(Tree,
+                                                           file) as writer:
+            with self.assertRaises(TypeError):
+                writer.append(Other.VALUE(1))  # type: ignore
+
+    def test_incompleteStoresRaise(self) -> None:
+        with self.assertRaises(KeyError):
+            with open(self.path, 'wb') as file, ADTStoreWriter(Tree,
+                                                               file) as writer:
+                writer.extend(trees())
+                raise KeyError
+
+        with self.assertRaises(ValueError):
+            ADTStore(Tree, self.path)
+
+    def test_invalidFilesRaise(self) -> None:
+        self.write(trees())
+        with open(self.path, 'rb') as file:
+            data = file.read()
+
+        for invalid in [
+                b'', b'ADTS', b'not a store' * 10, data[:-1], data[:20],
+                b'ADTS\x02' + data[5:]
+        ]:
+            with self.subTest(invalid=invalid[:20]):
+                with open(self.path, 'wb') as file:
+                    file.write(invalid)
+
+                with self.assertRaises(ValueError):
+                    ADTStore(Tree, self.path)
+
+    def test_otherClassesRaise(self) -> None:
+        self.write(trees())
+        with self.assertRaises(ValueError):
+            ADTStore(Other, self.path)
@@ -0,0 +1,252 @@
+import copy
+import pickle
+import sys
+import threading
+import types
+import unittest
+from typing import Any, Callable, Dict, List
+
+from adt import Case, adt
+from adt import binary, columnar, decorator, jsoncodec, parallel, store
+
+_MODULES = [binary, columnar, decorator, jsoncodec, parallel, store]
+_THREADS = 8
+_ITERATIONS = 200
+
+
+@adt
+class Tree:
+    EMPTY: Case
+    LEAF: Case[int]
+    NODE: Case["Tree", "Tree"]
+
+
+@adt(slots=True, frozen=True)
+class Point:
+    ORIGIN: Case
+    CARTESIAN: Case[("x", float), ("y", float)]
+
+
+class DerivedTree(Tree):
+    pass
+
+
+def _build(depth: int, leaf: int) -> Tree:
+    if depth == 0:
+        return Tree.LEAF(leaf)
+
+    return Tree.NODE(_build(depth - 1, leaf), _build(depth - 1, leaf + 1))
+
+
+def _total(tree: Tree) -> int:
+    return Tree.fold(tree, empty=lambda: 0, leaf=lambda n: n, node=_add)
+
+
+def _add(a: int, b: int) -> int:
+    return a + b
+
+
+# Runs `work` in many threads at once (starting them together), and returns
+# what each returned, re-raising the first exception any of them raised.
+def _runConcurrently(work: Callable[[int], Any]) -> List[Any]:
+    barrier = threading.Barrier(_THREADS)
+    results: List[Any] = [None] * _THREADS
+    errors: List[BaseException] = []
+
+    def run(index: int) -> None:
+        try:
+            barrier.wait()
+            results[index] = work(index)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=run, args=(i, )) for i in range(_THREADS)
+    ]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    return results
+
+
+# The containers reachable from the generated functions and attributes of
+# `cls` and its cases (other than its annotations, which are written by hand),
+# which could be changed. This includes the module-level state read by those
+# functions, and by the functions they call in turn.
+def _mutableState(cls: Any) -> List[Any]:
+    found: List[Any] = []
+    seen = set()
+    classes = [cls] + [getattr(cls, name) for name in cls._Key.__members__]
+    pending = [
+        value for c in classes + [type(c) for c in classes]
+        for name, value in vars(c).items() if name != '__annotations__'
+    ]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, (classmethod, staticmethod)):
+            value = value.__func__
+        elif isinstance(value, property):
+            pending.extend([value.fget, value.fset, value.fdel])
+            continue
+
+        if isinstance(value, (list, dict, set, bytearray)):
+            found.append(value)
+        elif isinstance(value, types.FunctionType) and value not in seen:
+            seen.add(value)
+            pending.extend(value.__defaults__ or ())
+            pending.extend((value.__kwdefaults__ or {}).values())
+            pending.extend(cell.cell_contents
+                           for cell in value.__closure__ or ())
+            pending.extend(value.__globals__[name]
+                           for name in value.__code__.co_names
+                           if name in value.__globals__)
+
+    return found
+
+
+# Copies of the module-level containers of the `adt` package.
+def _sharedState() -> Dict[str, Any]:
+    return {
+        f'{module.__name__}.{name}': copy.copy(value)
+        for module in _MODULES for name, value in vars(module).items()
+        if isinstance(value, (list, dict, set))
+    }
+
+
+class TestThreads(unittest.TestCase):
+    # With the GIL, threads are made to switch as often as possible, so that
+    # they interleave within the generated methods too.
+    def setUp(self) -> None:
+        self.switchInterval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self) -> None:
+        sys.setswitchinterval(self.switchInterval)
+
+    def test_stateIsImmutableAfterDecoration(self) -> None:
+        for cls in [Tree, Point]:
+            with self.subTest(cls=cls):
+                cases: Any = cls
+                self.assertIsInstance(cases._types, tuple)
+                self.assertEqual(_mutableState(cls), [])
+
+                with self.assertRaises(TypeError):
+                    cases._Key.__members__['OTHER'] = None
+
+                with self.assertRaises(AttributeError):
+                    cases._Key.__members__ = {}
+
+                with self.assertRaises(AttributeError):
+                    cases._Key.LEAF.arity = 0
+
+    def test_decorationLeavesSharedStateAlone(self) -> None:
+        before = _sharedState()
+
+        # Cases of the same shapes as Tree's, so that nothing new needs to be
+        # cached for them either.
+        @adt
+        class Other:
+            NOTHING: Case
+            ONE: Case[str]
+            TWO: Case[str, str]
+
+        class DerivedOther(Other):
+            pass
+
+        self.assertEqual(_sharedState(), before)
+        self.assertEqual(_mutableState(Other), [])
+
+    def test_sharedInstancesAreImmutable(self) -> None:
+        for empty in [Tree.EMPTY(), Point.ORIGIN()]:
+            with self.subTest(empty=empty):
+                with self.assertRaises(AttributeError):
+                    empty.tag = 5  # type: ignore
+
+                with self.assertRaises(AttributeError):
+                    del empty._value  # type: ignore
+
+        # Descendants' values aren't shared, so needn't be.
+        derived: Any = DerivedTree.EMPTY()
+        derived.tag = 5
+        self.assertEqual(derived.tag, 5)
+
+    def test_constructAndMatch(self) -> None:
+        def work(index: int) -> int:
+            total = 0
+            for i in range(_ITERATIONS):
+                tree = Tree.NODE(Tree.LEAF(index), Tree.LEAF(i))
+                total += tree.match(empty=lambda: 0,
+                                    leaf=lambda n: n,
+                                    node=lambda a, b: a.leaf() + b.leaf())
+                point = Point.CARTESIAN(x=float(i), y=float(index))
+                total += int(point.x + point.y)
+                self.assertIs(Point.ORIGIN(), Point.ORIGIN())
+
+            return total
+
+        self.assertEqual(_runConcurrently(work), [
+            2 * sum(range(_ITERATIONS)) + 2 * index * _ITERATIONS
+            for index in range(_THREADS)
+        ])
+
+    def test_sharedValues(self) -> None:
+        tree = _build(8, 0)
+        frozen = Point.CARTESIAN(1.0, 2.0)
+        expected = (_total(tree), hash(frozen), repr(tree))
+
+        def work(index: int) -> Any:
+            for _ in range(_ITERATIONS // 10):
+                results = (_total(tree), hash(frozen), repr(tree))
+                self.assertEqual(results, expected)
+                self.assertEqual(tree, _build(8, 0))
+                self.assertEqual(pickle.loads(pickle.dumps(tree)), tree)
+
+            return index
+
+        self.assertEqual(_runConcurrently(work), list(range(_THREADS)))
+
+    def test_codecsAreCreatedOnce(self) -> None:
+        @adt
+        class Fresh:
+            EMPTY: Case
+            PAIR: Case[int, str]
+
+        value = Fresh.PAIR(1, 'one')
+
+        def work(index: int) -> Any:
+            self.assertEqual(Fresh.from_json(value.to_json()), value)
+            self.assertEqual(
+                pickle.loads(pickle.dumps(DerivedTree.LEAF(index))),
+                DerivedTree.LEAF(index))
+            return (binary.codecFor(Fresh), jsoncodec.codecFor(Fresh))
+
+        codecs = _runConcurrently(work)
+        self.assertEqual(len(set(codecs)), 1)
+
+    def test_concurrentDecoration(self) -> None:
+        def work(index: int) -> Any:
+            @adt(frozen=index % 2 == 0)
+            class Shape:
+                POINT: Case
+                CIRCLE: Case[float]
+                RECTANGLE: Case[("width", float), ("height", float)]
+
+            class DerivedShape(Shape):
+                pass
+
+            rectangle = DerivedShape.RECTANGLE(float(index), 2.0)
+            decoded = DerivedShape.from_json(rectangle.to_json())
+            self.assertEqual(decoded, rectangle)
+            self.assertIsInstance(decoded, DerivedShape)
+            return rectangle.match(point=lambda: 0.0,
+                                   circle=lambda r: r,
+                                   rectangle=lambda w, h: w * h)
+
+        self.assertEqual(_runConcurrently(work),
+                         [2.0 * index for index in range(_THREADS)])